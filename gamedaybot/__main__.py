@@ -0,0 +1,89 @@
+"""
+Command line entry point.
+
+    python -m gamedaybot run get_matchups [get_projected_scoreboard ...]
+    python -m gamedaybot schedule
+
+``run`` builds and posts the given reports once, as one job group, and exits when they are delivered,
+with status 1 if a report failed. It is meant for cron and short-lived containers. ``schedule`` sends the init message and runs the
+long-lived scheduler, like ``gamedaybot/espn/espn_bot.py``.
+
+Only the standard library is imported up front. espn_api, requests, numpy and apscheduler are imported
+by the command that needs them, so starting up (and ``--help``) stays fast.
+"""
+import argparse
+import logging
+import os
+import sys
+
+logger = logging.getLogger(__name__)
+
+
+def run(functions, timeout=60):
+    """
+    Runs the reports once and waits for their messages to be delivered.
+
+    Parameters
+    ----------
+    functions : list
+        The reports to run, in order. Accepts the same values as espn_bot.
+    timeout : float
+        The most seconds to wait for Discord.
+
+    Returns
+    -------
+    int
+        The exit status: 0 if every report was built and everything queued was delivered or dropped in time,
+        1 otherwise.
+    """
+
+    from gamedaybot.espn.espn_bot import espn_bot_group
+    from gamedaybot.chat.discord import flush_queues
+    import gamedaybot.espn.box_score_cache as box_score_cache
+    import gamedaybot.espn.env_vars as env_vars
+
+    box_score_cache.configure_fetching(*env_vars.get_fetch_limits())
+    failed = espn_bot_group(functions)
+    # the reports that did build are still delivered before the failure is reported
+    status = 0
+    if not flush_queues(timeout):
+        logger.error("Messages were still being sent after %ss" % timeout)
+        status = 1
+    if failed:
+        logger.error("Reports failed: %s" % ', '.join(failed))
+        status = 1
+    return status
+
+
+def schedule():
+    from gamedaybot.espn.espn_bot import espn_bot
+    from gamedaybot.espn.scheduler import scheduler
+
+    # in multi-league mode the scheduler sends each league's init message
+    if not os.environ.get("LEAGUE_MANIFEST"):
+        espn_bot("init")
+    scheduler()
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m gamedaybot', description='Fantasy football chat bot.')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help='run reports once and exit')
+    run_parser.add_argument('functions', nargs='+', metavar='function',
+                            help='a report, e.g. get_matchups, get_scoreboard_short, get_power_rankings, get_final')
+    run_parser.add_argument('--timeout', type=float, default=60,
+                            help='seconds to wait for messages to be delivered (default 60)')
+
+    commands.add_parser('schedule', help='send the init message and run the scheduler')
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+    if args.command == 'run':
+        return run(args.functions, args.timeout)
+    return schedule()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
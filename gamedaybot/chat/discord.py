@@ -1,9 +1,39 @@
+import atexit
 import requests
 import json
 import logging
+import queue
+import threading
+import time
+
+import gamedaybot.chat.formatting as formatting
+import gamedaybot.utils.metrics as metrics
 
 logger = logging.getLogger(__name__)
 
+# One connection pool for every webhook post in the process, so consecutive messages
+# and jobs reuse the same TLS connection to Discord instead of opening a new one each time.
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """
+    Returns the process-wide requests.Session used to post to Discord, creating it if needed.
+
+    Returns
+    -------
+    requests.Session
+        The shared session.
+    """
+
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+            _session.headers.update({'content-type': 'application/json'})
+        return _session
+
 
 class DiscordException(Exception):
     pass
@@ -17,24 +47,75 @@ class Discord(object):
     ----------
     webhook_url : str
         The URL of the Discord webhook to send messages to.
+    timeout : tuple, optional
+        The (connect, read) timeout in seconds for each post.
+    session : requests.Session, optional
+        The session to post with. Defaults to the process-wide session.
 
     Attributes
     ----------
     webhook_url : str
         The URL of the Discord webhook to send messages to.
+    last_latency : float
+        Seconds the most recent post took, or None before the first post.
 
     Methods
     -------
+    post(text: str)
+        Posts a message to the webhook and returns the response unchecked.
     send_message(text: str)
         Sends a message to the Discord channel.
     """
 
-    def __init__(self, webhook_url):
+    def __init__(self, webhook_url, timeout=(5, 15), session=None):
         self.webhook_url = webhook_url
+        self.timeout = timeout
+        self.session = session or get_session()
+        self.last_latency = None
 
     def __repr__(self):
         return "Discord Webhook Url(%s)" % self.webhook_url
 
+    def post(self, text):
+        """
+        Posts a message to the webhook without checking the response.
+
+        Parameters
+        ----------
+        text : str
+            The message to be sent to the Discord channel.
+
+        Returns
+        -------
+        r : requests.Response or None
+            The response object of the POST request, or None if no webhook is configured.
+
+        Raises
+        ------
+        DiscordException
+            If the request could not be made or timed out.
+        """
+
+        message = "{0}".format(replace_formatting(text))
+        template = {
+            "content": message  # limit 2000 chars
+        }
+
+        if self.webhook_url in (1, "1", ''):
+            return None
+
+        start = time.perf_counter()
+        try:
+            r = self.session.post(self.webhook_url, data=json.dumps(template), timeout=self.timeout)
+        except requests.exceptions.RequestException as e:
+            logger.error(e)
+            raise DiscordException(e)
+        finally:
+            self.last_latency = time.perf_counter() - start
+            metrics.DISCORD_LATENCY.observe(self.last_latency)
+        logger.debug("Discord post took %.3fs" % self.last_latency)
+        return r
+
     def send_message(self, text):
         """
         Sends a message to the Discord channel.
@@ -55,29 +136,212 @@ class Discord(object):
             If there is an error with the POST request.
         """
 
-        message = "{0}".format(replace_formatting(text))
-        template = {
-            "content": message  # limit 2000 chars
-        }
+        r = self.post(text)
+        if r is not None and r.status_code != 204:
+            print(r.content)
+            logger.error(r.content)
+            raise DiscordException(r.content)
+
+        return r
+
+
+class SendQueue(object):
+    """
+    An outbound queue for one webhook, drained in order by a background thread that paces posts to Discord's rate limits.
+
+    Producers hand over every message of a report at once and return immediately. A 429 response is retried
+    after its ``retry_after``, and once ``X-RateLimit-Remaining`` reaches 0 the next post waits for
+    ``X-RateLimit-Reset-After``.
+
+    Parameters
+    ----------
+    discord : Discord
+        The webhook to post to.
+    max_retries : int
+        How many times a rate limited message is retried before it is dropped.
+
+    Attributes
+    ----------
+    sent : int
+        Messages delivered.
+    failed : int
+        Messages dropped after an error or too many retries.
+    rate_limited : int
+        429 responses received.
+
+    Methods
+    -------
+    put(messages, on_sent=None)
+        Queues the messages of one report to be sent in order.
+    flush(timeout=None)
+        Waits until every queued message was handled.
+    """
+
+    def __init__(self, discord, max_retries=5):
+        self.discord = discord
+        self.max_retries = max_retries
+        self.sent = 0
+        self.failed = 0
+        self.rate_limited = 0
+        self._queue = queue.Queue()
+        self._resume_at = 0
+        self._thread = None
+        self._lock = threading.Lock()
 
-        headers = {'content-type': 'application/json'}
+    def __repr__(self):
+        return "SendQueue(%s, %d queued)" % (self.discord.webhook_url, self._queue.unfinished_tasks)
 
-        if self.webhook_url not in (1, "1", ''):
-            r = requests.post(self.webhook_url,
-                              data=json.dumps(template), headers=headers)
+    def put(self, messages, on_sent=None):
+        """
+        Queues the messages of one report. They are posted back to back, after everything queued before them.
 
-            if r.status_code != 204:
-                print(r.content)
+        Parameters
+        ----------
+        messages : list
+            The messages to send, in order.
+        on_sent : callable, optional
+            Called as ``on_sent(position, message, response)`` after each message is delivered, position being
+            the message's index in ``messages``.
+        """
+
+        self._queue.put((list(messages), on_sent))
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='discord_send', daemon=True)
+                self._thread.start()
+
+    def flush(self, timeout=None):
+        """
+        Waits until every queued message was sent or dropped.
+
+        Parameters
+        ----------
+        timeout : float, optional
+            The most seconds to wait. Waits indefinitely if not provided.
+
+        Returns
+        -------
+        bool
+            True if the queue drained, False if the timeout expired first.
+        """
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        return True
+
+    def _run(self):
+        while True:
+            messages, on_sent = self._queue.get()
+            try:
+                for position, message in enumerate(messages):
+                    self._send(message, on_sent, position)
+            finally:
+                self._queue.task_done()
+
+    def _send(self, text, on_sent, position=0):
+        for attempt in range(self.max_retries + 1):
+            delay = self._resume_at - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+
+            try:
+                r = self.discord.post(text)
+            except DiscordException:
+                self.failed += 1
+                metrics.DISCORD_FAILURES.inc(reason='error')
+                return
+            if r is None:
+                return
+
+            self._pace(r)
+            if r.status_code == 429:
+                self.rate_limited += 1
+                metrics.DISCORD_RATE_LIMITED.inc()
+                logger.warning("Discord rate limited, retrying in %.2fs" % max(0, self._resume_at - time.monotonic()))
+                continue
+            if r.status_code >= 300:
                 logger.error(r.content)
-                raise DiscordException(r.content)
+                self.failed += 1
+                metrics.DISCORD_FAILURES.inc(reason='status')
+                return
+
+            self.sent += 1
+            if on_sent:
+                try:
+                    on_sent(position, text, r)
+                except Exception as e:
+                    logger.error("Send callback failed: %s" % e)
+            return
+
+        logger.error("Dropping message after %d rate limited attempts" % (self.max_retries + 1))
+        self.failed += 1
+        metrics.DISCORD_FAILURES.inc(reason='rate_limited')
+
+    def _pace(self, r):
+        now = time.monotonic()
+        if r.status_code == 429:
+            try:
+                retry_after = float(r.json()['retry_after'])
+            except (ValueError, KeyError, TypeError):
+                retry_after = float(r.headers.get('Retry-After', 1))
+            self._resume_at = now + retry_after
+        elif r.headers.get('X-RateLimit-Remaining') == '0':
+            self._resume_at = now + float(r.headers.get('X-RateLimit-Reset-After', 1))
+
+
+_queues = {}
+_queues_lock = threading.Lock()
+
+
+def get_queue(discord):
+    """
+    Returns the process-wide send queue for a webhook, creating it if needed.
+
+    Parameters
+    ----------
+    discord : Discord
+        The webhook the queue posts to.
+
+    Returns
+    -------
+    SendQueue
+        The queue every job sending to this webhook shares.
+    """
+
+    with _queues_lock:
+        try:
+            return _queues[discord.webhook_url]
+        except KeyError:
+            _queues[discord.webhook_url] = SendQueue(discord)
+            return _queues[discord.webhook_url]
+
+
+def flush_queues(timeout=None):
+    """
+    Waits for every send queue to drain. Registered to run at exit so queued reports are not lost.
+
+    Returns
+    -------
+    bool
+        True if every queue drained before the timeout.
+    """
+
+    with _queues_lock:
+        queues = list(_queues.values())
+    return all([q.flush(timeout) for q in queues])
+
+
+atexit.register(flush_queues, 60)
+
 
-            return r
-    
 def replace_formatting(text):
-    text = text.replace('#u#', '__') # Underline
-    text = text.replace('#b#', '**') # Bold
-    text = text.replace('#c#', '`')  # Code block
-    text = text.replace('#p#', '*')  # Bullet point
-    text = text.replace('#q#', '> ') # Quote block
+    """
+    Translates the report formatting markers into Discord markdown.
+    """
 
-    return text
+    return formatting.translate(text, 'discord')
@@ -0,0 +1,72 @@
+import re
+
+# Reports are written with these platform neutral markers and translated for each chat platform when sent.
+MARKERS = ('#u#', '#b#', '#c#', '#p#', '#q#')
+
+DIALECTS = {
+    'discord': {
+        '#u#': '__',  # Underline
+        '#b#': '**',  # Bold
+        '#c#': '`',   # Code block
+        '#p#': '*',   # Bullet point
+        '#q#': '> ',  # Quote block
+    },
+    'slack': {
+        '#u#': '',    # mrkdwn has no underline
+        '#b#': '*',
+        '#c#': '`',
+        '#p#': '•',
+        '#q#': '> ',
+    },
+    'plain': {
+        '#u#': '',
+        '#b#': '',
+        '#c#': '',
+        '#p#': '-',
+        '#q#': '',
+    },
+}
+
+# a single alternation, so every marker is found in one scan of the text
+_MARKER = re.compile('(' + '|'.join(re.escape(marker) for marker in MARKERS) + ')')
+
+
+def register_dialect(name, table):
+    """
+    Adds or replaces a target dialect.
+
+    Parameters
+    ----------
+    name : str
+        The name the dialect is selected by.
+    table : dict
+        The text each marker is replaced with. Markers missing from the table are removed.
+    """
+
+    DIALECTS[name] = {marker: table.get(marker, '') for marker in MARKERS}
+
+
+def translate(text, dialect='discord'):
+    """
+    Replaces every formatting marker in the text with the dialect's syntax in a single pass.
+
+    Unlike chained replaces, a marker removed by the dialect can never join its neighbours into a new marker.
+
+    Parameters
+    ----------
+    text : str
+        The report text.
+    dialect : str
+        One of the names in DIALECTS.
+
+    Returns
+    -------
+    str
+        The translated text.
+    """
+
+    table = DIALECTS[dialect]
+    # splitting on the capturing alternation leaves the markers at the odd positions
+    tokens = _MARKER.split(text)
+    tokens[1::2] = map(table.__getitem__, tokens[1::2])
+    return ''.join(tokens)
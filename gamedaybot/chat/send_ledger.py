@@ -0,0 +1,166 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+def content_hash(text):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+class SendLedger(object):
+    """
+    Remembers a hash of the last text each report delivered, so a report whose text has not changed is not posted again.
+
+    The ledger is a JSON file, rewritten after every delivery, so it survives restarts. Entries older than
+    ``max_age`` no longer count, and the unchanged text is posted again.
+
+    Parameters
+    ----------
+    path : str
+        The ledger file.
+    max_age : float
+        Seconds an entry stays valid. 0 turns deduplication off.
+
+    Methods
+    -------
+    is_duplicate(key, text)
+        Checks whether the text is what was last delivered for the key.
+    record(key, text)
+        Stores the text as the last delivered for the key.
+    tracker(reports)
+        Returns a SendQueue callback that records each report once all of its messages are delivered.
+    """
+
+    def __init__(self, path, max_age=7 * 24 * 3600):
+        self.path = path
+        self.max_age = max_age
+        self._entries = None
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return "SendLedger(%s)" % self.path
+
+    def _load(self):
+        if self._entries is None:
+            try:
+                with open(self.path) as f:
+                    self._entries = json.load(f)
+            except FileNotFoundError:
+                self._entries = {}
+            except (ValueError, OSError) as e:
+                logger.warning("Ignoring unreadable send ledger %s: %s" % (self.path, e))
+                self._entries = {}
+        return self._entries
+
+    def _save(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp = self.path + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(self._entries, f)
+        os.replace(tmp, self.path)
+
+    def is_duplicate(self, key, text):
+        """
+        Parameters
+        ----------
+        key : str
+            The league and report, see ledger_key.
+        text : str
+            The rendered report.
+
+        Returns
+        -------
+        bool
+            True if the same text was delivered for the key within max_age.
+        """
+
+        if not self.max_age:
+            return False
+        with self._lock:
+            entry = self._load().get(key)
+        return (entry is not None and entry['hash'] == content_hash(text)
+                and time.time() - entry['sent_at'] < self.max_age)
+
+    def record(self, key, text):
+        """
+        Stores the text as the last delivered for the key, dropping expired entries.
+        """
+
+        if not self.max_age:
+            return
+        now = time.time()
+        with self._lock:
+            entries = self._load()
+            entries[key] = {'hash': content_hash(text), 'sent_at': now}
+            for stale in [k for k, entry in entries.items() if now - entry['sent_at'] >= self.max_age]:
+                del entries[stale]
+            try:
+                self._save()
+            except OSError as e:
+                logger.error("Could not write send ledger %s: %s" % (self.path, e))
+
+    def tracker(self, reports):
+        """
+        Builds a SendQueue ``on_sent`` callback for messages of several reports put at once.
+
+        Parameters
+        ----------
+        reports : list
+            (key, text, messages, on_delivered) for every report, in the order their messages were put, messages
+            being the chunks the text was split into and on_delivered an optional callable.
+
+        Returns
+        -------
+        callable
+            Records a report, and calls its on_delivered, once every one of its messages was delivered.
+        """
+
+        # delivered messages are matched to their report by position, as two reports may share a chunk's text
+        owners = [number for number, report in enumerate(reports) for _ in report[2]]
+        remaining = [len(report[2]) for report in reports]
+        lock = threading.Lock()
+
+        def on_sent(position, message, response):
+            number = owners[position]
+            with lock:
+                remaining[number] -= 1
+                done = not remaining[number]
+            if done:
+                key, text, messages, on_delivered = reports[number]
+                self.record(key, text)
+                if on_delivered:
+                    try:
+                        on_delivered()
+                    except Exception as e:
+                        logger.error("Could not finish delivery of %s: %s" % (key, e))
+
+        return on_sent
+
+
+def ledger_key(league_id, function):
+    return '%s:%s' % (league_id, function)
+
+
+_ledgers = {}
+_ledgers_lock = threading.Lock()
+
+
+def get_ledger(path, max_age=7 * 24 * 3600):
+    """
+    Returns the process-wide ledger kept in a file, creating it if needed, so leagues sharing the file share its lock.
+    """
+
+    with _ledgers_lock:
+        try:
+            ledger = _ledgers[path]
+        except KeyError:
+            ledger = _ledgers[path] = SendLedger(path, max_age)
+        ledger.max_age = max_age
+        return ledger
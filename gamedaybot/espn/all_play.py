@@ -0,0 +1,232 @@
+from bisect import bisect_left, bisect_right
+import threading
+
+import gamedaybot.espn.box_score_cache as box_score_cache
+
+
+def weekly_scores(box_scores):
+    """
+    Collect the score of every team that played a head-to-head matchup.
+
+    Parameters
+    ----------
+    box_scores : list
+        The box scores of a single week.
+
+    Returns
+    -------
+    dict
+        A dictionary with team ids as keys and the team's score as values. Teams on a bye are left out.
+    """
+
+    scores = {}
+    for i in box_scores:
+        if i.home_team and i.away_team:
+            scores[i.home_team.team_id] = i.home_score
+            scores[i.away_team.team_id] = i.away_score
+    return scores
+
+
+def week_record(scores):
+    """
+    Compute every team's record for one week had it played every other team.
+
+    The scores are sorted once and each team's wins, losses and ties are read off with a binary search,
+    so a week costs O(n log n) instead of comparing every pair of teams.
+
+    Parameters
+    ----------
+    scores : dict
+        A dictionary with team ids as keys and the team's score for the week as values.
+
+    Returns
+    -------
+    dict
+        A dictionary with team ids as keys and (wins, losses, ties) tuples as values.
+    """
+
+    ordered = sorted(scores.values())
+    teams = len(ordered)
+    record = {}
+    for team_id, score in scores.items():
+        below = bisect_left(ordered, score)
+        above = bisect_right(ordered, score)
+        record[team_id] = (below, teams - above, above - below - 1)
+    return record
+
+
+def score_matrix(league, weeks):
+    """
+    Build a teams x weeks array of scores for the given weeks.
+
+    Parameters
+    ----------
+    league : espn_api.football.League
+        The league to read the box scores of.
+    weeks : list
+        The weeks to include, one column each.
+
+    Returns
+    -------
+    tuple
+        The scores (NaN where a team did not play a head-to-head matchup), a boolean array that is True
+        where the team won its matchup, and the order each team appears in that week's box scores.
+        Rows follow the order of ``league.teams``.
+    """
+
+    # imported here so reports that never build the matrix do not pay for importing numpy
+    import numpy as np
+    rows = {team.team_id: row for row, team in enumerate(league.teams)}
+    scores = np.full((len(rows), len(weeks)), np.nan)
+    won = np.zeros((len(rows), len(weeks)), dtype=bool)
+    order = np.zeros((len(rows), len(weeks)), dtype=int)
+
+    box_scores = box_score_cache.get_weeks(league, weeks)
+    for col, week in enumerate(weeks):
+        position = 0
+        for i in box_scores[box_score_cache.resolve_week(league, week)]:
+            if i.home_team and i.away_team:
+                home, away = rows[i.home_team.team_id], rows[i.away_team.team_id]
+                scores[home, col] = i.home_score
+                scores[away, col] = i.away_score
+                # a tied matchup goes to the away team, as in get_weekly_score_with_win_loss
+                won[home, col] = i.home_score > i.away_score
+                won[away, col] = not won[home, col]
+                order[home, col] = position
+                order[away, col] = position + 1
+                position += 2
+
+    return scores, won, order
+
+
+def all_play_matrix(scores, won=None, order=None):
+    """
+    Rank every week's column of a score matrix and turn the ranks into all-play wins and losses.
+
+    Within a week a team beats every team ranked below it. Equal scores are ranked by matchup result and
+    then by box score order, so every pair of teams produces exactly one win and one loss.
+
+    Parameters
+    ----------
+    scores : numpy.ndarray
+        A teams x weeks array of scores, NaN where a team did not play.
+    won : numpy.ndarray, optional
+        A teams x weeks boolean array, True where the team won its matchup.
+    order : numpy.ndarray, optional
+        A teams x weeks array with the order teams appear in each week's box scores.
+
+    Returns
+    -------
+    tuple
+        Two teams x weeks integer arrays holding each team's all-play wins and losses per week.
+    """
+
+    import numpy as np
+    if won is None:
+        won = np.zeros(scores.shape, dtype=bool)
+    if order is None:
+        order = np.zeros(scores.shape, dtype=int)
+
+    played = ~np.isnan(scores)
+    # lexsort sorts by the last key first and pushes NaN to the end, so weeks are ranked by
+    # highest score, then matchup winners, then box score order
+    ranking = np.lexsort((order.T, ~won.T, -scores.T), axis=-1)
+    ranks = np.empty_like(ranking)
+    np.put_along_axis(ranks, ranking, np.arange(scores.shape[0]), axis=-1)
+    ranks = ranks.T
+
+    teams_played = played.sum(axis=0)
+    losses = np.where(played, ranks, 0)
+    wins = np.where(played, teams_played - 1 - ranks, 0)
+    return wins, losses
+
+
+class AllPlayLedger(object):
+    """
+    Cumulative all-play (simulated) records for a single league.
+
+    Settled weeks (see box_score_cache.is_final) are added to the ledger once and never recomputed.
+    Later weeks, which may still get stat corrections, are computed on the fly and not kept.
+
+    Methods
+    -------
+    records(league, week)
+        Returns every team's cumulative all-play record through the given week.
+    """
+
+    def __init__(self):
+        # totals[i] holds the cumulative records through week i + 1
+        self.totals = []
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return "AllPlayLedger(%d weeks)" % len(self.totals)
+
+    def records(self, league, week):
+        """
+        Returns every team's cumulative all-play record through the given week.
+
+        Parameters
+        ----------
+        league : espn_api.football.League
+            The league the ledger belongs to.
+        week : int
+            The last week to include.
+
+        Returns
+        -------
+        dict
+            A dictionary with team ids as keys and [wins, losses, ties] lists as values.
+        """
+
+        with self._lock:
+            # fetch every week the ledger has not seen yet in one concurrent batch
+            box_score_cache.get_weeks(league, range(len(self.totals) + 1, week + 1))
+            while len(self.totals) < week and box_score_cache.is_final(league, len(self.totals) + 1):
+                previous = self.totals[-1] if self.totals else {}
+                self.totals.append(self._add(previous, len(self.totals) + 1, league))
+
+            done = min(week, len(self.totals))
+            totals = self.totals[done - 1] if done > 0 else {}
+
+        for w in range(done + 1, week + 1):
+            totals = self._add(totals, w, league)
+        return totals
+
+    def _add(self, totals, week, league):
+        totals = {team_id: list(record) for team_id, record in totals.items()}
+        for team_id, (wins, losses, ties) in week_record(
+                weekly_scores(box_score_cache.get_box_scores(league, week=week))).items():
+            record = totals.setdefault(team_id, [0, 0, 0])
+            record[0] += wins
+            record[1] += losses
+            record[2] += ties
+        return totals
+
+
+_ledgers = {}
+_ledgers_lock = threading.Lock()
+
+
+def get_ledger(league):
+    """
+    Return the process-wide all-play ledger for a league, creating it if needed.
+
+    Parameters
+    ----------
+    league : espn_api.football.League
+        The league whose ledger is requested.
+
+    Returns
+    -------
+    AllPlayLedger
+        The ledger for the league.
+    """
+
+    key = (str(league.league_id), league.year)
+    with _ledgers_lock:
+        try:
+            return _ledgers[key]
+        except KeyError:
+            _ledgers[key] = AllPlayLedger()
+            return _ledgers[key]
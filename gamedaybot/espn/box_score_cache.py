@@ -0,0 +1,446 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+import contextvars
+import copy
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# How many weeks a multi-week report fetches at once, and how many box score requests
+# may be outstanding against ESPN across every job and league in the process.
+fetch_workers = 4
+max_in_flight = 4
+_in_flight = threading.BoundedSemaphore(max_in_flight)
+
+# ESPN applies stat corrections for a week until the middle of the next one, so a week only stops changing
+# once a full scoring period has passed after it
+SETTLE_WEEKS = 1
+
+
+def configure_fetching(workers=4, limit=4):
+    """
+    Set the thread pool size used by ``get_weeks`` and the process-wide limit of concurrent ESPN box score requests.
+
+    Called once at process startup, before any job runs: jobs already waiting on the old limit would
+    not be bound by a new one.
+
+    Parameters
+    ----------
+    workers : int
+        The number of weeks fetched concurrently by one report.
+    limit : int
+        The maximum number of box score requests outstanding at any time.
+    """
+
+    global fetch_workers, max_in_flight, _in_flight
+    fetch_workers = max(1, workers)
+    max_in_flight = max(1, limit)
+    _in_flight = threading.BoundedSemaphore(max_in_flight)
+
+
+def resolve_week(league, week=None):
+    """
+    Resolve the scoring period that ``league.box_scores(week)`` would actually return.
+
+    Parameters
+    ----------
+    league: espn_api.football.League
+        The league the box scores belong to.
+    week: int, optional
+        The requested week. ``None`` (or a future week) means the current week.
+
+    Returns
+    -------
+    int
+        The week number used as the cache key.
+    """
+
+    if week and week <= league.current_week:
+        return week
+    return league.current_week
+
+
+def is_final(league, week):
+    """
+    Check whether a week's box scores can no longer change, stat corrections included.
+
+    Parameters
+    ----------
+    league: espn_api.football.League
+        The league the week belongs to.
+    week: int
+        The week to check.
+
+    Returns
+    -------
+    bool
+        True if a full scoring period has passed since the week, or since the end of the season.
+    """
+
+    return (week < league.current_week - SETTLE_WEEKS
+            or league.scoringPeriodId > league.finalScoringPeriod + SETTLE_WEEKS)
+
+
+def relink_teams(box_scores, league):
+    """
+    Point the home and away teams of a list of box scores at the Team objects of the given league.
+
+    Reports key dictionaries by Team object, so box scores fetched through another League instance
+    must reference this league's teams before they are handed out.
+
+    Parameters
+    ----------
+    box_scores: list
+        A list of espn_api BoxScore objects.
+    league: espn_api.football.League
+        The league whose Team objects should be referenced.
+
+    Returns
+    -------
+    list
+        Shallow copies of the box scores referencing the league's teams.
+    """
+
+    teams = {team.team_id: team for team in league.teams}
+    relinked = []
+    for box in box_scores:
+        box = copy.copy(box)
+        if hasattr(box.home_team, 'team_id'):
+            box.home_team = teams.get(box.home_team.team_id, box.home_team)
+        if hasattr(box.away_team, 'team_id'):
+            box.away_team = teams.get(box.away_team.team_id, box.away_team)
+        relinked.append(box)
+    return relinked
+
+
+class CacheRun(object):
+    """
+    One job run's view of a league's box score cache.
+
+    Concurrent jobs for the same league share the cached weeks but each has its own run, so starting one
+    never throws away the snapshot or the counters of another.
+
+    Parameters
+    ----------
+    ttl : int, optional
+        How many seconds an entry fetched before the run started may still be used. 0 uses only weeks
+        fetched since the run started. None trusts every cached entry.
+    store : BoxScoreStore, optional
+        An on-disk archive consulted for completed weeks before going to ESPN.
+    cache : BoxScoreCache, optional
+        The cache the run belongs to.
+
+    Attributes
+    ----------
+    hits : int
+        Number of lookups answered from the cache during the run.
+    misses : int
+        Number of lookups that were not in memory during the run.
+    fetches : int
+        Number of misses that went to ESPN rather than the on-disk archive.
+    """
+
+    def __init__(self, ttl=0, store=None, cache=None):
+        self.ttl = ttl
+        self.store = store
+        self.cache = cache
+        self.started = time.monotonic()
+        self.hits = 0
+        self.misses = 0
+        self.fetches = 0
+
+    def __repr__(self):
+        return "CacheRun(%d hits, %d misses, %d fetches)" % (self.hits, self.misses, self.fetches)
+
+    def is_valid(self, fetched_at):
+        if self.ttl is None or fetched_at >= self.started:
+            return True
+        return time.monotonic() - fetched_at < self.ttl
+
+
+# The run of the job executing in the current context, see BoxScoreCache.start_run
+_run = contextvars.ContextVar('box_score_run', default=None)
+
+
+class BoxScoreCache(object):
+    """
+    A week-keyed cache of box scores for a single league.
+
+    Which entries a lookup may reuse, where completed weeks are archived and the hit and miss counters
+    belong to the job run started in the current context (see start_run). Lookups outside of any run trust
+    every entry.
+
+    Parameters
+    ----------
+    store : BoxScoreStore, optional
+        An on-disk archive for completed weeks, used by lookups outside of any run.
+    """
+
+    def __init__(self, store=None):
+        self._default = CacheRun(ttl=None, store=store, cache=self)
+        self._entries = {}
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return "BoxScoreCache(%d weeks)" % len(self._entries)
+
+    def start_run(self, ttl=0, store=None):
+        """
+        Begin a new job run in the current context. Entries cached by other runs are left in place,
+        this run just ignores those older than its ttl.
+
+        Parameters
+        ----------
+        ttl : int
+            How many seconds an entry fetched before this run stays valid for it. 0 keeps entries for one run only.
+        store : BoxScoreStore, optional
+            The on-disk archive to use for completed weeks during this run.
+
+        Returns
+        -------
+        CacheRun
+            The run, with its own counters.
+        """
+
+        run = CacheRun(ttl, store, self)
+        _run.set(run)
+        return run
+
+    def current_run(self):
+        run = _run.get()
+        if run is None or run.cache is not self:
+            return self._default
+        return run
+
+    def clear(self):
+        with self._lock:
+            self._entries = {}
+
+    def get(self, league, week=None):
+        """
+        Return the box scores for a week, fetching them from ESPN only if they are not cached.
+
+        Parameters
+        ----------
+        league: espn_api.football.League
+            The league to retrieve the box scores for.
+        week: int, optional
+            The week to retrieve. Defaults to the current week.
+
+        Returns
+        -------
+        list
+            A list of espn_api BoxScore objects.
+        """
+
+        week = resolve_week(league, week)
+        run = self.current_run()
+        waiting = False
+        with self._lock:
+            entry = self._entries.get(week)
+            if entry is not None and run.is_valid(entry[0]):
+                run.hits += 1
+                fetched_at, teams, box_scores = entry
+                # the league (or its teams, after a refresh) changed since the fetch
+                if teams is not league.teams:
+                    box_scores = relink_teams(box_scores, league)
+                    self._entries[week] = (fetched_at, league.teams, box_scores)
+                return box_scores
+
+            # another thread is already fetching this week, wait for it instead of fetching twice
+            pending = self._pending.get(week)
+            if pending is None:
+                run.misses += 1
+                pending = self._pending[week] = Future()
+            else:
+                run.hits += 1
+                waiting = True
+
+        if waiting:
+            return relink_teams(pending.result(), league)
+
+        try:
+            box_scores = self._fetch(league, week, run)
+        except Exception as e:
+            with self._lock:
+                del self._pending[week]
+            pending.set_exception(e)
+            raise
+
+        with self._lock:
+            # an expired entry is replaced rather than dropped, so the cache never holds more than one entry a week
+            self._entries[week] = (time.monotonic(), league.teams, box_scores)
+            del self._pending[week]
+        pending.set_result(box_scores)
+        return box_scores
+
+    def get_weeks(self, league, weeks, workers=None):
+        """
+        Return the box scores for several weeks, fetching the missing ones concurrently.
+
+        Parameters
+        ----------
+        league: espn_api.football.League
+            The league to retrieve the box scores for.
+        weeks: iterable
+            The weeks to retrieve.
+        workers: int, optional
+            The number of weeks fetched at once. Defaults to the configured ``fetch_workers``.
+
+        Returns
+        -------
+        dict
+            A dictionary with weeks as keys and lists of BoxScore objects as values.
+        """
+
+        weeks = sorted(set(resolve_week(league, week) for week in weeks))
+        workers = min(workers or fetch_workers, len(weeks))
+        if workers <= 1:
+            return {week: self.get(league, week) for week in weeks}
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='box_scores') as pool:
+            # each fetch runs in a copy of the caller's context, so per-report request counts include it
+            futures = {week: pool.submit(contextvars.copy_context().run, self.get, league, week) for week in weeks}
+            return {week: future.result() for week, future in futures.items()}
+
+    def _fetch(self, league, week, run):
+        # settled weeks never change, so they come from the archive when possible and only
+        # the in-progress week and the one still open to stat corrections go to the network
+        if run.store is None or not is_final(league, week):
+            return self._request(league, week, run)
+
+        box_scores = run.store.load(league, week)
+        if box_scores is None:
+            box_scores = self._request(league, week, run)
+            run.store.save(league, week, box_scores)
+            logger.debug("Archived box scores for week %d" % week)
+        return box_scores
+
+    def _request(self, league, week, run):
+        with self._lock:
+            run.fetches += 1
+        with _in_flight:
+            return league.box_scores(week=week)
+
+    def stats(self):
+        """
+        Returns
+        -------
+        dict
+            The hit, miss and fetch counters of the current run and the weeks cached for it.
+        """
+
+        run = self.current_run()
+        with self._lock:
+            weeks = sorted(week for week, entry in self._entries.items() if run.is_valid(entry[0]))
+            return {'hits': run.hits, 'misses': run.misses, 'fetches': run.fetches, 'weeks': weeks}
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_cache(league):
+    """
+    Return the process-wide box score cache for a league, creating it if needed.
+
+    Parameters
+    ----------
+    league: espn_api.football.League
+        The league whose cache is requested.
+
+    Returns
+    -------
+    BoxScoreCache
+        The cache shared by every report for this league.
+    """
+
+    key = (str(league.league_id), league.year)
+    with _caches_lock:
+        try:
+            return _caches[key]
+        except KeyError:
+            _caches[key] = BoxScoreCache()
+            return _caches[key]
+
+
+def get_box_scores(league, week=None):
+    """
+    Drop-in replacement for ``league.box_scores(week)`` that reads through the league's cache.
+
+    Parameters
+    ----------
+    league: espn_api.football.League
+        The league to retrieve the box scores for.
+    week: int, optional
+        The week to retrieve. Defaults to the current week.
+
+    Returns
+    -------
+    list
+        A list of espn_api BoxScore objects.
+    """
+
+    return get_cache(league).get(league, week)
+
+
+def get_weeks(league, weeks):
+    """
+    Return the box scores for several weeks through the league's cache, fetching the missing weeks concurrently.
+
+    Parameters
+    ----------
+    league: espn_api.football.League
+        The league to retrieve the box scores for.
+    weeks: iterable
+        The weeks to retrieve.
+
+    Returns
+    -------
+    dict
+        A dictionary with weeks as keys and lists of BoxScore objects as values.
+    """
+
+    return get_cache(league).get_weeks(league, weeks)
+
+
+def fetch_fresh(league, week=None):
+    """
+    Fetch a week's box scores from ESPN, bypassing and leaving alone the league's cache.
+
+    For polling live scores, which must see every change while other reports keep sharing their snapshot.
+    The request still counts against the process-wide limit of concurrent box score requests.
+
+    Parameters
+    ----------
+    league: espn_api.football.League
+        The league to retrieve the box scores for.
+    week: int, optional
+        The week to retrieve. Defaults to the current week.
+
+    Returns
+    -------
+    list
+        A list of espn_api BoxScore objects.
+    """
+
+    with _in_flight:
+        return league.box_scores(week=resolve_week(league, week))
+
+
+def start_run(league, ttl=0, store=None):
+    """
+    Begin a job run for a league in the current context. The run reuses cached weeks up to ``ttl`` seconds old
+    and counts its own hits and misses. Completed weeks are read from and written to ``store`` when one is given.
+    """
+
+    return get_cache(league).start_run(ttl, store)
+
+
+def log_stats(league, function=''):
+    stats = get_cache(league).stats()
+    logger.info("Box score cache for %s: %d hits, %d misses, %d ESPN fetches, weeks cached %s" %
+                (function, stats['hits'], stats['misses'], stats['fetches'], stats['weeks']))
+    return stats
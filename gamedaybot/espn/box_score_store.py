@@ -0,0 +1,130 @@
+import copy
+import contextlib
+import logging
+import os
+import pickle
+import sqlite3
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class BoxScoreStore(object):
+    """
+    An on-disk SQLite archive of box scores for weeks that are already final.
+
+    Box scores are stored without their Team objects (only the team ids are kept) and are
+    re-linked to the requesting league's teams when loaded.
+
+    Parameters
+    ----------
+    path : str
+        The path of the SQLite database file. Parent directories are created if needed.
+
+    Methods
+    -------
+    load(league, week)
+        Returns the archived box scores for a week, or None if the week is not archived.
+    save(league, week, box_scores)
+        Archives the box scores of a completed week.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute('CREATE TABLE IF NOT EXISTS box_scores ('
+                         'league_id TEXT NOT NULL, year INTEGER NOT NULL, week INTEGER NOT NULL, '
+                         'saved_at REAL NOT NULL, payload BLOB NOT NULL, '
+                         'PRIMARY KEY (league_id, year, week))')
+
+    def __repr__(self):
+        return "BoxScoreStore(%s)" % self.path
+
+    @contextlib.contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def load(self, league, week):
+        """
+        Returns the archived box scores for a week.
+
+        Parameters
+        ----------
+        league: espn_api.football.League
+            The league the box scores belong to.
+        week: int
+            The week to load.
+
+        Returns
+        -------
+        list or None
+            The box scores linked to the league's teams, or None if the week is not archived.
+        """
+
+        with self._connect() as conn:
+            row = conn.execute('SELECT payload FROM box_scores WHERE league_id = ? AND year = ? AND week = ?',
+                               (str(league.league_id), league.year, week)).fetchone()
+        if row is None:
+            return None
+
+        try:
+            box_scores = pickle.loads(row[0])
+        except Exception as e:
+            # written by an older espn_api version; refetch it
+            logger.warning("Discarding archived box scores for week %d: %s" % (week, e))
+            return None
+
+        teams = {team.team_id: team for team in league.teams}
+        for box in box_scores:
+            box.home_team = teams.get(box.home_team, box.home_team)
+            box.away_team = teams.get(box.away_team, box.away_team)
+        return box_scores
+
+    def save(self, league, week, box_scores):
+        """
+        Archives the box scores of a completed week, replacing any previous copy.
+
+        Parameters
+        ----------
+        league: espn_api.football.League
+            The league the box scores belong to.
+        week: int
+            The week being archived.
+        box_scores: list
+            The box scores returned by ``league.box_scores(week)``.
+        """
+
+        detached = []
+        for box in box_scores:
+            box = copy.copy(box)
+            if hasattr(box.home_team, 'team_id'):
+                box.home_team = box.home_team.team_id
+            if hasattr(box.away_team, 'team_id'):
+                box.away_team = box.away_team.team_id
+            detached.append(box)
+
+        with self._connect() as conn:
+            conn.execute('INSERT OR REPLACE INTO box_scores (league_id, year, week, saved_at, payload) '
+                         'VALUES (?, ?, ?, ?, ?)',
+                         (str(league.league_id), league.year, week, time.time(), pickle.dumps(detached)))
+
+    def weeks(self, league):
+        """
+        Returns
+        -------
+        list
+            The weeks archived for the league.
+        """
+
+        with self._connect() as conn:
+            rows = conn.execute('SELECT week FROM box_scores WHERE league_id = ? AND year = ? ORDER BY week',
+                                (str(league.league_id), league.year)).fetchall()
+        return [row[0] for row in rows]
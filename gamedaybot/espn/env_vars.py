@@ -1,39 +1,106 @@
+import collections
+import contextlib
+import contextvars
 import os
 import gamedaybot.utils.util as util
 
+# In multi-league mode each job runs with its league's manifest entry layered over the process
+# environment, so every setting below (and the emotes and users) is read for the right league.
+_league_environ = contextvars.ContextVar('league_environ', default=None)
+
+
+def environ():
+    """
+    Returns the environment settings are read from: the current league's overrides, if any, over os.environ.
+
+    Returns
+    -------
+    Mapping
+        The environment for the current league.
+    """
+
+    overrides = _league_environ.get()
+    if overrides is None:
+        return os.environ
+    return collections.ChainMap(overrides, os.environ)
+
+
+@contextlib.contextmanager
+def league_environ(overrides):
+    """
+    Layers a league's settings over the process environment for the duration of the block.
+
+    Parameters
+    ----------
+    overrides : dict
+        Environment variable names and string values, e.g. one entry of a league manifest.
+    """
+
+    token = _league_environ.set(overrides)
+    try:
+        yield
+    finally:
+        _league_environ.reset(token)
+
+
+def get_fetch_limits():
+    """
+    Returns the box score fetching settings, FETCH_WORKERS and FETCH_MAX_IN_FLIGHT.
+
+    They apply to the whole process, so they are read from the process environment only,
+    never from a league's manifest entry.
+
+    Returns
+    -------
+    tuple
+        The weeks a report fetches at once, and the most box score requests open at the same time.
+    """
+
+    try:
+        fetch_workers = int(os.environ["FETCH_WORKERS"])
+    except KeyError:
+        fetch_workers = 4
+
+    try:
+        fetch_max_in_flight = int(os.environ["FETCH_MAX_IN_FLIGHT"])
+    except KeyError:
+        fetch_max_in_flight = 4
+
+    return fetch_workers, fetch_max_in_flight
+
 
 def get_env_vars():
     data = {}
     try:
-        ff_start_date = os.environ["START_DATE"]
+        ff_start_date = environ()["START_DATE"]
     except KeyError:
         ff_start_date = '2025-09-03'
 
     data['ff_start_date'] = ff_start_date
 
     try:
-        ff_end_date = os.environ["END_DATE"]
+        ff_end_date = environ()["END_DATE"]
     except KeyError:
         ff_end_date = '2026-01-04'
 
     data['ff_end_date'] = ff_end_date
 
     try:
-        my_timezone = os.environ["TIMEZONE"]
+        my_timezone = environ()["TIMEZONE"]
     except KeyError:
         my_timezone = 'America/New_York'
 
     data['my_timezone'] = my_timezone
 
     try:
-        daily_waiver = util.str_to_bool(os.environ["DAILY_WAIVER"])
+        daily_waiver = util.str_to_bool(environ()["DAILY_WAIVER"])
     except KeyError:
         daily_waiver = False
 
     data['daily_waiver'] = daily_waiver
 
     try:
-        monitor_report = util.str_to_bool(os.environ["MONITOR_REPORT"])
+        monitor_report = util.str_to_bool(environ()["MONITOR_REPORT"])
     except KeyError:
         monitor_report = True
 
@@ -42,18 +109,18 @@ def get_env_vars():
     str_limit = 40000  # slack char limit
 
     try:
-        bot_id = os.environ["BOT_ID"]
+        bot_id = environ()["BOT_ID"]
         str_limit = 1000
     except KeyError:
         bot_id = 1
 
     try:
-        slack_webhook_url = os.environ["SLACK_WEBHOOK_URL"]
+        slack_webhook_url = environ()["SLACK_WEBHOOK_URL"]
     except KeyError:
         slack_webhook_url = 1
 
     try:
-        discord_webhook_url = os.environ["DISCORD_WEBHOOK_URL"]
+        discord_webhook_url = environ()["DISCORD_WEBHOOK_URL"]
         str_limit = 2000
     except KeyError:
         discord_webhook_url = 1
@@ -70,17 +137,17 @@ def get_env_vars():
     data['slack_webhook_url'] = slack_webhook_url
     data['discord_webhook_url'] = discord_webhook_url
 
-    data['league_id'] = os.environ["LEAGUE_ID"]
+    data['league_id'] = environ()["LEAGUE_ID"]
 
     try:
-        year = int(os.environ["LEAGUE_YEAR"])
+        year = int(environ()["LEAGUE_YEAR"])
     except KeyError:
         year = 2025
 
     data['year'] = year
 
     try:
-        swid = os.environ["SWID"]
+        swid = environ()["SWID"]
     except KeyError:
         swid = '{1}'
 
@@ -92,21 +159,21 @@ def get_env_vars():
     data['swid'] = swid
 
     try:
-        espn_s2 = os.environ["ESPN_S2"]
+        espn_s2 = environ()["ESPN_S2"]
     except KeyError:
         espn_s2 = '1'
 
     data['espn_s2'] = espn_s2
 
     try:
-        test = util.str_to_bool(os.environ["TEST"])
+        test = util.str_to_bool(environ()["TEST"])
     except KeyError:
         test = False
 
     data['test'] = test
 
     try:
-        top_half_scoring = util.str_to_bool(os.environ["TOP_HALF_SCORING"])
+        top_half_scoring = util.str_to_bool(environ()["TOP_HALF_SCORING"])
     except KeyError:
         top_half_scoring = False
 
@@ -115,28 +182,169 @@ def get_env_vars():
     data['random_phrase'] = get_random_phrase()
 
     try:
-        waiver_report = util.str_to_bool(os.environ["WAIVER_REPORT"])
+        waiver_report = util.str_to_bool(environ()["WAIVER_REPORT"])
     except KeyError:
         waiver_report = False
 
     data['waiver_report'] = waiver_report
 
     try:
-        extra_trophies = util.str_to_bool(os.environ["EXTRA_TROPHIES"])
+        extra_trophies = util.str_to_bool(environ()["EXTRA_TROPHIES"])
     except KeyError:
         extra_trophies = False
 
     data['extra_trophies'] = extra_trophies
 
     try:
-        score_warn = int(os.environ["SCORE_WARNING"])
+        score_warn = int(environ()["SCORE_WARNING"])
     except KeyError:
         score_warn = 0
 
     data['score_warn'] = score_warn
 
     try:
-        data['init_msg'] = os.environ["INIT_MSG"]
+        box_score_cache_ttl = int(environ()["BOX_SCORE_CACHE_TTL"])
+    except KeyError:
+        box_score_cache_ttl = 0
+
+    data['box_score_cache_ttl'] = box_score_cache_ttl
+
+    try:
+        data_dir = environ()["DATA_DIR"]
+    except KeyError:
+        data_dir = 'data'
+
+    data['data_dir'] = data_dir
+
+    try:
+        box_score_store = util.str_to_bool(environ()["BOX_SCORE_STORE"])
+    except KeyError:
+        box_score_store = True
+
+    data['box_score_store'] = box_score_store
+
+    try:
+        league_max_age = int(environ()["LEAGUE_MAX_AGE"])
+    except KeyError:
+        league_max_age = 3600
+
+    data['league_max_age'] = league_max_age
+
+    try:
+        status_max_age = int(environ()["STATUS_MAX_AGE"])
+    except KeyError:
+        status_max_age = 300
+
+    data['status_max_age'] = status_max_age
+
+    try:
+        discord_connect_timeout = float(environ()["DISCORD_CONNECT_TIMEOUT"])
+    except KeyError:
+        discord_connect_timeout = 5
+
+    data['discord_connect_timeout'] = discord_connect_timeout
+
+    try:
+        discord_read_timeout = float(environ()["DISCORD_READ_TIMEOUT"])
+    except KeyError:
+        discord_read_timeout = 15
+
+    data['discord_read_timeout'] = discord_read_timeout
+
+    try:
+        espn_http_mode = environ()["ESPN_HTTP_MODE"].lower()
+    except KeyError:
+        espn_http_mode = ''
+
+    data['espn_http_mode'] = espn_http_mode
+
+    try:
+        espn_fixture_dir = environ()["ESPN_FIXTURE_DIR"]
+    except KeyError:
+        espn_fixture_dir = os.path.join(data_dir, 'espn_fixtures')
+
+    data['espn_fixture_dir'] = espn_fixture_dir
+
+    # one timeout for every ESPN request in the process, so like the fetch limits it is not read from a manifest
+    try:
+        espn_timeout = float(os.environ["ESPN_TIMEOUT"])
+    except KeyError:
+        espn_timeout = 30
+
+    data['espn_timeout'] = espn_timeout
+
+    try:
+        metrics_port = int(environ()["METRICS_PORT"])
+    except KeyError:
+        metrics_port = 0
+
+    data['metrics_port'] = metrics_port
+
+    try:
+        metrics_address = environ()["METRICS_ADDRESS"]
+    except KeyError:
+        metrics_address = '127.0.0.1'
+
+    data['metrics_address'] = metrics_address
+
+    try:
+        metrics_file = environ()["METRICS_FILE"]
+    except KeyError:
+        metrics_file = os.path.join(data_dir, 'metrics.prom')
+
+    data['metrics_file'] = metrics_file
+
+    try:
+        profile_functions = [function.strip() for function in environ()["PROFILE_FUNCTIONS"].split(',') if function.strip()]
+    except KeyError:
+        profile_functions = []
+
+    data['profile_functions'] = profile_functions
+
+    try:
+        profile_dir = environ()["PROFILE_DIR"]
+    except KeyError:
+        profile_dir = os.path.join(data_dir, 'profiles')
+
+    data['profile_dir'] = profile_dir
+
+    try:
+        live_scores = util.str_to_bool(environ()["LIVE_SCORES"])
+    except KeyError:
+        live_scores = False
+
+    data['live_scores'] = live_scores
+
+    try:
+        live_interval = max(60, int(environ()["LIVE_INTERVAL"]))
+    except KeyError:
+        live_interval = 120
+
+    data['live_interval'] = live_interval
+
+    try:
+        live_max_interval = int(environ()["LIVE_MAX_INTERVAL"])
+    except KeyError:
+        live_max_interval = 900
+
+    data['live_max_interval'] = live_max_interval
+
+    try:
+        send_ledger_max_age = int(environ()["SEND_LEDGER_MAX_AGE"])
+    except KeyError:
+        send_ledger_max_age = 7 * 24 * 3600
+
+    data['send_ledger_max_age'] = send_ledger_max_age
+
+    try:
+        player_cache_ttl = int(environ()["PLAYER_CACHE_TTL"])
+    except KeyError:
+        player_cache_ttl = 6 * 3600
+
+    data['player_cache_ttl'] = player_cache_ttl
+
+    try:
+        data['init_msg'] = environ()["INIT_MSG"]
     except KeyError:
         # do nothing here, empty init message
         pass
@@ -147,7 +355,7 @@ def get_env_vars():
 def get_random_phrase():
     random_phrase = False
     try:
-        random_phrase = util.str_to_bool(os.environ["RANDOM_PHRASE"])
+        random_phrase = util.str_to_bool(environ()["RANDOM_PHRASE"])
     except KeyError:
         random_phrase = False
 
@@ -157,7 +365,7 @@ def get_random_phrase():
 def split_emotes(league):
     emotes = ['']
     try:
-        emotes += os.environ["EMOTES"].split(',')
+        emotes += environ()["EMOTES"].split(',')
     except KeyError:
         emotes += [''] * league.teams[-1].team_id
 
@@ -167,7 +375,7 @@ def split_emotes(league):
 def split_users(league):
     users = ['']
     try:
-        users += os.environ["USERS"].split(',')
+        users += environ()["USERS"].split(',')
     except KeyError:
         users += [''] * league.teams[-1].team_id
 
@@ -3,21 +3,32 @@ import os
 import sys
 sys.path.insert(1, os.path.abspath('.'))
 import gamedaybot.utils.util as util
-from gamedaybot.chat.discord import Discord
+import gamedaybot.utils.metrics as metrics
+import gamedaybot.utils.profiling as profiling
+from gamedaybot.chat.discord import Discord, get_queue, replace_formatting
+import gamedaybot.chat.send_ledger as send_ledger
 from gamedaybot.espn.env_vars import get_env_vars
 import gamedaybot.espn.functionality as espn
 import gamedaybot.espn.season_recap as recap
+import gamedaybot.espn.live as live
+import gamedaybot.espn.box_score_cache as box_score_cache
+import gamedaybot.espn.espn_http as espn_http
+import gamedaybot.espn.player_cache as player_cache
+import gamedaybot.espn.waiver_watermark as waiver_watermark
+from gamedaybot.espn.box_score_store import BoxScoreStore
 
 from espn_api.football import League
+import functools
 import json
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 # logger.setLevel(logging.INFO)
 logger.setLevel(logging.DEBUG)
 
 
-def espn_bot(function):
+def espn_bot(function, session=None):
     """
     This function is used to send messages to a messaging platform (e.g. Slack, Discord, or GroupMe) with information
     about a fantasy football league.
@@ -26,11 +37,17 @@ def espn_bot(function):
     ----------
     function: str
         A string that specifies which type of information to send (e.g. "get_matchups", "get_power_rankings").
+    session: LeagueSession, optional
+        A long-lived league session to take the League from. If not provided, a new League is built for this call.
 
     Returns
     -------
     None
 
+    See Also
+    --------
+    espn_bot_group : runs several reports against one League and box score snapshot.
+
     Notes
     -----
     The function uses the following information from the data dictionary:
@@ -65,9 +82,33 @@ def espn_bot(function):
     get_standings: sends a message with the standings for the league.
     get_final: sends the final scores and trophies for the previous week.
     get_waiver_report: sends a message with the waiver report for the league.
+    get_live_updates: sends the lead changes, final scores and projection flips since the last poll, if any.
     init: sends a message to confirm that the bot has been set up.
     """
     
+    espn_bot_group([function], session)
+
+
+def espn_bot_group(functions, session=None):
+    """
+    Runs several reports against one shared League and box score snapshot and posts them in order.
+
+    Reports scheduled for the same moment are grouped so the League is refreshed and every week of box scores
+    is fetched once for the whole group instead of once per report.
+
+    Parameters
+    ----------
+    functions: list
+        The reports to run, in the order they are posted. Accepts the same values as espn_bot.
+    session: LeagueSession, optional
+        A long-lived league session to take the League from. If not provided, a new League is built for this call.
+
+    Returns
+    -------
+    list
+        The reports that raised instead of returning text, in order. The others are still posted.
+    """
+
     data = get_env_vars()
     str_limit = data['str_limit']
 
@@ -123,31 +164,156 @@ def espn_bot(function):
     except KeyError:
         test = False
 
-    discord_bot = Discord(discord_webhook_url)
+    try:
+        box_score_cache_ttl = data['box_score_cache_ttl']
+    except KeyError:
+        box_score_cache_ttl = 0
 
-    if swid == '{1}' or espn_s2 == '1':
-        league = League(league_id=league_id, year=year)
+    try:
+        box_score_store = data['box_score_store']
+    except KeyError:
+        box_score_store = False
+
+    discord_bot = Discord(discord_webhook_url, timeout=(data['discord_connect_timeout'], data['discord_read_timeout']))
+
+    # count ESPN requests, and record the responses to fixtures or replay them with no network when asked
+    http = espn_http.configure(data['espn_http_mode'], data['espn_fixture_dir'], data['espn_timeout'])
+
+    if session:
+        # each report refreshes only what it needs; once one has, the others find it fresh
+        for function in functions:
+            with espn_http.tally() as counts:
+                league = session.get_league(function)
+            count_espn_requests(function, counts)
     else:
-        league = League(league_id=league_id, year=year, espn_s2=espn_s2, swid=swid)
+        with espn_http.tally() as counts:
+            if swid == '{1}' or espn_s2 == '1':
+                league = League(league_id=league_id, year=year)
+            else:
+                league = League(league_id=league_id, year=year, espn_s2=espn_s2, swid=swid)
+        count_espn_requests('league', counts)
+
+    player_cache.configure(data['player_cache_ttl'])
+
+    # every report in this run reads box scores through the same week-keyed cache
+    # and completed weeks are archived on disk so they are only ever fetched once
+    store = None
+    if box_score_store:
+        store = BoxScoreStore(os.path.join(data['data_dir'], 'box_scores.db'))
+    box_score_cache.start_run(league, box_score_cache_ttl, store)
+    awards_checkpoint = os.path.join(data['data_dir'], 'season_awards_%s_%s.json' % (league_id, year))
 
     try:
         broadcast_message = data['broadcast_message']
     except KeyError:
         broadcast_message = None
 
+    options = {
+        'warning': warning,
+        'extra_trophies': extra_trophies,
+        'top_half_scoring': top_half_scoring,
+        'broadcast_message': broadcast_message,
+        'init_msg': data.get('init_msg'),
+        'awards_checkpoint': awards_checkpoint,
+        # a test run must not move the watermark, or the next real report would skip what it showed
+        'waiver_watermark': None if test else os.path.join(data['data_dir'], 'waiver_watermark_%s_%s.json' % (league_id, year)),
+        'live_interval': data['live_interval'],
+        'live_max_interval': data['live_max_interval'],
+    }
+
+    # reports whose text is unchanged since it was last delivered are not posted again
+    ledger = send_ledger.get_ledger(os.path.join(data['data_dir'], 'send_ledger.json'), data['send_ledger_max_age'])
+
+    messages = []
+    sent_reports = []
+    failed = []
+    for function in functions:
+        start = time.perf_counter()
+        try:
+            with espn_http.tally() as counts:
+                if profiling.should_profile(function, data['profile_functions']):
+                    with profiling.profile('%s_%s' % (league_id, function), data['profile_dir']):
+                        text, on_delivered = get_report(function, league, options)
+                else:
+                    text, on_delivered = get_report(function, league, options)
+        except Exception:
+            # one failing report must not cost the rest of the group
+            logger.exception("Report %s failed" % function)
+            metrics.JOB_FAILURES.inc(function=function)
+            failed.append(function)
+            continue
+        finally:
+            metrics.JOB_DURATION.observe(time.perf_counter() - start, function=function)
+            count_espn_requests(function, counts)
+        if not text:
+            # nothing to deliver, so whatever the report covered is done with
+            if on_delivered and not test:
+                on_delivered()
+            continue
+        logger.debug(text)
+        key = send_ledger.ledger_key(league_id, function)
+        if function not in ('init', 'broadcast') and ledger.is_duplicate(key, text):
+            logger.info("Not posting %s, unchanged since it was last sent" % function)
+            if on_delivered and not test:
+                on_delivered()
+            continue
+        # the limit applies to the text as Discord receives it, after the formatting markers are replaced
+        chunks = util.str_limit_check(text, str_limit, measure=lambda part: len(replace_formatting(part)))
+        metrics.MESSAGE_CHUNKS.observe(len(chunks), function=function)
+        messages += chunks
+        sent_reports.append((key, text, chunks, on_delivered))
+
+    box_score_cache.log_stats(league, ', '.join(functions))
+    metrics.publish(data['metrics_port'], data['metrics_file'], data['metrics_address'])
+    stats = http.stats()
+    logger.info("ESPN requests %s so far: %d, %d bytes, %.2fs" % (http.mode, stats['requests'], stats['bytes'], stats['elapsed']))
+    if messages and not test:
+        # one put keeps the group's reports together and in order in the webhook's rate limited queue
+        get_queue(discord_bot).put(messages, on_sent=ledger.tracker(sent_reports))
+    return failed
+
+
+def count_espn_requests(function, counts):
+    metrics.ESPN_REQUESTS.inc(counts['requests'], function=function)
+    metrics.ESPN_BYTES.inc(counts['bytes'], function=function)
+
+
+def get_report(function, league, options):
+    """
+    Builds the text of one report.
+
+    Parameters
+    ----------
+    function: str
+        The report to build. Accepts the same values as espn_bot.
+    league: espn_api.football.League
+        The league to report on.
+    options: dict
+        The report settings read from the environment: warning, extra_trophies, top_half_scoring,
+        broadcast_message, init_msg, awards_checkpoint, waiver_watermark (None in test runs), live_interval
+        and live_max_interval.
+
+    Returns
+    -------
+    tuple
+        The report text, or an empty string if there is nothing to send, and a callable to run once the text
+        has been delivered, or None. The waiver report's callable moves the league's waiver watermark.
+    """
+
     # always let init and broadcast run
     if function not in ["init", "broadcast", "win_matrix", "season_trophies"] and league.scoringPeriodId > (league.finalScoringPeriod + 1):
         logger.info("Not in active season")
-        return
+        return '', None
 
     text = ''
+    on_delivered = None
     logger.info("Function: " + function)
 
     if function == "get_matchups":
         text = espn.get_matchups(league)
         # text = text + "\n\n" + espn.get_projected_scoreboard(league)
     elif function == "get_monitor":
-        text = espn.get_monitor(league, warning)
+        text = espn.get_monitor(league, options['warning'])
     elif function == "get_inactives":
         text = espn.get_inactives(league)
     elif function == "get_scoreboard_short":
@@ -164,44 +330,49 @@ def espn_bot(function):
     elif function == "win_matrix":
         text = recap.win_matrix(league)
     elif function == "season_trophies":
-        text = recap.season_trophies(league, extra_trophies)  
+        text = recap.season_trophies(league, options['extra_trophies'], checkpoint=options['awards_checkpoint'])
     elif function == "get_standings":
-        text = espn.get_standings(league, top_half_scoring)
+        text = espn.get_standings(league, options['top_half_scoring'])
     elif function == "get_optimal_scores":
         text = espn.optimal_team_scores(league)
     elif function == "get_final":
         # on Tuesday we need to get the scores of last week
         week = league.current_week - 1
         text = espn.get_scoreboard_short(league, week=week)
-        text = text + "\n\n" + espn.get_trophies(league, extra_trophies, week=week)
+        text = text + "\n\n" + espn.get_trophies(league, options['extra_trophies'], week=week)
+        if options['extra_trophies']:
+            # fold settled weeks into the end of season awards now, so season_trophies only has to render
+            try:
+                recap.update_season_awards(league, options['awards_checkpoint'])
+            except Exception as e:
+                logger.warning("Could not update season awards checkpoint: %s" % e)
+    elif function == "get_live_updates":
+        text = live.get_live_updates(league, options['live_interval'], options['live_max_interval'])
     elif function == "get_waiver_report":
         faab = league.settings.faab
-        text = espn.get_waiver_report(league, faab)
+        path = options['waiver_watermark']
+        if path:
+            text, mark = espn.get_waiver_report_since(league, waiver_watermark.load_watermark(path), faab)
+            # saved only once the report is delivered, so a dropped post is reported again next time
+            on_delivered = functools.partial(waiver_watermark.save_watermark, mark, path)
+        else:
+            text = espn.get_waiver_report(league, faab)
     elif function == "broadcast":
-        try:
-            text = broadcast_message
-        except KeyError:
-            # do nothing here, empty broadcast message
-            pass
+        # empty if no broadcast message is set
+        text = options['broadcast_message']
     elif function == "init":
-        try:
-            text = data["init_msg"]
-        except KeyError:
-            # do nothing here, empty init message
-            pass
+        # empty if no init message is set
+        text = options['init_msg']
     else:
         text = "Something bad happened. HALP"
 
-    logger.debug(data)
-    if text != '' and not test:
-        logger.debug(text)
-        messages = util.str_limit_check(text, str_limit)
-        for message in messages:
-            discord_bot.send_message(message)  
+    return text or '', on_delivered
 
 
 if __name__ == '__main__':
     from gamedaybot.espn.scheduler import scheduler
 
-    espn_bot("init")
+    # in multi-league mode the scheduler sends each league's init message
+    if not os.environ.get("LEAGUE_MANIFEST"):
+        espn_bot("init")
     scheduler()
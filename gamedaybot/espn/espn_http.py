@@ -0,0 +1,251 @@
+import contextlib
+import contextvars
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+
+import requests
+from espn_api.requests import espn_requests
+
+logger = logging.getLogger(__name__)
+
+MODES = ('live', 'record', 'replay')
+
+# Seconds to wait for ESPN to connect and to answer; espn_api sets no timeout of its own
+timeout = 30
+
+# the request and byte counts of the report currently running, if it asked for them
+_tally = contextvars.ContextVar('espn_tally', default=None)
+
+
+class ReplayMissing(Exception):
+    pass
+
+
+def fixture_key(url, params=None, headers=None):
+    """
+    Returns the name a request is stored under in a fixture directory.
+
+    The url, query parameters and headers (which carry ESPN's x-fantasy-filter) identify a request.
+    Cookies do not, so fixtures recorded with private league credentials replay without them.
+
+    Parameters
+    ----------
+    url : str
+        The request url.
+    params : dict, optional
+        The query parameters.
+    headers : dict, optional
+        The request headers.
+
+    Returns
+    -------
+    str
+        A hex digest.
+    """
+
+    canonical = json.dumps({'url': url, 'params': params or {}, 'headers': headers or {}}, sort_keys=True, default=str)
+    return hashlib.sha1(canonical.encode('utf-8')).hexdigest()
+
+
+class EspnHttp(object):
+    """
+    Stands in for the requests module inside espn_api to count ESPN requests, record the responses to a
+    fixture directory or replay them from it with no network.
+
+    Every request espn_api makes (building a League, box scores, power rankings, transactions, player info)
+    goes through ``get``, which gives up after ``timeout`` seconds unless the caller asks for another timeout.
+    Anything else is passed through to the requests module.
+
+    Parameters
+    ----------
+    directory : str
+        The fixture directory. One JSON file is kept per distinct request.
+    mode : str
+        'live' to only count requests, 'record' to fetch from ESPN and save every response, 'replay' to answer
+        only from the fixtures.
+    simulate_latency : bool
+        When replaying, sleep for as long as the recorded request took, so timings stay comparable.
+
+    Attributes
+    ----------
+    requests : int
+        Number of requests answered.
+    bytes : int
+        Total size of the response bodies.
+    elapsed : float
+        Seconds ESPN took to answer them, as measured when they were recorded.
+    """
+
+    def __init__(self, directory, mode='replay', simulate_latency=False):
+        if mode not in MODES:
+            raise ValueError("ESPN http mode must be one of %s, not %r" % (', '.join(MODES), mode))
+        self.directory = directory
+        self.mode = mode
+        self.simulate_latency = simulate_latency
+        self.requests = 0
+        self.bytes = 0
+        self.elapsed = 0.0
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return "EspnHttp(%s, %s, %d requests)" % (self.mode, self.directory, self.requests)
+
+    def __getattr__(self, name):
+        return getattr(requests, name)
+
+    def get(self, url, params=None, headers=None, cookies=None, **kwargs):
+        if self.mode != 'live':
+            path = os.path.join(self.directory, fixture_key(url, params, headers) + '.json')
+        if self.mode == 'replay':
+            try:
+                with open(path) as f:
+                    fixture = json.load(f)
+            except FileNotFoundError:
+                raise ReplayMissing("No recorded ESPN response for %s %s" % (url, params or ''))
+            if self.simulate_latency:
+                time.sleep(fixture['elapsed'])
+        else:
+            # a request that never returns would hold its scheduler worker, and the league's session lock, forever
+            kwargs.setdefault('timeout', timeout)
+            start = time.perf_counter()
+            r = requests.get(url, params=params, headers=headers, cookies=cookies, **kwargs)
+            elapsed = time.perf_counter() - start
+            if self.mode == 'live':
+                self._count(len(r.content), elapsed)
+                return r
+            fixture = {'url': url, 'params': params, 'headers': headers, 'status': r.status_code,
+                       'elapsed': elapsed, 'body': r.text}
+            self._save(path, fixture)
+
+        self._count(len(fixture['body']), fixture['elapsed'])
+        return self._response(fixture)
+
+    def _count(self, size, elapsed):
+        counts = _tally.get()
+        with self._lock:
+            self.requests += 1
+            self.bytes += size
+            self.elapsed += elapsed
+            if counts is not None:
+                counts['requests'] += 1
+                counts['bytes'] += size
+
+    def _save(self, path, fixture):
+        os.makedirs(self.directory, exist_ok=True)
+        tmp = '%s.%d.tmp' % (path, threading.get_ident())
+        with open(tmp, 'w') as f:
+            json.dump(fixture, f)
+        os.replace(tmp, path)
+
+    @staticmethod
+    def _response(fixture):
+        response = requests.Response()
+        response.status_code = fixture['status']
+        response.url = fixture['url']
+        response.encoding = 'utf-8'
+        response._content = fixture['body'].encode('utf-8')
+        return response
+
+    def stats(self):
+        """
+        Returns
+        -------
+        dict
+            The request, byte and elapsed counters.
+        """
+
+        with self._lock:
+            return {'requests': self.requests, 'bytes': self.bytes, 'elapsed': self.elapsed}
+
+
+def install(directory, mode='replay', simulate_latency=False):
+    """
+    Routes every espn_api request through an EspnHttp for the rest of the process.
+
+    Parameters
+    ----------
+    directory : str
+        The fixture directory.
+    mode : str
+        'live', 'record' or 'replay'.
+    simulate_latency : bool
+        When replaying, sleep for as long as each recorded request took.
+
+    Returns
+    -------
+    EspnHttp
+        The installed recorder, which keeps the request counters.
+    """
+
+    http = EspnHttp(directory, mode, simulate_latency)
+    espn_requests.requests = http
+    if mode != 'live':
+        logger.info("ESPN requests %s %s" % ('recorded to' if mode == 'record' else 'replayed from', directory))
+    return http
+
+
+def uninstall():
+    espn_requests.requests = requests
+
+
+def installed():
+    """
+    Returns
+    -------
+    EspnHttp
+        The installed recorder, or None if espn_api is talking to ESPN directly.
+    """
+
+    http = espn_requests.requests
+    return http if isinstance(http, EspnHttp) else None
+
+
+def configure(mode, directory, seconds=30):
+    """
+    Installs the recorder the settings ask for, once per process.
+
+    Parameters
+    ----------
+    mode : str
+        'record', 'replay', or an empty string to talk to ESPN directly and only count the requests.
+    directory : str
+        The fixture directory.
+    seconds : float
+        The timeout of every ESPN request.
+
+    Returns
+    -------
+    EspnHttp
+        The installed recorder.
+    """
+
+    global timeout
+    timeout = seconds
+    mode = mode or 'live'
+    http = installed()
+    if http is None or http.mode != mode or http.directory != directory:
+        http = install(directory, mode)
+    return http
+
+
+@contextlib.contextmanager
+def tally():
+    """
+    Counts the ESPN requests made inside the block, including from the threads box scores are fetched on.
+
+    Yields
+    ------
+    dict
+        The 'requests' and 'bytes' counts, updated as requests are made.
+    """
+
+    counts = {'requests': 0, 'bytes': 0}
+    token = _tally.set(counts)
+    try:
+        yield counts
+    finally:
+        _tally.reset(token)
@@ -1,6 +1,11 @@
 from datetime import date, datetime
+import functools
 import gamedaybot.utils.util as util
 import gamedaybot.espn.env_vars as env_vars
+import gamedaybot.espn.box_score_cache as box_score_cache
+import gamedaybot.espn.all_play as all_play
+import gamedaybot.espn.player_cache as player_cache
+import gamedaybot.espn.waiver_watermark as waiver_watermark
 
 random_phrase = env_vars.get_random_phrase()
 
@@ -23,7 +28,7 @@ def get_scoreboard_short(league, week=None):
     """
 
     emotes = env_vars.split_emotes(league)
-    box_scores = league.box_scores(week=week)
+    box_scores = box_score_cache.get_box_scores(league, week=week)
     score = ['%s#c#%4s %6.2f - %6.2f %4s#c# %s' % (emotes[i.home_team.team_id], i.home_team.team_abbrev, i.home_score,
                                     i.away_score, i.away_team.team_abbrev, emotes[i.away_team.team_id]) for i in box_scores
              if i.away_team]
@@ -55,7 +60,7 @@ def get_projected_scoreboard(league, week=None):
         contains information about a single game, including the teams and their projected scores.
     """
 
-    box_scores = league.box_scores(week=week)
+    box_scores = box_score_cache.get_box_scores(league, week=week)
     score = ['%s#c#%4s %6.2f - %6.2f %4s#c# %s' % (emotes[i.home_team.team_id], i.home_team.team_abbrev, i.home_projected,
                                     i.away_projected, i.away_team.team_abbrev, emotes[i.away_team.team_id]) for i in box_scores
              if i.away_team]
@@ -170,13 +175,15 @@ def get_monitor(league, warning):
     """
 
     emotes = env_vars.split_emotes(league)
-    box_scores = league.box_scores()
+    box_scores = box_score_cache.get_box_scores(league)
     monitor = []
     text = ''
 
     for i in box_scores:
         monitor += scan_roster(i.home_lineup, i.home_team, warning, emotes)
         monitor += scan_roster(i.away_lineup, i.away_team, warning, emotes)
+        # rostered players' metadata is already here, so the waiver report does not have to look it up
+        player_cache.remember(league, i.home_lineup + i.away_lineup)
     
     if not monitor:
         return ('')
@@ -203,13 +210,14 @@ def get_inactives(league, week=None):
     
     users = env_vars.split_users(league)
     emotes = env_vars.split_emotes(league)
-    box_scores = league.box_scores(week=week)
+    box_scores = box_score_cache.get_box_scores(league, week=week)
     inactives = []
     text = ''
 
     for i in box_scores:
         inactives += scan_inactives(i.home_lineup, i.home_team, users, emotes)
         inactives += scan_inactives(i.away_lineup, i.away_team, users, emotes)
+        player_cache.remember(league, i.home_lineup + i.away_lineup)
 
     if not inactives:
         return ('')
@@ -354,7 +362,7 @@ def get_matchups(league, week=None):
     """
 
     emotes = env_vars.split_emotes(league)
-    matchups = league.box_scores(week=week)
+    matchups = box_score_cache.get_box_scores(league, week=week)
     scores = []
 
     for i in matchups:
@@ -388,7 +396,7 @@ def get_close_scores(league, week=None):
     """
 
     emotes = env_vars.split_emotes(league)
-    box_scores = league.box_scores(week=week)
+    box_scores = box_score_cache.get_box_scores(league, week=week)
     score = []
 
     for i in box_scores:
@@ -434,40 +442,120 @@ def get_waiver_report(league, faab=False, scoring_period=None, test_date=None):
     # Allow testing with a specific scoring period and date
     if scoring_period is None:
         scoring_period = league.scoringPeriodId
-    transactions = league.transactions(scoring_period, types={'WAIVER'})
+    today = test_date if test_date else date.today().strftime('%Y-%m-%d')
+
+    # Only include transactions matching the test date and type WAIVER
+    new = [txn for txn in executed_waivers(league, [scoring_period])
+           if date.fromtimestamp(txn.date / 1000).strftime('%Y-%m-%d') == today]
+    return render_waiver_report(league, new, faab, today)
+
+
+def get_waiver_report_since(league, mark, faab=False, scoring_period=None):
+    """
+    Generate a waiver report of every transaction executed since a watermark, from any scoring period since.
+
+    Nothing is saved: the caller stores the returned watermark once the report has been delivered, so
+    transactions in a report that never reached the chat are reported again next time.
+
+    Parameters
+    ----------
+    league : object
+        The league object for which the report is being generated.
+    mark : dict or None
+        The league's waiver watermark, see waiver_watermark.load_watermark. Without one, today's transactions are reported.
+    faab : bool, optional
+        If True, include FAAB amount spent and sort report by FAAB descending. Defaults to False.
+    scoring_period : int, optional
+        The latest scoring period to query transactions for. Defaults to league.scoringPeriodId.
+
+    Returns
+    -------
+    tuple
+        The report text, and the watermark moved past every transaction it covers.
+    """
+
+    if scoring_period is None:
+        scoring_period = league.scoringPeriodId
+    today = date.today().strftime('%Y-%m-%d')
+
+    # every period since the last report is fetched so days the bot was down are not lost
+    periods = [scoring_period] if mark is None else range(min(mark['scoring_period'], scoring_period), scoring_period + 1)
+    executed = executed_waivers(league, periods)
+    if mark is None:
+        new = [txn for txn in executed if date.fromtimestamp(txn.date / 1000).strftime('%Y-%m-%d') == today]
+    else:
+        new = [txn for txn in executed if waiver_watermark.is_new(txn, mark)]
+    return render_waiver_report(league, new, faab, today), waiver_watermark.advance(mark, executed, scoring_period)
+
+
+def executed_waivers(league, periods):
+    """
+    Returns
+    -------
+    list
+        The executed waiver transactions of the given scoring periods, each once.
+    """
+
+    transactions = {}
+    for period in periods:
+        for txn in league.transactions(period, types={'WAIVER'}):
+            transactions.setdefault(getattr(txn, 'id', None) or id(txn), txn)
+    return [txn for txn in transactions.values() if txn.date and txn.status == 'EXECUTED']
+
+
+def render_waiver_report(league, transactions, faab, today):
+    """
+    Formats waiver transactions into the waiver report.
+
+    Parameters
+    ----------
+    league : object
+        The league the transactions belong to.
+    transactions : list
+        The executed waiver transactions to report.
+    faab : bool
+        If True, include FAAB amount spent and sort report by FAAB descending.
+    today : str
+        The date (YYYY-MM-DD) shown in the report title.
+
+    Returns
+    -------
+    str
+        The waiver report, or an empty string if there are no transactions.
+    """
+
     report = []
     emotes = env_vars.split_emotes(league)
     report_items = []  # For sorting if faab
-    today = test_date if test_date else date.today().strftime('%Y-%m-%d')
     text = ''
 
+    # every player in the batch is looked up at once instead of with a request per player
+    players = player_cache.get_players(league, [item.playerId for txn in transactions for item in txn.items])
+
+    def pos_str(item):
+        player = players.get(item.playerId)
+        if player is None or player.position == 'D/ST':
+            return ''
+        return f'- {player.proTeam} {player.position}'
+
     for txn in transactions:
-        # Only include transactions matching the test date and type WAIVER
-        txn_date = None
-        if txn.date:
-            txn_date = date.fromtimestamp(txn.date / 1000).strftime('%Y-%m-%d')
-        if txn_date == today and txn.status == 'EXECUTED':
-            team_name = f'{emotes[txn.team.team_id]}#b#{txn.team.team_name}#b#'
-            faab_amount = txn.bid_amount if hasattr(txn, 'bid_amount') else 0
-            add_str = ''
-            drop_str = ''
-            for item in txn.items:
-                if item.type == 'ADD':
-                    position = league.player_info(item.player).position
-                    pos_str = f'- {league.player_info(item.player).proTeam} {position}' if position != 'D/ST' else ''
-                    if faab:
-                        add_str += f"#p# ADDED {item.player} {pos_str} (${faab_amount}) \n"
-                    else:
-                        add_str += f"#p# ADDED {item.player} {pos_str} \n"
-                elif item.type == 'DROP':
-                    position = league.player_info(item.player).position
-                    pos_str = f'- {league.player_info(item.player).proTeam} {position}' if position != 'D/ST' else ''
-                    drop_str += f"\u0009#p# DROPPED {item.player} {pos_str} \n"
-            s = f"{team_name} \n{add_str}{drop_str}"
-            if faab:
-                report_items.append((faab_amount, s.lstrip()))
-            else:
-                report_items.append((datetime.fromtimestamp(txn.date / 1000), s.lstrip()))
+        team_name = f'{emotes[txn.team.team_id]}#b#{txn.team.team_name}#b#'
+        faab_amount = txn.bid_amount if hasattr(txn, 'bid_amount') else 0
+        add_str = ''
+        drop_str = ''
+        for item in txn.items:
+            if item.type == 'ADD':
+                if faab:
+                    add_str += f"#p# ADDED {item.player} {pos_str(item)} (${faab_amount}) \n"
+                else:
+                    add_str += f"#p# ADDED {item.player} {pos_str(item)} \n"
+            elif item.type == 'DROP':
+                drop_str += f"\u0009#p# DROPPED {item.player} {pos_str(item)} \n"
+        s = f"{team_name} \n{add_str}{drop_str}"
+        if faab:
+            report_items.append((faab_amount, s.lstrip()))
+        else:
+            report_items.append((datetime.fromtimestamp(txn.date / 1000), s.lstrip()))
 
     if faab:
         # Sort by faab_amount descending
@@ -578,51 +666,29 @@ def combined_power_rankings(league, week=None):
 
 def sim_record(league, week=None):
     """
-    This function takes in a league object and an optional week parameter. It then iterates through each result each week and determines what the records of each team would be had they faced every other team through each week of the season.
+    This function takes in a league object and an optional week parameter. It determines what the records of each team would be had they faced every other team through each week of the season.
+    Completed weeks are kept in the league's all-play ledger, so only weeks not seen before are computed.
 
     Parameters:
     league (object): A league object containing information about the league and its teams.
-    week (int, optional): The week for which the box scores should be retrieved. If no week is specified, the current week will be used.
+    week (int, optional): The last week to include. If no week is specified, the previous week will be used.
 
     Returns:
-    list: A list containing the head-to-head records for the week.
+    dict: A dictionary with teams as keys and a list containing the team's simulated record as values.
     """
 
     if not week:
         week = league.current_week - 1
 
+    totals = all_play.get_ledger(league).records(league, week)
     records = {}
-    weekly_records = {}
 
     for t in league.teams:
-        records[t] = ''
-        weekly_records[t] = [0,0,0]
-
-    for i in range(week):
-        weekNumber = i+1
-        box_scores = league.box_scores(weekNumber)
-        weekly_scores = {}
-        for i in box_scores: 
-            if i.home_team != 0 and i.away_team != 0:
-                weekly_scores[i.home_team] = [i.home_score]
-                weekly_scores[i.away_team] = [i.away_score]
-
-        for i in weekly_scores:
-            for j in weekly_scores:
-                if i != j:
-                    if weekly_scores[i][0] > weekly_scores[j][0]:
-                        weekly_records[i][0] += 1
-                    elif weekly_scores[i][0] < weekly_scores[j][0]:
-                        weekly_records[i][1] += 1
-                    else: # Just in case of a tie
-                        weekly_records[i][2] += 1
-            
-    for r in weekly_records:
-        if weekly_records[r][2] > 0:
-            records[r] = ['%s-%s-%s' % (weekly_records[r][0], weekly_records[r][1], weekly_records[r][2])]
+        wins, losses, ties = totals.get(t.team_id, [0, 0, 0])
+        if ties > 0:
+            records[t] = ['%s-%s-%s' % (wins, losses, ties)]
         else:
-            records[r] = ['%s-%s' % (weekly_records[r][0], weekly_records[r][1])]
-   
+            records[t] = ['%s-%s' % (wins, losses)]
 
     return (records)
 
@@ -645,52 +711,158 @@ def get_starter_counts(league):
     return {pos: cnt for pos, cnt in league.settings.position_slot_counts.items() if pos not in ['BE', 'IR'] and cnt != 0}
 
 
-def best_flex(flexes, player_pool, num):
+# Player positions accepted by slots whose name is not a player position or a '/' separated list of them
+FLEX_SLOTS = {
+    'OP': ('QB', 'RB', 'WR', 'TE'),
+    'DP': ('DT', 'DE', 'LB', 'CB', 'S'),
+    'DL': ('DT', 'DE'),
+    'DB': ('CB', 'S'),
+}
+
+
+def slot_positions(slot):
     """
-    Given a list of flex positions, a dictionary of player pool, and a number of players to return,
-    this function returns the best flex players from the player pool.
+    Returns the player positions that may start in a lineup slot.
 
     Parameters
     ----------
-    flexes : list
-        a list of strings representing the flex positions
-    player_pool : dict
-        a dictionary with keys as position and values as a dictionary with player name as key and value as score
-    num : int
-        number of players to return from the player pool
+    slot : str
+        The slot, as named in the league's position slot counts (e.g. 'RB', 'RB/WR/TE', 'OP').
 
     Returns
+    -------
+    tuple
+        The eligible player positions.
+    """
+
+    if slot in FLEX_SLOTS:
+        return FLEX_SLOTS[slot]
+    if slot != 'D/ST' and '/' in slot:
+        return tuple(slot.split('/'))
+    return (slot,)
+
+
+@functools.lru_cache(maxsize=None)
+def lineup_plan(starter_slots):
+    """
+    Splits a lineup's slots into groups that share no eligible positions, so each group can be filled on its own.
+
+    Every slot gets a bitmask of the positions it accepts. Slots whose masks overlap, directly or through
+    another slot, end up in the same group. A group is nested when any two of its slots either share no
+    position or one accepts every position the other does, e.g. RB inside RB/WR/TE inside OP.
+
+    Parameters
     ----------
-    best : dict
-        a dictionary containing the best flex players from the player pool
-    player_pool : dict
-        the updated player pool after removing the best flex players
+    starter_slots : tuple
+        Sorted (slot, count) pairs of the starting lineup.
+
+    Returns
+    -------
+    list
+        One (slots, positions, nested) tuple per group. slots holds the mask of every slot in the group, repeated
+        by count, positions maps every eligible position to its bit and the most players of it the group can start,
+        and nested tells whether the group is nested. The slots of a nested group are ordered narrowest first.
     """
 
-    pool = {}
-    # iterate through each flex position
-    for flex_position in flexes:
-        # add players from flex position to the pool
-        try:
-            pool = pool | player_pool[flex_position]
-        except KeyError:
-            pass
-    # sort the pool by score in descending order
-    pool = {k: v for k, v in sorted(pool.items(), key=lambda item: item[1], reverse=True)}
-    # get the top num players from the pool
-    best = dict(list(pool.items())[:num])
-    # remove the best flex players from the player pool
-    for pos in player_pool:
-        for p in best:
-            if p in player_pool[pos]:
-                player_pool[pos].pop(p)
-    return best, player_pool
+    bits = {}
+    masks = {}
+    for slot, count in starter_slots:
+        mask = 0
+        for position in slot_positions(slot):
+            mask |= 1 << bits.setdefault(position, len(bits))
+        masks[slot] = mask
+
+    groups = []
+    for slot, count in starter_slots:
+        mask = masks[slot]
+        members = [slot]
+        for group in [group for group in groups if group[0] & mask]:
+            groups.remove(group)
+            mask |= group[0]
+            members += group[1]
+        groups.append((mask, members))
+
+    plan = []
+    counts = dict(starter_slots)
+    for mask, members in groups:
+        slots = [masks[slot] for slot in sorted(members) for _ in range(counts[slot])]
+        positions = {position: (1 << bit, sum(1 for slot_mask in slots if slot_mask & (1 << bit)))
+                     for position, bit in bits.items() if mask & (1 << bit)}
+        kinds = set(slots)
+        nested = all(a & b in (0, a, b) for a in kinds for b in kinds)
+        if nested:
+            slots.sort(key=lambda slot_mask: (bin(slot_mask).count('1'), slot_mask))
+        plan.append((slots, positions, nested))
+    return plan
+
+
+def _max_assignment(weights):
+    """
+    Solves the assignment problem for a rows x columns matrix of weights with the Hungarian algorithm, rows <= columns.
+
+    Returns
+    -------
+    list
+        The column assigned to each row, maximising the total weight.
+    """
+
+    rows, cols = len(weights), len(weights[0])
+    inf = float('inf')
+    u = [0.0] * (rows + 1)
+    v = [0.0] * (cols + 1)
+    match = [0] * (cols + 1)
+    way = [0] * (cols + 1)
+    for i in range(1, rows + 1):
+        match[0] = i
+        j0 = 0
+        minv = [inf] * (cols + 1)
+        used = [False] * (cols + 1)
+        while True:
+            used[j0] = True
+            i0 = match[j0]
+            row = weights[i0 - 1]
+            delta = inf
+            j1 = 0
+            for j in range(1, cols + 1):
+                if not used[j]:
+                    cur = -row[j - 1] - u[i0] - v[j]
+                    if cur < minv[j]:
+                        minv[j] = cur
+                        way[j] = j0
+                    if minv[j] < delta:
+                        delta = minv[j]
+                        j1 = j
+            for j in range(cols + 1):
+                if used[j]:
+                    u[match[j]] += delta
+                    v[j] -= delta
+                else:
+                    minv[j] -= delta
+            j0 = j1
+            if match[j0] == 0:
+                break
+        while j0:
+            j1 = way[j0]
+            match[j0] = match[j1]
+            j0 = j1
+
+    assignment = [0] * rows
+    for j in range(1, cols + 1):
+        if match[j]:
+            assignment[match[j] - 1] = j - 1
+    return assignment
 
 
 def optimal_lineup_score(lineup, starter_counts):
     """
     This function returns the optimal lineup score based on the provided lineup and starter counts.
 
+    The best lineup is found exactly. Slots are split into groups that share no eligible positions.
+    In a nested group (e.g. RB, RB/WR/TE and OP, or DL, DB and DP) each slot, narrowest first, takes the
+    top scorer left that it accepts. Only groups whose flex slots cross, like RB/WR next to WR/TE, are
+    solved as a maximum weight assignment of players to slots. As many slots as possible are filled,
+    so a slot is only left empty when no eligible player is left.
+
     Parameters
     ----------
     lineup : list
@@ -705,58 +877,43 @@ def optimal_lineup_score(lineup, starter_counts):
         and the percentage of the provided lineup's score compared to the optimal lineup's score.
     """
 
-    best_lineup = {}
-    position_players = {}
-
-    # get all players and points
+    position_points = {}
     score = 0
-    score_pct = 0
-    best_score = 0
-
     for player in lineup:
-        try:
-            position_players[player.position][player.name] = player.points
-        except KeyError:
-            position_players[player.position] = {}
-            position_players[player.position][player.name] = player.points
+        position_points.setdefault(player.position, []).append(player.points)
         if player.slot_position not in ['BE', 'IR']:
             score += player.points
 
-    # sort players by position for points
-    for position in starter_counts:
-        try:
-            position_players[position] = {k: v for k, v in sorted(
-                position_players[position].items(), key=lambda item: item[1], reverse=True)}
-            best_lineup[position] = dict(list(position_players[position].items())[:starter_counts[position]])
-            position_players[position] = dict(list(position_players[position].items())[starter_counts[position]:])
-        except KeyError:
-            best_lineup[position] = {}
-
-    # flexes. need to figure out best in other single positions first
-    for position in starter_counts:
-        # flex
-        if 'D/ST' not in position and '/' in position:
-            flex = position.split('/')
-            result = best_flex(flex, position_players, starter_counts[position])
-            best_lineup[position] = result[0]
-            position_players = result[1]
-
-    # Offensive Player. need to figure out best in other positions first
-    if 'OP' in starter_counts:
-        flex = ['RB', 'WR', 'TE', 'QB']
-        result = best_flex(flex, position_players, starter_counts['OP'])
-        best_lineup['OP'] = result[0]
-        position_players = result[1]
-
-    # Defensive Player. need to figure out best in other positions first
-    if 'DP' in starter_counts:
-        flex = ['DT', 'DE', 'LB', 'CB', 'S']
-        result = best_flex(flex, position_players, starter_counts['DP'])
-        best_lineup['DP'] = result[0]
-        position_players = result[1]
-
-    for position in best_lineup:
-        best_score += sum(best_lineup[position].values())
+    best_score = 0
+    for slots, positions, nested in lineup_plan(tuple(sorted(starter_counts.items()))):
+        # only a position's top scorers can ever start, so the rest are dropped before solving
+        ranked = {bit: sorted(position_points.get(position, []), reverse=True)[:cap]
+                  for position, (bit, cap) in positions.items()}
+
+        if nested:
+            # every broader slot accepts whatever a narrower one inside it does, so a narrow slot taking
+            # its best player never costs a later slot anything: filling narrowest first is optimal
+            taken = dict.fromkeys(ranked, 0)
+            for mask in slots:
+                best = None
+                for bit, points in ranked.items():
+                    if mask & bit and taken[bit] < len(points) and (
+                            best is None or points[taken[bit]] > ranked[best][taken[best]]):
+                        best = bit
+                if best is not None:
+                    best_score += ranked[best][taken[best]]
+                    taken[best] += 1
+            continue
+
+        candidates = [(bit, p) for bit, points in ranked.items() for p in points]
+
+        # filling a slot is worth more than any score, so every slot that can be filled is
+        fill = 1 + sum(abs(p) for bit, p in candidates)
+        # one empty choice per slot, so there are never fewer columns than rows
+        weights = [[fill + p if mask & bit else 0 for bit, p in candidates] + [0] * len(slots) for mask in slots]
+        for row, col in enumerate(_max_assignment(weights)):
+            if weights[row][col]:
+                best_score += candidates[col][1]
 
     score_pct = 0
     if best_score != 0:
@@ -789,7 +946,7 @@ def optimal_team_scores(league, week=None):
         else: 
             week = league.current_week - 1
             
-    box_scores = league.box_scores(week=week)
+    box_scores = box_score_cache.get_box_scores(league, week=week)
     results = []
     best_scores = {}
     starter_counts = get_starter_counts(league)
@@ -836,7 +993,7 @@ def get_achievers_trophy(league, low_team_id, high_team_id, week=None):
         A string representing the overachiever and underachiever of the league
     """
 
-    box_scores = league.box_scores(week=week)
+    box_scores = box_score_cache.get_box_scores(league, week=week)
     emotes = env_vars.split_emotes(league)
     achiever_str = []
     best_performance = -9999
@@ -870,7 +1027,7 @@ def get_achievers_trophy(league, low_team_id, high_team_id, week=None):
 
 
 def get_weekly_score_with_win_loss(league, week=None):
-    box_scores = league.box_scores(week=week)
+    box_scores = box_score_cache.get_box_scores(league, week=week)
     weekly_scores = {}
     for i in box_scores:
         if i.home_team != 0 and i.away_team != 0:
@@ -973,7 +1130,7 @@ def get_trophies(league, extra_trophies, week=None):
         week = league.current_week - 1
 
     emotes = env_vars.split_emotes(league)
-    matchups = league.box_scores(week=week)
+    matchups = box_score_cache.get_box_scores(league, week=week)
 
     low_score = 9999
     low_team = -1
@@ -1053,7 +1210,7 @@ def get_player_achievers(league, week=None, return_number=2):
     """
     if not week:
         week = league.current_week - 1
-    box_scores = league.box_scores(week=week)
+    box_scores = box_score_cache.get_box_scores(league, week=week)
     player_diffs = []
     for matchup in box_scores:
         for team, team_lineup in zip([matchup.home_team, matchup.away_team], [matchup.home_lineup, matchup.away_lineup]):
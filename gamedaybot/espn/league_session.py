@@ -0,0 +1,164 @@
+import copy
+import logging
+import threading
+import time
+
+from espn_api.football import League
+from espn_api.football.settings import Settings
+
+logger = logging.getLogger(__name__)
+
+# What each scheduled report reads from the League object beyond its box scores.
+# 'status' is the current scoring period, 'teams' is records, standings, schedules and rosters.
+# Box scores go through the box score cache and transactions are always fetched live.
+FUNCTION_NEEDS = {
+    'get_matchups': ('status', 'teams'),
+    'get_monitor': ('status',),
+    'get_inactives': ('status',),
+    'get_scoreboard_short': ('status',),
+    'get_projected_scoreboard': ('status',),
+    'get_close_scores': ('status',),
+    'get_power_rankings': ('status', 'teams'),
+    'get_trophies': ('status',),
+    'win_matrix': ('status',),
+    'season_trophies': ('status', 'teams'),
+    'get_standings': ('status', 'teams'),
+    'get_optimal_scores': ('status',),
+    'get_final': ('status',),
+    'get_waiver_report': ('status',),
+    'get_live_updates': ('status',),
+    'broadcast': (),
+    'init': (),
+}
+
+
+class LeagueSession(object):
+    """
+    A process-wide espn_api League that is built once and refreshed piece by piece as jobs need it.
+
+    A refresh never changes a League a job may still be reading: it fills in a shallow copy and swaps it
+    in, so every job sees one consistent League from start to end.
+
+    Parameters
+    ----------
+    league_id : str
+        The ESPN league id.
+    year : int
+        The league year.
+    espn_s2 : str, optional
+        The espn_s2 cookie for private leagues.
+    swid : str, optional
+        The SWID cookie for private leagues.
+    league_max_age : int
+        Seconds before settings, teams, rosters and the player names are considered stale.
+    status_max_age : int
+        Seconds before the current scoring period is considered stale.
+
+    Methods
+    -------
+    get_league(function)
+        Returns the League, refreshing only what the given report needs.
+    """
+
+    def __init__(self, league_id, year, espn_s2=None, swid=None, league_max_age=3600, status_max_age=300):
+        self.league_id = league_id
+        self.year = year
+        self.espn_s2 = espn_s2
+        self.swid = swid
+        self.league_max_age = league_max_age
+        self.status_max_age = status_max_age
+        self._league = None
+        self._teams_at = 0
+        self._status_at = 0
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return "LeagueSession(%s, %s)" % (self.league_id, self.year)
+
+    def _build(self):
+        if self.swid in (None, '{1}') or self.espn_s2 in (None, '1'):
+            league = League(league_id=self.league_id, year=self.year)
+        else:
+            league = League(league_id=self.league_id, year=self.year, espn_s2=self.espn_s2, swid=self.swid)
+        self._teams_at = self._status_at = time.monotonic()
+        logger.info("Built league session for %s" % self.league_id)
+        return league
+
+    def _refresh_teams(self, league):
+        # League.refresh() rebuilds settings with the base class and drops position_slot_counts,
+        # so refetch with the football Settings. The draft is left alone.
+        data = super(League, league)._fetch_league(SettingsClass=Settings)
+        league.nfl_week = data['status']['latestScoringPeriod']
+        # _fetch_players fills the map in place, so the copy gets its own
+        league.player_map = {}
+        league._fetch_players()
+        league._fetch_teams(data)
+        self._teams_at = self._status_at = time.monotonic()
+        logger.info("Refreshed league teams and players for %s" % self.league_id)
+
+    def _refresh_status(self, league):
+        """
+        Fetches only the league status and updates the scoring period fields of the League.
+
+        Returns
+        -------
+        bool
+            True if the scoring period moved since the last refresh.
+        """
+
+        data = league.espn_request.league_get(params={'view': 'mStatus'})
+        previous = league.scoringPeriodId
+
+        league.currentMatchupPeriod = data['status']['currentMatchupPeriod']
+        league.scoringPeriodId = data['scoringPeriodId']
+        league.finalScoringPeriod = data['status']['finalScoringPeriod']
+        league.nfl_week = data['status'].get('latestScoringPeriod', league.nfl_week)
+        league.current_week = min(league.scoringPeriodId, league.finalScoringPeriod)
+        self._status_at = time.monotonic()
+
+        return league.scoringPeriodId != previous
+
+    def get_league(self, function=None):
+        """
+        Returns the shared League, refreshing only the parts the report needs once they are stale.
+
+        Parameters
+        ----------
+        function : str, optional
+            The report about to run. Unknown reports get a full refresh when stale.
+
+        Returns
+        -------
+        espn_api.football.League
+            The shared league object.
+        """
+
+        needs = FUNCTION_NEEDS.get(function, ('status', 'teams'))
+        with self._lock:
+            if self._league is None:
+                self._league = self._build()
+                return self._league
+
+            now = time.monotonic()
+            teams_stale = 'teams' in needs and now - self._teams_at > self.league_max_age
+            status_stale = 'status' in needs and now - self._status_at > self.status_max_age
+            if teams_stale or status_stale:
+                # _fetch_teams empties league.teams before filling it again, so refresh a copy
+                # and swap it in once it is complete, leaving running jobs their League
+                league = copy.copy(self._league)
+                if teams_stale:
+                    self._refresh_teams(league)
+                # a new scoring period changes records and schedules too
+                elif self._refresh_status(league):
+                    self._refresh_teams(league)
+                self._league = league
+
+            return self._league
+
+    def invalidate(self):
+        """
+        Forces the next job to build the League from scratch.
+        """
+
+        with self._lock:
+            self._league = None
@@ -0,0 +1,293 @@
+from datetime import datetime
+import logging
+import threading
+import time
+
+import gamedaybot.espn.env_vars as env_vars
+import gamedaybot.espn.box_score_cache as box_score_cache
+import gamedaybot.espn.functionality as espn
+
+logger = logging.getLogger(__name__)
+
+# Seconds to wait after the last game of a week before looking for the next week's games
+IDLE_DELAY = 6 * 3600
+
+
+def snapshot(box_scores):
+    """
+    Reduces box scores to what the live updates compare between polls.
+
+    Parameters
+    ----------
+    box_scores : list
+        The current week's BoxScore objects.
+
+    Returns
+    -------
+    dict
+        (home team id, away team id) as keys and a dictionary of the matchup's scores, live projections,
+        teams and whether it is final as values. Byes are left out.
+    """
+
+    matchups = {}
+    for box in box_scores:
+        if not box.away_team:
+            continue
+        matchups[(box.home_team.team_id, box.away_team.team_id)] = {
+            'home': box.home_team,
+            'away': box.away_team,
+            'home_score': box.home_score,
+            'away_score': box.away_score,
+            'home_projected': espn.get_projected_total(box.home_lineup),
+            'away_projected': espn.get_projected_total(box.away_lineup),
+            'final': espn.all_played(box.home_lineup) and espn.all_played(box.away_lineup),
+        }
+    return matchups
+
+
+def until_next_game(box_scores, now=None):
+    """
+    Checks when the scores can next change, from the kickoff times of the starters' NFL games.
+
+    Parameters
+    ----------
+    box_scores : list
+        The current week's BoxScore objects.
+    now : datetime, optional
+        The local time to check against. Defaults to now.
+
+    Returns
+    -------
+    float or None
+        0 while a starter's game is in progress, or if no kickoff times are known; the seconds until the next
+        starter's game kicks off; or None once every starter's game is over.
+    """
+
+    now = now or datetime.now()
+    known = False
+    kickoffs = []
+    for box in box_scores:
+        for player in box.home_lineup + box.away_lineup:
+            kickoff = getattr(player, 'game_date', None)
+            if kickoff is None or player.slot_position in ('BE', 'IR'):
+                continue
+            known = True
+            if player.game_played < 100:
+                if kickoff <= now:
+                    return 0
+                kickoffs.append(kickoff)
+    if not known:
+        return 0
+    if not kickoffs:
+        return None
+    return (min(kickoffs) - now).total_seconds()
+
+
+def _sign(value):
+    return (value > 0) - (value < 0)
+
+
+def diff(previous, current):
+    """
+    Finds the changes between two snapshots worth posting: lead changes, games going final, and projected
+    winners flipping. Score changes that do not change who is ahead are not events.
+
+    Parameters
+    ----------
+    previous : dict
+        The last snapshot.
+    current : dict
+        The new snapshot.
+
+    Returns
+    -------
+    list
+        (kind, matchup) tuples, kind being 'final', 'lead' or 'projection', in matchup order.
+    """
+
+    events = []
+    for key, now in current.items():
+        before = previous.get(key)
+        if before is None:
+            continue
+        if now['final']:
+            if not before['final']:
+                events.append(('final', now))
+            continue
+        lead = _sign(now['home_score'] - now['away_score'])
+        if lead and lead != _sign(before['home_score'] - before['away_score']):
+            events.append(('lead', now))
+        projected = _sign(now['home_projected'] - now['away_projected'])
+        if projected and projected != _sign(before['home_projected'] - before['away_projected']):
+            events.append(('projection', now))
+    return events
+
+
+def render(events, emotes):
+    """
+    Returns
+    -------
+    str
+        The live update message for the events, or an empty string if there are none.
+    """
+
+    if not events:
+        return ''
+
+    text = ['#q##u##b#Live Update#b##u#']
+    for kind, m in events:
+        home, away = m['home'], m['away']
+        leader, trailer = (home, away) if m['home_score'] >= m['away_score'] else (away, home)
+        score = '#c#%4s %6.2f - %6.2f %4s#c#' % (home.team_abbrev, m['home_score'], m['away_score'], away.team_abbrev)
+        if kind == 'final':
+            text += ['🏁 %sFinal: %s %s' % (emotes[leader.team_id], score, emotes[trailer.team_id])]
+        elif kind == 'lead':
+            text += ['🔀 %s%s takes the lead: %s' % (emotes[leader.team_id], leader.team_abbrev, score)]
+        else:
+            favorite = home if m['home_projected'] > m['away_projected'] else away
+            text += ['📈 %s%s now projected to win, %.2f - %.2f' %
+                     (emotes[favorite.team_id], favorite.team_abbrev, m['home_projected'], m['away_projected'])]
+    return '\n'.join(text)
+
+
+class LiveScores(object):
+    """
+    The live score state of one league between polls.
+
+    Polls start at ``interval`` seconds apart and back off, doubling up to ``max_interval``, for as long
+    as nothing worth posting happens. Any event brings them back to ``interval``. While no game is in
+    progress, polls wait for the next kickoff instead (see wait).
+
+    Attributes
+    ----------
+    week : int
+        The week of the last snapshot.
+    snapshot : dict
+        The last snapshot, see snapshot().
+    delay : float
+        Seconds until the next poll is due after the last one.
+    """
+
+    def __init__(self):
+        self.week = None
+        self.snapshot = None
+        self.delay = 0
+        self._next_poll = 0
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return "LiveScores(week %s, next poll in %.0fs)" % (self.week, max(0, self._next_poll - time.monotonic()))
+
+    def due(self):
+        return time.monotonic() >= self._next_poll
+
+    def update(self, week, current, interval=120, max_interval=900):
+        """
+        Replaces the snapshot and returns what changed since the last one.
+
+        Parameters
+        ----------
+        week : int
+            The week the snapshot is of. A new week starts over without events.
+        current : dict
+            The new snapshot.
+        interval : float
+            Seconds between polls while things are happening.
+        max_interval : float
+            The longest the polls back off to.
+
+        Returns
+        -------
+        list
+            The events, see diff().
+        """
+
+        with self._lock:
+            events = diff(self.snapshot, current) if self.snapshot is not None and week == self.week else []
+            self.week = week
+            self.snapshot = current
+            if events or not self.delay:
+                self.delay = interval
+            else:
+                self.delay = min(self.delay * 2, max(interval, max_interval))
+            self._next_poll = time.monotonic() + self.delay
+            return events
+
+    def wait(self, seconds):
+        """
+        Holds off the next poll for at least the given seconds, e.g. until the next kickoff.
+        Polling then starts again at the short interval.
+        """
+
+        with self._lock:
+            self.delay = 0
+            self._next_poll = max(self._next_poll, time.monotonic() + seconds)
+
+
+_trackers = {}
+_trackers_lock = threading.Lock()
+
+
+def get_tracker(league_id, year):
+    """
+    Returns
+    -------
+    LiveScores
+        The process-wide live score state of a league, created if needed.
+    """
+
+    key = (str(league_id), year)
+    with _trackers_lock:
+        try:
+            return _trackers[key]
+        except KeyError:
+            _trackers[key] = LiveScores()
+            return _trackers[key]
+
+
+def get_live_updates(league, interval=120, max_interval=900):
+    """
+    Polls the current week's scores and reports only what changed since the last poll.
+
+    Parameters
+    ----------
+    league : espn_api.football.League
+        The league to poll.
+    interval : float
+        Seconds between polls while things are happening.
+    max_interval : float
+        The longest the polls back off to when nothing changes.
+
+    Returns
+    -------
+    str
+        The lead changes, games gone final and projected winner flips since the last poll, or an empty string.
+    """
+
+    tracker = get_tracker(league.league_id, league.year)
+    box_scores = box_score_cache.fetch_fresh(league)
+    events = tracker.update(league.current_week, snapshot(box_scores), interval, max_interval)
+    # between games nothing can change, so sleep until the next kickoff or, once the week is over, for a while
+    wait = until_next_game(box_scores)
+    if wait is None:
+        tracker.wait(IDLE_DELAY)
+    elif wait > 0:
+        tracker.wait(wait)
+    logger.debug("Live scores for %s: %d events, next poll in %.0fs" % (league.league_id, len(events), tracker.delay))
+    return render(events, env_vars.split_emotes(league))
+
+
+def run_live(run, league_session):
+    """
+    The live score job: polls through ``run`` when the league's next poll is due, and does nothing otherwise.
+
+    Parameters
+    ----------
+    run : callable
+        Called as run(functions, league_session), like every scheduled job.
+    league_session : LeagueSession
+        The league's long-lived session.
+    """
+
+    if get_tracker(league_session.league_id, league_session.year).due():
+        run(['get_live_updates'], league_session)
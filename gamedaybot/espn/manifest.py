@@ -0,0 +1,88 @@
+import json
+import logging
+
+import gamedaybot.espn.env_vars as env_vars
+from gamedaybot.espn.espn_bot import espn_bot_group
+
+logger = logging.getLogger(__name__)
+
+
+def load_manifest(path):
+    """
+    Reads a league manifest for multi-league mode.
+
+    The manifest is a JSON list with one object per league. Keys are the environment variables the bot
+    normally reads (LEAGUE_ID, DISCORD_WEBHOOK_URL, SWID, ESPN_S2, EMOTES, USERS, ...) and apply to that
+    league only. Anything not set for a league falls back to the process environment.
+    EMOTES and USERS may be given as lists.
+
+    Parameters
+    ----------
+    path : str
+        The path of the manifest file.
+
+    Returns
+    -------
+    list
+        One dictionary of environment overrides per league, with string values.
+
+    Raises
+    ------
+    ValueError
+        If the manifest is not a list of objects, a league has no LEAGUE_ID or DISCORD_WEBHOOK_URL,
+        or a LEAGUE_ID appears twice.
+    """
+
+    with open(path) as f:
+        entries = json.load(f)
+
+    if not isinstance(entries, list):
+        raise ValueError("League manifest must be a list of leagues")
+
+    leagues = []
+    seen = set()
+    for i, entry in enumerate(entries):
+        if not isinstance(entry, dict):
+            raise ValueError("League manifest entry %d is not an object" % i)
+
+        overrides = {}
+        for key, value in entry.items():
+            if isinstance(value, list):
+                value = ','.join(str(v) for v in value)
+            elif isinstance(value, bool):
+                value = str(value).lower()
+            overrides[key] = str(value)
+
+        for key in ('LEAGUE_ID', 'DISCORD_WEBHOOK_URL'):
+            if not overrides.get(key):
+                raise ValueError("League manifest entry %d has no %s" % (i, key))
+        if overrides['LEAGUE_ID'] in seen:
+            raise ValueError("League %s appears twice in the league manifest" % overrides['LEAGUE_ID'])
+        seen.add(overrides['LEAGUE_ID'])
+
+        leagues.append(overrides)
+
+    return leagues
+
+
+def run_league_group(overrides, functions, session=None):
+    """
+    Runs a job group for one league of the manifest, with that league's settings in effect.
+
+    Errors are logged and contained so one league cannot affect the others sharing the scheduler.
+
+    Parameters
+    ----------
+    overrides : dict
+        The league's manifest entry.
+    functions : list
+        The reports to run, in order.
+    session : LeagueSession, optional
+        The league's long-lived session.
+    """
+
+    with env_vars.league_environ(overrides):
+        try:
+            espn_bot_group(functions, session)
+        except Exception:
+            logger.exception("League %s: %s failed" % (overrides['LEAGUE_ID'], ', '.join(functions)))
@@ -0,0 +1,140 @@
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# How many seconds player metadata (position, pro team) is trusted before it is looked up again
+ttl = 6 * 3600
+
+# The most players looked up in one request, the same as espn_api's own PLAYER_CARD_BATCH
+BATCH_SIZE = 40
+
+
+def configure(seconds):
+    global ttl
+    ttl = seconds
+
+
+class PlayerCache(object):
+    """
+    Player metadata of one league keyed by player id, looked up in bulk and kept for a time to live.
+
+    Entries are whatever player objects ESPN or the box scores returned; reports read their ``name``,
+    ``position`` and ``proTeam``.
+
+    Attributes
+    ----------
+    hits : int
+        Players answered from the cache.
+    misses : int
+        Players that had to be looked up.
+    requests : int
+        Bulk lookups made to ESPN, each of at most BATCH_SIZE players.
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.requests = 0
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return "PlayerCache(%d players, %d hits, %d misses)" % (len(self._entries), self.hits, self.misses)
+
+    def remember(self, players):
+        """
+        Adds players the caller already has, e.g. from box score lineups, so they are not looked up again.
+
+        Parameters
+        ----------
+        players : iterable
+            Player objects with a ``playerId``.
+        """
+
+        now = time.monotonic()
+        with self._lock:
+            for player in players:
+                self._entries[player.playerId] = (now, player)
+
+    def get_many(self, league, player_ids):
+        """
+        Returns the players with the given ids, looking up the ones that are missing or expired in bulk,
+        BATCH_SIZE players per request.
+
+        Parameters
+        ----------
+        league : espn_api.football.League
+            The league the players are looked up through.
+        player_ids : iterable
+            The ESPN player ids.
+
+        Returns
+        -------
+        dict
+            Player ids as keys and player objects as values. Players ESPN does not know are left out.
+        """
+
+        player_ids = set(player_ids)
+        now = time.monotonic()
+        found = {}
+        with self._lock:
+            for player_id in player_ids:
+                entry = self._entries.get(player_id)
+                if entry is not None and now - entry[0] < ttl:
+                    found[player_id] = entry[1]
+            missing = sorted(player_ids - set(found))
+            self.hits += len(found)
+            self.misses += len(missing)
+            batches = [missing[i:i + BATCH_SIZE] for i in range(0, len(missing), BATCH_SIZE)]
+            self.requests += len(batches)
+
+        for batch in batches:
+            players = league.player_info(playerId=batch)
+            # espn_api returns a single Player for one id and None for no match
+            if players is None:
+                players = []
+            elif not isinstance(players, list):
+                players = [players]
+            self.remember(players)
+            found.update((player.playerId, player) for player in players if player.playerId in player_ids)
+        if missing:
+            logger.debug("Looked up %d players in %d requests" % (len(missing), len(batches)))
+
+        return found
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_cache(league):
+    """
+    Returns the process-wide player cache for a league, creating it if needed.
+    """
+
+    key = (str(league.league_id), league.year)
+    with _caches_lock:
+        try:
+            return _caches[key]
+        except KeyError:
+            _caches[key] = PlayerCache()
+            return _caches[key]
+
+
+def get_players(league, player_ids):
+    """
+    Drop-in replacement for ``league.player_info(playerId=player_ids)`` that reads through the league's cache.
+
+    Returns
+    -------
+    dict
+        Player ids as keys and player objects as values.
+    """
+
+    return get_cache(league).get_many(league, player_ids)
+
+
+def remember(league, players):
+    get_cache(league).remember(players)
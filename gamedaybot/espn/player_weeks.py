@@ -0,0 +1,164 @@
+# numpy is imported where it is used, so reports that never build a store do not pay for importing it
+
+# One row per player per lineup per week
+FIELDS = [
+    ('week', 'i2'),
+    ('team_id', 'i4'),
+    ('player_id', 'i8'),
+    ('position', 'i1'),
+    ('starter', '?'),
+    ('points', 'f8'),
+    ('projected', 'f8'),
+]
+
+BENCH_SLOTS = ('BE', 'IR')
+
+
+class PlayerWeeks(object):
+    """
+    A columnar store of player-week facts for season-long queries, built once from several weeks of box scores
+    and queried with vectorized reductions.
+
+    Positions are stored as small integer codes. Player names are kept once per player next to the array.
+
+    Attributes
+    ----------
+    data : numpy.ndarray
+        A structured array with the fields of FIELDS, in box score order (home lineup, then away, by week).
+    positions : list
+        The position name of every position code.
+    names : dict
+        Player ids to player names.
+
+    Methods
+    -------
+    from_box_scores(box_scores)
+        Builds the store from box scores by week.
+    starters()
+        Returns a mask of the rows that started.
+    ratio_order(mask, best=True)
+        Returns row indexes ordered by points over projection.
+    """
+
+    def __init__(self):
+        import numpy as np
+        self.data = np.zeros(0, dtype=FIELDS)
+        self.positions = []
+        self.names = {}
+
+    def __repr__(self):
+        return "PlayerWeeks(%d rows)" % len(self.data)
+
+    def __len__(self):
+        return len(self.data)
+
+    @classmethod
+    def from_box_scores(cls, box_scores):
+        """
+        Builds the store from box scores.
+
+        Parameters
+        ----------
+        box_scores : dict
+            Weeks as keys and that week's list of BoxScore objects as values.
+
+        Returns
+        -------
+        PlayerWeeks
+            The store. Teams on a bye (no team object) are left out.
+        """
+
+        import numpy as np
+        store = cls()
+        position_codes = {}
+        names = store.names
+        rows = []
+        for week in sorted(box_scores):
+            for matchup in box_scores[week]:
+                for team, lineup in ((matchup.home_team, matchup.home_lineup), (matchup.away_team, matchup.away_lineup)):
+                    if not team:
+                        continue
+                    team_id = team.team_id
+                    for p in lineup:
+                        projected = getattr(p, 'projected_points', None)
+                        names[p.playerId] = p.name
+                        rows.append((week, team_id, p.playerId,
+                                     position_codes.setdefault(p.position, len(position_codes)),
+                                     p.slot_position not in BENCH_SLOTS,
+                                     p.points, np.nan if projected is None else projected))
+
+        store.data = np.array(rows, dtype=FIELDS)
+        store.positions = list(position_codes)
+        return store
+
+    def position_code(self, position):
+        try:
+            return self.positions.index(position)
+        except ValueError:
+            return -1
+
+    def is_position(self, *positions):
+        """
+        Returns
+        -------
+        numpy.ndarray
+            A mask of the rows whose player plays one of the positions.
+        """
+
+        import numpy as np
+        return np.isin(self.data['position'], [self.position_code(position) for position in positions])
+
+    def starters(self):
+        """
+        Returns
+        -------
+        numpy.ndarray
+            A mask of the rows whose player was in the starting lineup (not on the bench or IR).
+        """
+
+        return self.data['starter']
+
+    def ratios(self):
+        """
+        Returns
+        -------
+        tuple
+            (points - projected) / projected and points - projected for every row. The ratio is NaN
+            where there is no positive projection.
+        """
+
+        import numpy as np
+        points = self.data['points']
+        projected = self.data['projected']
+        diff = points - projected
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ratio = np.where(projected > 0, diff / projected, np.nan)
+        return ratio, diff
+
+    def ratio_order(self, mask=None, best=True):
+        """
+        Orders rows by how far the player beat (or missed) their projection.
+
+        Parameters
+        ----------
+        mask : numpy.ndarray, optional
+            The rows to consider. Rows without a positive projection are always left out.
+        best : bool
+            True for the largest ratio first, False for the smallest first. Equal ratios are ordered by the
+            points difference the same way, then by row order.
+
+        Returns
+        -------
+        numpy.ndarray
+            Row indexes.
+        """
+
+        import numpy as np
+        ratio, diff = self.ratios()
+        keep = ~np.isnan(ratio)
+        if mask is not None:
+            keep &= mask
+        rows = np.flatnonzero(keep)
+        sign = -1 if best else 1
+        # lexsort sorts by the last key first and is stable, so earlier rows win remaining ties
+        return rows[np.lexsort((sign * diff[rows], sign * ratio[rows]))]
@@ -1,14 +1,24 @@
+import functools
 import logging
+import os
 from datetime import datetime
+from apscheduler.executors.pool import ThreadPoolExecutor
 from apscheduler.schedulers.blocking import BlockingScheduler
+import gamedaybot.espn.box_score_cache as box_score_cache
+import gamedaybot.espn.env_vars as env_vars
+import gamedaybot.espn.live as live
 from gamedaybot.espn.env_vars import get_env_vars
-from gamedaybot.espn.espn_bot import espn_bot
+from gamedaybot.espn.espn_bot import espn_bot_group
+import gamedaybot.espn.manifest as manifest
+from gamedaybot.espn.league_session import LeagueSession
 
 
 def scheduler():
     """
     This function is used to schedule jobs to send messages.
 
+    If LEAGUE_MANIFEST is set, every league in the manifest is scheduled on one shared scheduler instead.
+
     Parameters
     ----------
     None
@@ -17,14 +27,104 @@ def scheduler():
     -------
     None
     """
+    try:
+        manifest_path = os.environ["LEAGUE_MANIFEST"]
+    except KeyError:
+        manifest_path = None
+
+    if manifest_path:
+        return multi_league_scheduler(manifest_path)
+
     data = get_env_vars()
-    game_timezone = 'America/New_York'
+    box_score_cache.configure_fetching(*env_vars.get_fetch_limits())
     sched = BlockingScheduler(job_defaults={'misfire_grace_time': 15 * 60})
+    ready_text = "Ready!"
+
+    # one League for the life of the process; each job refreshes only what it needs
+    league_session = LeagueSession(data['league_id'], data['year'], espn_s2=data['espn_s2'], swid=data['swid'],
+                                   league_max_age=data['league_max_age'], status_max_age=data['status_max_age'])
+    add_league_jobs(sched, data, espn_bot_group, league_session)
+
+    try:
+        if data['swid'] and data['espn_s2']:
+            ready_text += " SWID and ESPN_S2 provided."
+    except KeyError:
+        ready_text += " SWID and ESPN_S2 not provided."
+
+    print(ready_text)
+    logging.info(ready_text)
+    sched.start()
+
+
+def multi_league_scheduler(manifest_path):
+    """
+    Schedules every league of a manifest on one scheduler backed by a bounded worker pool.
+
+    Each league gets its own League session and its own jobs, which run with the league's manifest entry
+    layered over the process environment. A failing league only logs its own errors, and
+    a slow league holds at most one worker per job.
+
+    Parameters
+    ----------
+    manifest_path : str
+        The path of the league manifest, see manifest.load_manifest.
+
+    Returns
+    -------
+    None
+    """
+
+    leagues = manifest.load_manifest(manifest_path)
+
+    try:
+        workers = int(os.environ["LEAGUE_WORKERS"])
+    except KeyError:
+        workers = 8
+
+    # the limit on ESPN requests is shared by every league, so it comes from the process environment
+    box_score_cache.configure_fetching(*env_vars.get_fetch_limits())
+    sched = BlockingScheduler(executors={'default': ThreadPoolExecutor(max_workers=workers)},
+                              job_defaults={'misfire_grace_time': 15 * 60, 'coalesce': True, 'max_instances': 1})
+
+    for overrides in leagues:
+        with env_vars.league_environ(overrides):
+            data = get_env_vars()
+        league_session = LeagueSession(data['league_id'], data['year'], espn_s2=data['espn_s2'], swid=data['swid'],
+                                       league_max_age=data['league_max_age'], status_max_age=data['status_max_age'])
+        run = functools.partial(manifest.run_league_group, overrides)
+        add_league_jobs(sched, data, run, league_session, prefix=data['league_id'] + '_')
+        # the init messages go through the worker pool as soon as the scheduler starts
+        sched.add_job(run, args=[['init'], league_session], id=data['league_id'] + '_init')
+
+    ready_text = "Ready! Scheduled %d leagues on %d workers." % (len(leagues), workers)
+    print(ready_text)
+    logging.info(ready_text)
+    sched.start()
+
+
+def add_league_jobs(sched, data, run, league_session, prefix=''):
+    """
+    Adds the report jobs of one league to a scheduler.
+
+    Parameters
+    ----------
+    sched : apscheduler.schedulers.base.BaseScheduler
+        The scheduler to add the jobs to.
+    data : dict
+        The league's settings from get_env_vars.
+    run : callable
+        Called as run(functions, league_session) by every job.
+    league_session : LeagueSession
+        The league's long-lived session.
+    prefix : str
+        Prepended to every job id so several leagues can share a scheduler.
+    """
+
+    game_timezone = 'America/New_York'
     ff_start_date = data['ff_start_date']
     ff_end_date = data['ff_end_date']
     end_date = datetime.strptime(ff_end_date, "%Y-%m-%d").date()
     my_timezone = data['my_timezone']
-    ready_text = "Ready!"
 
     #game day score update:              sunday at 4pm, 8pm east coast time.
     #final scores and trophies:          tuesday morning at 7:30am local time.
@@ -36,75 +136,60 @@ def scheduler():
     #close scores (within 15.99 points): sunday and monday evening at 6:30pm east coast time.
     #waiver report:                      wed-sun morning at 7:30am local time.
     #season end trophies:                on the End Date provided at 7:30am local time.
+    #live updates (if LIVE_SCORES):       every day from 9am to 2am east coast time, checked every minute,
+    #                                    polled only while a starter's game is in progress.
 
-    sched.add_job(espn_bot, 'cron', ['get_scoreboard_short'], id='scoreboard2',
+    sched.add_job(run, 'cron', [['get_scoreboard_short'], league_session], id=prefix + 'scoreboard2',
         day_of_week='sun', hour='16,20', start_date=ff_start_date, end_date=ff_end_date,
         timezone=game_timezone, replace_existing=True)
     
-    sched.add_job(espn_bot, 'cron', ['get_final'], id='final',
+    sched.add_job(run, 'cron', [['get_final'], league_session], id=prefix + 'final',
         day_of_week='tue', hour=7, minute=30, start_date=ff_start_date, end_date=ff_end_date,
         timezone=my_timezone, replace_existing=True)
 
-    sched.add_job(espn_bot, 'cron', ['get_standings'], id='standings',
-        day_of_week='tue', hour=18, minute=30, start_date=ff_start_date, end_date=ff_end_date,
-        timezone=my_timezone, replace_existing=True)
-
-    sched.add_job(espn_bot, 'cron', ['get_optimal_scores'], id='optimal_scores',
-        day_of_week='tue', hour=18, minute=30, second=5, start_date=ff_start_date, end_date=ff_end_date,
+    # job groups run their reports against one League and box score snapshot and post them in this order
+    sched.add_job(run, 'cron', [['get_standings', 'get_optimal_scores', 'get_power_rankings'], league_session],
+        id=prefix + 'standings_group', day_of_week='tue', hour=18, minute=30, start_date=ff_start_date, end_date=ff_end_date,
         timezone=my_timezone, replace_existing=True)
 
-    sched.add_job(espn_bot, 'cron', ['get_power_rankings'], id='power_rankings',
-        day_of_week='tue', hour=18, minute=30, second=10, start_date=ff_start_date, end_date=ff_end_date,
-        timezone=my_timezone, replace_existing=True)
-
-    sched.add_job(espn_bot, 'cron', ['get_matchups'], id='matchups',
-        day_of_week='thu', hour=18, minute=30, start_date=ff_start_date, end_date=ff_end_date,
-        timezone=game_timezone, replace_existing=True)
-
-    sched.add_job(espn_bot, 'cron', ['get_projected_scoreboard'], id='proj_scoreboard',
-        day_of_week='thu', hour=18, minute=30, second=3, start_date=ff_start_date, end_date=ff_end_date,
+    sched.add_job(run, 'cron', [['get_matchups', 'get_projected_scoreboard'], league_session],
+        id=prefix + 'matchups_group', day_of_week='thu', hour=18, minute=30, start_date=ff_start_date, end_date=ff_end_date,
         timezone=game_timezone, replace_existing=True)
 
-    sched.add_job(espn_bot, 'cron', ['get_monitor'], id='_monitor',
+    sched.add_job(run, 'cron', [['get_monitor'], league_session], id=prefix + '_monitor',
         day_of_week='fri', hour=18, minute=30, start_date=ff_start_date, end_date=ff_end_date,
         timezone=my_timezone, replace_existing=True)
 
-    sched.add_job(espn_bot, 'cron', ['get_inactives'], id='inactives',
+    sched.add_job(run, 'cron', [['get_inactives'], league_session], id=prefix + 'inactives',
         day_of_week='sun', hour=12, minute=5, start_date=ff_start_date, end_date=ff_end_date,
         timezone=game_timezone, replace_existing=True)
 
-    sched.add_job(espn_bot, 'cron', ['get_scoreboard_short'], id='scoreboard1',
+    sched.add_job(run, 'cron', [['get_scoreboard_short'], league_session], id=prefix + 'scoreboard1',
         day_of_week='fri,mon', hour=7, minute=30, start_date=ff_start_date, end_date=ff_end_date,
         timezone=my_timezone, replace_existing=True)
 
-    sched.add_job(espn_bot, 'cron', ['get_close_scores'], id='close_scores',
+    sched.add_job(run, 'cron', [['get_close_scores'], league_session], id=prefix + 'close_scores',
         day_of_week='sun,mon', hour=18, minute=30, start_date=ff_start_date, end_date=ff_end_date,
         timezone=game_timezone, replace_existing=True)
     
-    sched.add_job(espn_bot, 'cron', ['get_waiver_report'], id='waiver_report',
+    sched.add_job(run, 'cron', [['get_waiver_report'], league_session], id=prefix + 'waiver_report',
             day_of_week='wed', hour=7, minute=31, start_date=ff_start_date, end_date=ff_end_date,
             timezone=my_timezone, replace_existing=True)  
 
     if data['daily_waiver']:
-        sched.add_job(espn_bot, 'cron', ['get_waiver_report'], id='daily_waiver',
+        sched.add_job(run, 'cron', [['get_waiver_report'], league_session], id=prefix + 'daily_waiver',
             day_of_week='mon,tue,thu,fri,sat,sun', hour=7, minute=31, start_date=ff_start_date, end_date=ff_end_date,
             timezone=my_timezone, replace_existing=True)        
         
+    if data['live_scores']:
+        # checked every minute whenever a game could be on (Saturdays, holidays, international and late games
+        # included); the league's poller sleeps between kickoffs, so a check outside a game costs nothing
+        poll = functools.partial(live.run_live, run)
+        sched.add_job(poll, 'cron', [league_session], id=prefix + 'live',
+            hour='0-1,9-23', minute='*', start_date=ff_start_date, end_date=ff_end_date,
+            timezone=game_timezone, replace_existing=True, coalesce=True, max_instances=1)
+
     # jobs for final day    
-    sched.add_job(espn_bot, 'date', ['win_matrix'], id='win_matrix',
+    sched.add_job(run, 'date', [['win_matrix', 'season_trophies'], league_session], id=prefix + 'season_end_group',
         run_date=datetime(end_date.year, end_date.month, end_date.day, 7, 30), 
         timezone=my_timezone, replace_existing=True)
-
-    sched.add_job(espn_bot, 'date', ['season_trophies'], id='season_trophies',
-        run_date=datetime(end_date.year, end_date.month, end_date.day, 7, 31), 
-        timezone=my_timezone, replace_existing=True)
-
-    try:
-        if data['swid'] and data['espn_s2']:
-            ready_text += " SWID and ESPN_S2 provided."
-    except KeyError:
-        ready_text += " SWID and ESPN_S2 not provided."
-
-    print(ready_text)
-    logging.info(ready_text)
-    sched.start()
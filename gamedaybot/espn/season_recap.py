@@ -1,18 +1,367 @@
+import json
+import logging
 import os
 # For local use
 import sys
 sys.path.insert(1, os.path.abspath('.'))
 import gamedaybot.espn.functionality as espn
 import gamedaybot.espn.env_vars as env_vars
+import gamedaybot.espn.box_score_cache as box_score_cache
+import gamedaybot.espn.all_play as all_play
+from gamedaybot.espn.player_weeks import PlayerWeeks
 
-def season_trophies(league, extra_trophies):
+logger = logging.getLogger(__name__)
+
+class SeasonAwards(object):
+    """
+    Running state for the end of season awards, fed one week of box scores at a time.
+
+    Each week's box scores are scanned once and folded into per-team accumulators for benching and efficiency.
+    The players of all the weeks added at once are loaded into one columnar PlayerWeeks store, whose ratios are
+    computed in one vectorized pass; the best and worst performances are then folded in row order into single
+    running bests, with the same precedence as a scan of the box scores.
+    Rendering reads only this state plus the season totals already on the league's teams.
+
+    Methods
+    -------
+    add_weeks(box_scores, starter_counts)
+        Folds several weeks of box scores into the awards.
+    catch_up(league, weeks, final_only=True)
+        Folds every given week that is not yet in the awards.
+    to_dict()
+        Returns the state as a JSON serializable dictionary.
+    render(league, emotes)
+        Returns the End of Season Awards text.
+    """
+
+    def __init__(self):
+        self.weeks = []
+        self.mvp = {'score_diff': -100, 'proj_diff': -100, 'score': '', 'player': '', 'team_id': -1, 'week': 0}
+        self.lvp = {'score_diff': 999, 'proj_diff': 999, 'score': '', 'player': '', 'team_id': -1, 'week': 0}
+        # points left on the bench, and [95-99%, 99-100%, 100%] weeks of optimal score, by team id
+        self.bench = {}
+        self.efficiency = {}
+
+    def __repr__(self):
+        return "SeasonAwards(%d weeks)" % len(self.weeks)
+
+    def to_dict(self):
+        return {'weeks': self.weeks, 'mvp': self.mvp, 'lvp': self.lvp,
+                'bench': self.bench, 'efficiency': self.efficiency}
+
+    @classmethod
+    def from_dict(cls, data):
+        awards = cls()
+        awards.weeks = list(data['weeks'])
+        awards.mvp = dict(data['mvp'])
+        awards.lvp = dict(data['lvp'])
+        # JSON object keys are strings
+        awards.bench = {int(team_id): value for team_id, value in data['bench'].items()}
+        awards.efficiency = {int(team_id): list(value) for team_id, value in data['efficiency'].items()}
+        return awards
+
+    def catch_up(self, league, weeks, final_only=True):
+        """
+        Folds every given week that has not been added yet, in week order.
+
+        Parameters
+        ----------
+        league : object
+            The league the awards belong to.
+        weeks : iterable
+            The weeks that should be in the awards.
+        final_only : bool
+            Skip weeks whose box scores can still change, so they are not checkpointed.
+
+        Returns
+        -------
+        list
+            The weeks that were added.
+        """
+
+        missing = [week for week in sorted(weeks) if week not in self.weeks and
+                   (not final_only or box_score_cache.is_final(league, week))]
+        if missing:
+            starter_counts = espn.get_starter_counts(league)
+            box_scores = box_score_cache.get_weeks(league, missing)
+            self.add_weeks({week: box_scores[box_score_cache.resolve_week(league, week)] for week in missing},
+                           starter_counts)
+        return missing
+
+    def add_weeks(self, box_scores, starter_counts):
+        """
+        Folds several weeks of box scores into the awards, in week order.
+
+        Parameters
+        ----------
+        box_scores : dict
+            Weeks as keys and that week's box scores as values.
+        starter_counts : dict
+            The number of starters for each position, from espn.get_starter_counts.
+        """
+
+        weeks = sorted(box_scores)
+        for week in weeks:
+            for i in box_scores[week]:
+                for team, lineup in ((i.home_team, i.home_lineup), (i.away_team, i.away_lineup)):
+                    if team:
+                        self._add_lineup(team.team_id, lineup, starter_counts)
+
+        players = PlayerWeeks.from_box_scores(box_scores)
+        if len(players):
+            ratio, diff = players.ratios()
+            eligible = players.starters() & ~players.is_position('D/ST') & (players.data['projected'] > 0)
+            kicker = players.position_code('K')
+            # a player who beats the best performance so far can not also be the worst, so the rows are
+            # walked in week and box score order and each one is checked against the titles as they stand
+            rows = eligible.nonzero()[0]
+            for row, score_diff, proj_diff, projected, position in zip(
+                    rows.tolist(), ratio[rows].tolist(), diff[rows].tolist(),
+                    players.data['projected'][rows].tolist(), players.data['position'][rows].tolist()):
+                if (score_diff > self.mvp['score_diff']) or (score_diff == self.mvp['score_diff'] and proj_diff > self.mvp['proj_diff']):
+                    if projected > 0.1:
+                        self.mvp = self._performance(players, row, score_diff, proj_diff)
+                elif (score_diff < self.lvp['score_diff']) or (score_diff == self.lvp['score_diff'] and proj_diff < self.lvp['proj_diff']):
+                    if position != kicker:
+                        self.lvp = self._performance(players, row, score_diff, proj_diff)
+
+        self.weeks += weeks
+
+    def _add_lineup(self, team_id, lineup, starter_counts):
+        best_score = espn.optimal_lineup_score(lineup, starter_counts)
+        self.bench[team_id] = self.bench.get(team_id, 0) + best_score[2]
+        efficiency = self.efficiency.setdefault(team_id, [0, 0, 0])
+        score_pct = round(best_score[3], 6)
+        if 95.00 <= score_pct < 99.00:
+            efficiency[0] += 1
+        elif 99.00 <= score_pct < 100.00:
+            efficiency[1] += 1
+        elif score_pct == 100.00:
+            efficiency[2] += 1
+
+    @staticmethod
+    def _performance(players, row, score_diff, proj_diff):
+        fact = players.data[row]
+        player_id = int(fact['player_id'])
+        return {'score_diff': float(score_diff), 'proj_diff': float(proj_diff),
+                'score': '%.2f points (%.2f proj, %.2f diff ratio)' % (fact['points'], fact['projected'], score_diff),
+                'player': players.positions[fact['position']] + ' ' + players.names[player_id],
+                'team_id': int(fact['team_id']), 'week': int(fact['week'])}
+
+    def render(self, league, emotes):
+        """
+        Returns the End of Season Awards text.
+
+        Parameters
+        ----------
+        league : object
+            The league the awards belong to. Moves and season MVP/LVP are read from its teams.
+        emotes : list
+            A list of the server's team emotes
+
+        Returns
+        -------
+        str
+            A string representing the trophies
+        """
+
+        teams = {team.team_id: team for team in league.teams}
+
+        most_moves = 0
+        moves_score = ''
+        moves_team = -1
+
+        high_score = 0
+        score_team = -1
+        score_week = 0
+
+        smvp_score_diff = -100
+        smvp_proj = -100
+        smvp_score = ''
+        smvp = ''
+        smvp_team = -1
+
+        slvp_score_diff = 999
+        slvp_proj = 999
+        slvp_score = ''
+        slvp = ''
+        slvp_team = -1
+
+        best_score_diff = None
+        best_score_team = -1
+
+        most_high_pcts = 0
+        most_high_team = -1
+        high_pct_points = 0
+        high_pct_str = ''
+
+        for team in league.teams:
+            moves = (team.acquisitions * 0.5) + (team.drops * 0.5) + team.trades
+            if moves > most_moves:
+                most_moves = moves
+                moves_score = str(team.acquisitions) + ' adds'
+                if team.trades > 0:
+                    moves_score += ' and ' + str(team.trades) + ' trades'
+                moves_team = team
+
+            for week, score in enumerate(team.scores, 1):
+                if score > high_score:
+                    high_score = score
+                    score_team = team
+                    score_week = week
+
+            for p in team.roster:
+                if p.projected_total_points > 0 and p.position != 'D/ST':
+                    score_diff = (p.total_points - p.projected_total_points)/p.projected_total_points
+                    proj_diff = p.total_points - p.projected_total_points
+                    if (score_diff > smvp_score_diff) or (score_diff == smvp_score_diff and proj_diff > smvp_proj):
+                        smvp_score_diff = score_diff
+                        smvp_proj = proj_diff
+                        smvp_score = '%.2f points (%.2f proj, %.2f diff ratio)' % (p.total_points, p.projected_total_points, score_diff)
+                        smvp = p.position + ' ' + p.name
+                        smvp_team = team
+                    elif (score_diff < slvp_score_diff) or (score_diff == slvp_score_diff and proj_diff < slvp_proj):
+                        slvp_score_diff = score_diff
+                        slvp_proj = proj_diff
+                        slvp_score = '%.2f points (%.2f proj, %.2f diff ratio)' % (p.total_points, p.projected_total_points, score_diff)
+                        slvp = p.position + ' ' + p.name
+                        slvp_team = team
+
+            if team.team_id in self.bench and (best_score_diff is None or self.bench[team.team_id] < best_score_diff):
+                best_score_diff = self.bench[team.team_id]
+                best_score_team = team
+
+            pcts = self.efficiency.get(team.team_id, [0, 0, 0])
+            high_pcts = pcts[0] + pcts[1] + pcts[2]
+            if high_pcts >= most_high_pcts:
+                pct_points = (pcts[0] * 1) + (pcts[1] * 2) + (pcts[2] * 3)
+                if (high_pcts > most_high_pcts) or (high_pcts == most_high_pcts and pct_points > high_pct_points):
+                    most_high_pcts = high_pcts
+                    high_pct_points = pct_points
+                    most_high_team = team
+                    high_pct_str = ('%d weeks' % high_pcts)
+                    if pcts[2] > 0:
+                        high_pct_str += (' (%d 100%% weeks)' % pcts[2])
+
+        mvp_team = teams[self.mvp['team_id']]
+        lvp_team = teams[self.lvp['team_id']]
+
+        moves_str = ['🔀 #c#Most Moves:#c# %s \n- #b#%s#b# with %s' % (emotes[moves_team.team_id], moves_team.team_name, moves_score)]
+        score_str = ['👑 #c#Highest Score:#c# %s \n- #b#%s#b# with %.2f points on Week %d' % (emotes[score_team.team_id], score_team.team_name, high_score, score_week)]
+        bsd_str = ['🪑 #c#Best Benching:#c# %s \n- #b#%s#b# only left %.2f possible points on the bench' % (emotes[best_score_team.team_id], best_score_team.team_name, best_score_diff)]
+        hpt_str = ['🎯 #c#Most Efficient:#c# %s \n- #b#%s#b# scored >95%% of their best possible score on %s' % (emotes[most_high_team.team_id], most_high_team.team_name, high_pct_str)]
+        mvp_str = ['🌟 #c#Best Performance:#c# %s \n- %s, Week %d, #b#%s#b# with %s' % (emotes[mvp_team.team_id], self.mvp['player'], self.mvp['week'], mvp_team.team_abbrev, self.mvp['score'])]
+        lvp_str = ['💩 #c#Worst Performance:#c# %s \n- %s, Week %d, #b#%s#b# with %s' % (emotes[lvp_team.team_id], self.lvp['player'], self.lvp['week'], lvp_team.team_abbrev, self.lvp['score'])]
+        smvp_str = ['👍 #c#Season MVP:#c# %s \n- %s, #b#%s#b# with %s' % (emotes[smvp_team.team_id], smvp, smvp_team.team_abbrev, smvp_score)]
+        slvp_str = ['👎 #c#Season LVP:#c# %s \n- %s, #b#%s#b# with %s' % (emotes[slvp_team.team_id], slvp, slvp_team.team_abbrev, slvp_score)]
+
+        text = ['#u##b#End of Season Awards#b##u# '] + moves_str + score_str + bsd_str + hpt_str + mvp_str + lvp_str + smvp_str + slvp_str + ['']
+
+        return '\n'.join(text)
+
+
+def load_season_awards(path, league):
+    """
+    Loads a season awards checkpoint.
+
+    Parameters
+    ----------
+    path : str
+        The path of the checkpoint file.
+    league : object
+        The league the awards are for. A checkpoint saved for another league or season is not used.
+
+    Returns
+    -------
+    SeasonAwards
+        The saved awards, or empty awards if there is no usable checkpoint.
+    """
+
+    try:
+        with open(path) as f:
+            data = json.load(f)
+        if (data['league_id'], data['year']) != (str(league.league_id), league.year):
+            logger.warning("Discarding season awards checkpoint %s: it is for league %s, %s" %
+                           (path, data['league_id'], data['year']))
+            return SeasonAwards()
+        return SeasonAwards.from_dict(data)
+    except FileNotFoundError:
+        return SeasonAwards()
+    except (ValueError, KeyError, TypeError) as e:
+        logger.warning("Discarding season awards checkpoint %s: %s" % (path, e))
+        return SeasonAwards()
+
+
+def save_season_awards(awards, path, league):
+    """
+    Saves a season awards checkpoint. The file is replaced atomically so a crash never leaves half a checkpoint.
+
+    Parameters
+    ----------
+    awards : SeasonAwards
+        The awards to save.
+    path : str
+        The path of the checkpoint file. Parent directories are created if needed.
+    league : object
+        The league the awards are for, recorded so the checkpoint is never used for another.
+    """
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    data = awards.to_dict()
+    data['league_id'] = str(league.league_id)
+    data['year'] = league.year
+    tmp = path + '.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(data, f)
+    os.replace(tmp, path)
+
+
+def season_weeks(league):
+    return range(1, len(league.teams[0].scores) + 1)
+
+
+def update_season_awards(league, path):
+    """
+    Folds every completed week missing from the season awards checkpoint into it.
+
+    Run from the weekly final scores job, so by the end of the season the awards only need rendering.
+
+    Parameters
+    ----------
+    league : object
+        The league the awards belong to.
+    path : str
+        The path of the checkpoint file.
+
+    Returns
+    -------
+    SeasonAwards
+        The updated awards.
+    """
+
+    awards = load_season_awards(path, league)
+    added = awards.catch_up(league, season_weeks(league))
+    if added:
+        save_season_awards(awards, path, league)
+        logger.info("Added weeks %s to season awards checkpoint" % added)
+    return awards
+
+
+def season_trophies(league, extra_trophies, checkpoint=None):
     """
     Returns end of season trophies for the most moves, highest score, optimal benching, efficiency, best/worst performance, and season MVP/LVP.
 
+    Every week's box scores are read once and folded into a SeasonAwards accumulator, which is then rendered.
+    With a checkpoint only the weeks it is missing are read.
+
     Parameters
     ----------
     league : object
         The league object for which the trophies are to be returned
+    checkpoint : str, optional
+        The path of the season awards checkpoint kept up to date by the weekly final scores job
 
     Returns
     -------
@@ -23,179 +372,15 @@ def season_trophies(league, extra_trophies):
         return ''
 
     emotes = env_vars.split_emotes(league)
-    mvp_score_diff = -100
-    mvp_proj = -100
-    mvp_score = ''
-    mvp = ''
-    mvp_team = -1
-    mvp_week = 0
-
-    smvp_score_diff = -100
-    smvp_proj = -100
-    smvp_score = ''
-    smvp = ''
-    smvp_team = -1
-
-    lvp_score_diff = 999
-    lvp_proj = 999
-    lvp_score = ''
-    lvp = ''
-    lvp_team = -1
-    lvp_week = 0
-
-    slvp_score_diff = 999
-    slvp_proj = 999
-    slvp_score = ''
-    slvp = ''
-    slvp_team = -1
-
-    most_moves = 0
-    moves_score = ''
-    moves_team = -1
-
-    high_score = 0
-    score_team = -1
-    score_week = 0
-
-    for team in league.teams:
-        moves = (team.acquisitions * 0.5) + (team.drops * 0.5) + team.trades
-        if moves > most_moves:
-            most_moves = moves
-            moves_score = str(team.acquisitions) + ' adds' 
-            if team.trades > 0: 
-                moves_score += ' and ' + str(team.trades) + ' trades'
-            moves_team = team
-
-        for score in team.scores:
-            if score > high_score:
-                high_score = score
-                score_team = team
-                score_week = team.scores.index(score) + 1
-
-        for p in team.roster:
-            if p.projected_total_points > 0 and p.position != 'D/ST':
-                score_diff = (p.total_points - p.projected_total_points)/p.projected_total_points
-                proj_diff = p.total_points - p.projected_total_points
-                if (score_diff > smvp_score_diff) or (score_diff == smvp_score_diff and proj_diff > smvp_proj):
-                    smvp_score_diff = score_diff
-                    smvp_proj = proj_diff
-                    smvp_score = '%.2f points (%.2f proj, %.2f diff ratio)' % (p.total_points, p.projected_total_points, score_diff)
-                    smvp = p.position + ' ' + p.name
-                    smvp_team = team
-                elif (score_diff < slvp_score_diff) or (score_diff == slvp_score_diff and proj_diff < slvp_proj):
-                    slvp_score_diff = score_diff
-                    slvp_proj = proj_diff
-                    slvp_score = '%.2f points (%.2f proj, %.2f diff ratio)' % (p.total_points, p.projected_total_points, score_diff)
-                    slvp = p.position + ' ' + p.name
-                    slvp_team = team
-
-    z = 1
-    score_diff_totals = {}
-    high_score_pcts = {}
-    for team in league.teams:
-        score_diff_totals[team] = 0
-        high_score_pcts[team] = [0,0,0]
-
-    starter_counts = espn.get_starter_counts(league)
-        
-    while z <= len(league.teams[0].scores):
-        matchups = league.box_scores(week=z)
-        for i in matchups:
-            best_score_home = espn.optimal_lineup_score(i.home_lineup, starter_counts)
-            score_diff_totals[i.home_team] += best_score_home[2]
-            score_pct = round(best_score_home[3],6)
-            if 95.00 <= score_pct < 99.00:
-                high_score_pcts[i.home_team][0] +=1
-            elif 99.00 <= score_pct < 100.00:
-                high_score_pcts[i.home_team][1] += 1
-            elif score_pct == 100.00:
-                high_score_pcts[i.home_team][2] += 1
-
-            if (i.away_team != 0):
-                best_score_away = espn.optimal_lineup_score(i.away_lineup, starter_counts)
-                score_diff_totals[i.away_team] += best_score_away[2]
-                score_pct = round(best_score_away[3],6)
-                if 95.00 <= score_pct < 99.00:
-                    high_score_pcts[i.away_team][0] += 1
-                elif 99.00 <= score_pct < 100.00:
-                    high_score_pcts[i.away_team][1] += 1
-                elif score_pct == 100.00:
-                    high_score_pcts[i.away_team][2] += 1
-            
-            for p in i.home_lineup:
-                if p.slot_position != 'BE' and p.slot_position != 'IR' and p.position != 'D/ST' and p.projected_points > 0:
-                    score_diff = (p.points - p.projected_points)/p.projected_points
-                    proj_diff = p.points - p.projected_points
-                    if (score_diff > mvp_score_diff) or (score_diff == mvp_score_diff and proj_diff > mvp_proj):
-                        if p.projected_points > 0.1:
-                            mvp_score_diff = score_diff
-                            mvp_proj = proj_diff
-                            mvp_score = '%.2f points (%.2f proj, %.2f diff ratio)' % (p.points, p.projected_points, score_diff)
-                            mvp = p.position + ' ' + p.name
-                            mvp_team = i.home_team
-                            mvp_week = z
-                    elif (score_diff < lvp_score_diff) or (score_diff == lvp_score_diff and proj_diff < lvp_proj):
-                        if p.position != 'K':
-                            lvp_score_diff = score_diff
-                            lvp_proj = proj_diff
-                            lvp_score = '%.2f points (%.2f proj, %.2f diff ratio)' % (p.points, p.projected_points, score_diff)
-                            lvp = p.position + ' ' + p.name
-                            lvp_team = i.home_team
-                            lvp_week = z
-
-            for p in i.away_lineup:
-                if p.slot_position != 'BE' and p.slot_position != 'IR' and p.position != 'D/ST' and p.projected_points > 0:
-                    score_diff = (p.points - p.projected_points)/p.projected_points
-                    proj_diff = p.points - p.projected_points
-                    if (score_diff > mvp_score_diff) or (score_diff == mvp_score_diff and proj_diff > mvp_proj):
-                        if p.projected_points > 0.1:
-                            mvp_score_diff = score_diff
-                            mvp_proj = proj_diff
-                            mvp_score = '%.2f points (%.2f proj, %.2f diff ratio)' % (p.points, p.projected_points, score_diff)
-                            mvp = p.position + ' ' + p.name
-                            mvp_team = i.away_team
-                            mvp_week = z
-                    elif (score_diff < lvp_score_diff) or (score_diff == lvp_score_diff and proj_diff < lvp_proj):
-                        if p.position != 'K':
-                            lvp_score_diff = score_diff
-                            lvp_proj = proj_diff
-                            lvp_score = '%.2f points (%.2f proj, %.2f diff ratio)' % (p.points, p.projected_points, score_diff)
-                            lvp = p.position + ' ' + p.name
-                            lvp_team = i.away_team
-                            lvp_week = z
-        z = z+1
-
-    best_score_diff = [value for key, value in sorted(score_diff_totals.items(), key=lambda item: item[1])[:1:]][0]
-    best_score_team = [key for key, value in sorted(score_diff_totals.items(), key=lambda item: item[1])[:1:]][0]
-
-    most_high_pcts = 0
-    most_high_team = -1
-    high_pct_points = 0
-    high_pct_str = ''
-    for team in high_score_pcts:
-        high_pcts = high_score_pcts[team][0] + high_score_pcts[team][1] + high_score_pcts[team][2]
-        if high_pcts >= most_high_pcts:
-            pct_points = (high_score_pcts[team][0] * 1) + (high_score_pcts[team][1] * 2) + (high_score_pcts[team][2] * 3)
-            if (high_pcts > most_high_pcts) or (high_pcts == most_high_pcts and pct_points > high_pct_points):
-                most_high_pcts = high_pcts
-                high_pct_points = pct_points
-                most_high_team = team
-                high_pct_str = ('%d weeks' % high_pcts)
-                if high_score_pcts[team][2] > 0:
-                    high_pct_str += (' (%d 100%% weeks)' % high_score_pcts[team][2])
-
-    moves_str = ['🔀 #c#Most Moves:#c# %s \n- #b#%s#b# with %s' % (emotes[moves_team.team_id], moves_team.team_name, moves_score)]
-    score_str = ['👑 #c#Highest Score:#c# %s \n- #b#%s#b# with %.2f points on Week %d' % (emotes[score_team.team_id], score_team.team_name, high_score, score_week)]
-    bsd_str = ['🪑 #c#Best Benching:#c# %s \n- #b#%s#b# only left %.2f possible points on the bench' % (emotes[best_score_team.team_id], best_score_team.team_name, best_score_diff)]
-    hpt_str = ['🎯 #c#Most Efficient:#c# %s \n- #b#%s#b# scored >95%% of their best possible score on %s' % (emotes[most_high_team.team_id], most_high_team.team_name, high_pct_str)]
-    mvp_str = ['🌟 #c#Best Performance:#c# %s \n- %s, Week %d, #b#%s#b# with %s' % (emotes[mvp_team.team_id], mvp, mvp_week, mvp_team.team_abbrev, mvp_score)]
-    lvp_str = ['💩 #c#Worst Performance:#c# %s \n- %s, Week %d, #b#%s#b# with %s' % (emotes[lvp_team.team_id], lvp, lvp_week, lvp_team.team_abbrev, lvp_score)]
-    smvp_str = ['👍 #c#Season MVP:#c# %s \n- %s, #b#%s#b# with %s' % (emotes[smvp_team.team_id], smvp, smvp_team.team_abbrev, smvp_score)]
-    slvp_str = ['👎 #c#Season LVP:#c# %s \n- %s, #b#%s#b# with %s' % (emotes[slvp_team.team_id], slvp, slvp_team.team_abbrev, slvp_score)]
- 
-    text = ['#u##b#End of Season Awards#b##u# '] + moves_str + score_str + bsd_str + hpt_str + mvp_str + lvp_str + smvp_str + slvp_str + ['']
-
-    return '\n'.join(text)
+    if checkpoint:
+        awards = update_season_awards(league, checkpoint)
+    else:
+        awards = SeasonAwards()
+    # a week still in progress is included but never checkpointed
+    awards.catch_up(league, season_weeks(league), final_only=False)
+
+    return awards.render(league, emotes)
+
 
 def win_matrix(league):
     """
@@ -214,19 +399,17 @@ def win_matrix(league):
     """
 
     emotes = env_vars.split_emotes(league)
-    team_record = {team.team_abbrev: [0, 0, 0] for team in league.teams}
+    scores, won, order = all_play.score_matrix(league, list(range(1, league.current_week + 1)))
+    wins, losses = all_play.all_play_matrix(scores, won, order)
 
-    for week in range(1, league.current_week + 1):
-        scores = espn.get_weekly_score_with_win_loss(league=league, week=week)
-        losses = 0
+    team_record = {team.team_abbrev: [int(w), int(l), team.team_id]
+                   for team, w, l in zip(league.teams, wins.sum(axis=1), losses.sum(axis=1))}
 
-        for team in scores:
-            team_record[team.team_abbrev][0] += len(scores) - 1 - losses
-            team_record[team.team_abbrev][1] += losses
-            losses += 1
-            team_record[team.team_abbrev][2] = team.team_id
+    def win_pct(item):
+        games = item[1][0] + item[1][1]
+        return item[1][0] / games if games else 0
 
-    team_record = dict(sorted(team_record.items(), key=lambda item: item[1][0] / item[1][1], reverse=True))
+    team_record = dict(sorted(team_record.items(), key=win_pct, reverse=True))
 
     standings_txt = ["#u##b#Final Sim Records#b##u#"]
     pos = 1
@@ -0,0 +1,87 @@
+import json
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+
+def load_watermark(path):
+    """
+    Reads a league's waiver watermark.
+
+    Parameters
+    ----------
+    path : str
+        The path of the watermark file.
+
+    Returns
+    -------
+    dict or None
+        The watermark (see advance), or None if there is none yet or it cannot be read.
+    """
+
+    try:
+        with open(path) as f:
+            mark = json.load(f)
+        return {'date': int(mark['date']), 'ids': list(mark['ids']), 'scoring_period': int(mark['scoring_period'])}
+    except FileNotFoundError:
+        return None
+    except (ValueError, KeyError, TypeError, OSError) as e:
+        logger.warning("Ignoring unreadable waiver watermark %s: %s" % (path, e))
+        return None
+
+
+def save_watermark(mark, path):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp = path + '.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(mark, f)
+    os.replace(tmp, path)
+
+
+def is_new(txn, mark):
+    """
+    Returns
+    -------
+    bool
+        True if the executed transaction is past the watermark.
+    """
+
+    if mark is None:
+        return True
+    return txn.date > mark['date'] or (txn.date == mark['date'] and getattr(txn, 'id', None) not in mark['ids'])
+
+
+def advance(mark, transactions, scoring_period):
+    """
+    Moves a watermark past the given transactions.
+
+    Parameters
+    ----------
+    mark : dict or None
+        The current watermark: 'date', the latest processed transaction time in ms, 'ids', the ids of
+        the processed transactions at exactly that time, and 'scoring_period', where to start fetching next time.
+    transactions : list
+        The executed transactions just processed.
+    scoring_period : int
+        The scoring period fetched up to.
+
+    Returns
+    -------
+    dict
+        The new watermark.
+    """
+
+    # the loaded mark is left alone, and ids already on it are not added again when their transactions come back
+    mark = {'date': mark['date'], 'ids': list(mark['ids'])} if mark else {'date': 0, 'ids': []}
+    for txn in transactions:
+        if txn.date > mark['date']:
+            mark['date'] = txn.date
+            mark['ids'] = []
+        txn_id = getattr(txn, 'id', None)
+        if txn.date == mark['date'] and txn_id not in mark['ids']:
+            mark['ids'].append(txn_id)
+    mark['scoring_period'] = scoring_period
+    return mark
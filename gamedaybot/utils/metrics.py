@@ -0,0 +1,242 @@
+import logging
+import os
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Every metric created in the process, in the order they are exposed
+_registry = []
+_server = None
+_server_lock = threading.Lock()
+
+
+def _label_text(names, values):
+    if not names:
+        return ''
+    pairs = []
+    for name, value in zip(names, values):
+        value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        pairs.append('%s="%s"' % (name, value))
+    return '{' + ','.join(pairs) + '}'
+
+
+def _number(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter(object):
+    """
+    A Prometheus counter, optionally split by labels.
+
+    Parameters
+    ----------
+    name : str
+        The metric name.
+    documentation : str
+        The HELP text.
+    labels : tuple
+        The label names every increment must give values for.
+    """
+
+    kind = 'counter'
+
+    def __init__(self, name, documentation, labels=()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def __repr__(self):
+        return "Counter(%s)" % self.name
+
+    def _key(self, labels):
+        return tuple(str(labels[name]) for name in self.labels)
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def samples(self):
+        with self._lock:
+            return [(self.name, self.labels, key, value) for key, value in sorted(self._values.items())]
+
+
+class Histogram(object):
+    """
+    A Prometheus histogram, optionally split by labels.
+
+    Parameters
+    ----------
+    name : str
+        The metric name.
+    documentation : str
+        The HELP text.
+    labels : tuple
+        The label names every observation must give values for.
+    buckets : tuple
+        The upper bounds of the buckets, in increasing order. +Inf is added.
+    """
+
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labels=(), buckets=(.05, .1, .25, .5, 1, 2.5, 5, 10, 30, 60)):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets) + (float('inf'),)
+        self._values = {}
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def __repr__(self):
+        return "Histogram(%s)" % self.name
+
+    def _key(self, labels):
+        return tuple(str(labels[name]) for name in self.labels)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            counts, total = self._values.get(key, ([0] * len(self.buckets), 0))
+            counts = [count + (value <= bound) for count, bound in zip(counts, self.buckets)]
+            self._values[key] = (counts, total + value)
+
+    def count(self, **labels):
+        with self._lock:
+            counts, total = self._values.get(self._key(labels), ([0], 0))
+            return counts[-1]
+
+    def samples(self):
+        samples = []
+        with self._lock:
+            for key, (counts, total) in sorted(self._values.items()):
+                for bound, count in zip(self.buckets, counts):
+                    samples.append((self.name + '_bucket', self.labels + ('le',), key + (_number(bound),), count))
+                samples.append((self.name + '_count', self.labels, key, counts[-1]))
+                samples.append((self.name + '_sum', self.labels, key, total))
+        return samples
+
+
+def render():
+    """
+    Returns
+    -------
+    str
+        Every metric in the Prometheus text exposition format.
+    """
+
+    lines = []
+    for metric in _registry:
+        lines.append('# HELP %s %s' % (metric.name, metric.documentation))
+        lines.append('# TYPE %s %s' % (metric.name, metric.kind))
+        for name, label_names, label_values, value in metric.samples():
+            lines.append('%s%s %s' % (name, _label_text(label_names, label_values), _number(value)))
+    return '\n'.join(lines) + '\n'
+
+
+def dump(path):
+    """
+    Writes every metric to a file, e.g. for node_exporter's textfile collector when no port is served.
+
+    Parameters
+    ----------
+    path : str
+        The file to write. It is replaced atomically.
+    """
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp = path + '.tmp'
+    with open(tmp, 'w') as f:
+        f.write(render())
+    os.replace(tmp, path)
+
+
+def serve(port, address='127.0.0.1'):
+    """
+    Serves the metrics on an HTTP port from a daemon thread, once per process.
+
+    Parameters
+    ----------
+    port : int
+        The port to listen on. 0 picks a free one.
+    address : str
+        The address to bind. The default only accepts connections from the same host; use 0.0.0.0
+        inside a container so a published port reaches the server.
+
+    Returns
+    -------
+    ThreadingHTTPServer
+        The running server.
+    """
+
+    # imported here so one-shot runs that write a metrics file do not pay for the http server
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?')[0] not in ('/', '/metrics'):
+                self.send_error(404)
+                return
+            body = render().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            logger.debug(format % args)
+
+    global _server
+    with _server_lock:
+        if _server is None:
+            _server = ThreadingHTTPServer((address, port), Handler)
+            threading.Thread(target=_server.serve_forever, name='metrics', daemon=True).start()
+            logger.info("Serving metrics on %s:%d" % _server.server_address[:2])
+        return _server
+
+
+def publish(port=0, path=None, address='127.0.0.1'):
+    """
+    Makes the metrics available the way the settings ask: on a port when one is given,
+    otherwise by writing them to a file.
+
+    Parameters
+    ----------
+    port : int
+        The metrics port, or 0 for none.
+    path : str, optional
+        The file to write when there is no port.
+    address : str
+        The address the port is bound to.
+    """
+
+    if port:
+        serve(port, address)
+    elif path:
+        try:
+            dump(path)
+        except OSError as e:
+            logger.error("Could not write metrics to %s: %s" % (path, e))
+
+
+JOB_DURATION = Histogram('gamedaybot_job_duration_seconds', 'Time spent building a report.', ('function',))
+JOB_FAILURES = Counter('gamedaybot_job_failures_total', 'Reports that raised instead of returning text.', ('function',))
+ESPN_REQUESTS = Counter('gamedaybot_espn_requests_total', 'Requests made to ESPN, by report.', ('function',))
+ESPN_BYTES = Counter('gamedaybot_espn_response_bytes_total', 'Bytes received from ESPN, by report.', ('function',))
+MESSAGE_CHUNKS = Histogram('gamedaybot_message_chunks', 'Messages a report was split into to fit the length limit.',
+                           ('function',), buckets=(1, 2, 3, 5, 10))
+DISCORD_LATENCY = Histogram('gamedaybot_discord_send_seconds', 'Time Discord took to answer a message.')
+DISCORD_FAILURES = Counter('gamedaybot_discord_failures_total', 'Messages Discord did not accept.', ('reason',))
+DISCORD_RATE_LIMITED = Counter('gamedaybot_discord_rate_limited_total', 'Responses telling the bot to slow down.')
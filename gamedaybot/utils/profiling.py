@@ -0,0 +1,88 @@
+import contextlib
+import cProfile
+from datetime import datetime
+import logging
+import os
+import threading
+import tracemalloc
+
+logger = logging.getLogger(__name__)
+
+# cProfile and tracemalloc are process-wide, so only one report is profiled at a time
+_lock = threading.Lock()
+
+
+def should_profile(function, selected):
+    """
+    Parameters
+    ----------
+    function : str
+        The report about to run.
+    selected : list
+        The reports to profile, from PROFILE_FUNCTIONS. 'all' selects every report.
+
+    Returns
+    -------
+    bool
+        True if the report should be profiled.
+    """
+
+    return function in selected or 'all' in selected
+
+
+@contextlib.contextmanager
+def profile(name, directory, top=10):
+    """
+    Runs the block under cProfile and tracemalloc and writes what they saw to timestamped files.
+
+    ``<name>_<timestamp>.prof`` is a pstats file (open it with ``python -m pstats`` or snakeviz) and
+    ``<name>_<timestamp>.tracemalloc`` an allocation snapshot (``tracemalloc.Snapshot.load``). The largest
+    allocation sites are also logged. Only the calling thread is profiled; box scores fetched on worker
+    threads show up as time spent waiting for them.
+
+    If another report is already being profiled the block runs unprofiled.
+
+    Parameters
+    ----------
+    name : str
+        The file name prefix, e.g. the league and report.
+    directory : str
+        Where the files are written.
+    top : int
+        How many allocation sites to log.
+
+    Yields
+    ------
+    str
+        The path prefix of the files, or None if the block is not profiled.
+    """
+
+    if not _lock.acquire(blocking=False):
+        logger.warning("Not profiling %s, another report is being profiled" % name)
+        yield None
+        return
+
+    try:
+        os.makedirs(directory, exist_ok=True)
+        prefix = os.path.join(directory, '%s_%s' % (name, datetime.now().strftime('%Y%m%d-%H%M%S')))
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield prefix
+        finally:
+            profiler.disable()
+            snapshot = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            if started_tracing:
+                tracemalloc.stop()
+
+            profiler.dump_stats(prefix + '.prof')
+            snapshot.dump(prefix + '.tracemalloc')
+            stats = snapshot.statistics('lineno')[:top]
+            logger.info("Profiled %s to %s.prof, peak traced memory %.1f KiB\n%s" %
+                        (name, prefix, peak / 1024, '\n'.join(str(stat) for stat in stats)))
+    finally:
+        _lock.release()
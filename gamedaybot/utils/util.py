@@ -1,5 +1,6 @@
 import os
 import random
+import re
 from datetime import datetime
 from urllib.parse import urlparse
 
@@ -49,9 +50,36 @@ def str_to_bool(check: str) -> bool:
     return check.lower().strip() in ("yes", "true", "t", "1")
 
 
-def str_limit_check(text: str, limit: int):
+# Formatting markers that wrap text and must be balanced within every message
+PAIRED_MARKERS = ('#b#', '#u#', '#c#')
+_MARKER = re.compile(r'#[a-z]#')
+# markers, whitespace and words, the places a line that is too long may be cut
+_ATOM = re.compile(r'#[a-z]#|\s+|[^\s#]+|#')
+
+
+def _toggle_markers(opened, text):
+    opened = list(opened)
+    for marker in _MARKER.findall(text):
+        if marker in PAIRED_MARKERS:
+            if marker in opened:
+                opened.remove(marker)
+            else:
+                opened.append(marker)
+    return opened
+
+
+def _close_markers(opened):
+    return ''.join(reversed(opened))
+
+
+def str_limit_check(text: str, limit: int, measure=len):
     """
-    Splits a string into parts of a maximum length.
+    Splits a string into as many parts as needed so that no part is longer than the limit.
+
+    Parts are split on line boundaries, packing as many lines into each part as fit. A single line longer
+    than the limit is cut between words, or between characters as a last resort. Bold, underline and
+    code markers left open at the end of a part are closed there and reopened at the start of the next.
+    Runs in linear time.
 
     Parameters
     ----------
@@ -59,31 +87,89 @@ def str_limit_check(text: str, limit: int):
         The text to be split.
     limit : int
         The maximum length of each split string part.
+    measure : callable, optional
+        Returns the length of a piece of text as it will be sent, e.g. after formatting markers are
+        replaced. It must be additive: the length of two joined pieces is the sum of their lengths.
 
     Returns
     -------
     split_str : List[str]
         A list of strings split by the maximum length.
-    """
 
-    split_str = []
+    Raises
+    ------
+    TypeError
+        If the text is not a string or the limit is not an integer.
+    ValueError
+        If the limit is not positive.
+    """
 
-    if (limit <= 0) or (not isinstance(limit, int)):
+    if not isinstance(text, str):
+        raise TypeError("Text must be a string.")
+    if isinstance(limit, bool) or not isinstance(limit, int):
+        raise TypeError("Limit must be an integer.")
+    if limit <= 0:
         raise ValueError("Limit must be a positive integer.")
 
-    if len(text) > limit:
-        part_one = text[:limit].split('\n')
-        part_one.pop()
-        part_one = '\n'.join(part_one)
-
-        part_two = text[len(part_one) + 1:]
+    text = text.strip()
+    if measure(text) <= limit:
+        return [text]
 
-        split_str.append(part_one)
-        split_str.append(part_two)
-    else:
-        split_str.append(text)
-
-    return split_str
+    split_str = []
+    parts = []      # pieces of the part being built
+    size = 0        # measured length of the part being built
+    started = False # whether the part being built has any text yet
+    opened = []     # markers open at the end of the part being built
+
+    def finish():
+        nonlocal parts, size, started
+        split_str.append(''.join(parts) + _close_markers(opened))
+        reopen = ''.join(opened)
+        parts, size, started = [reopen], measure(reopen), False
+
+    for line in text.split('\n'):
+        after = _toggle_markers(opened, line)
+        cost = measure(line) + (1 if started else 0)
+        if started and size + cost + measure(_close_markers(after)) > limit:
+            finish()
+            cost = measure(line)
+
+        if size + cost + measure(_close_markers(after)) <= limit:
+            parts.append(('\n' if started else '') + line)
+            size += cost
+            started = True
+            opened = after
+            continue
+
+        # the line does not fit in an empty part either, so cut it between words
+        if started:
+            parts.append('\n')
+            size += 1
+        for atom in _ATOM.findall(line):
+            after = _toggle_markers(opened, atom)
+            if size + measure(atom) + measure(_close_markers(after)) > limit:
+                if started:
+                    finish()
+                if atom.isspace():
+                    continue
+            if size + measure(atom) + measure(_close_markers(after)) > limit:
+                # a single word longer than the limit
+                for char in atom:
+                    if started and size + measure(char) + measure(_close_markers(opened)) > limit:
+                        finish()
+                    parts.append(char)
+                    size += measure(char)
+                    started = True
+                continue
+            parts.append(atom)
+            size += measure(atom)
+            started = True
+            opened = after
+
+    split_str.append(''.join(parts))
+    # a cut that ends right before a blank line leaves a part with nothing to show, which Discord rejects;
+    # every part is balanced on its own, so dropping one never unbalances the markers of the others
+    return [part for part in split_str if _MARKER.sub('', part).strip()] or ['']
 
 
 def str_to_datetime(date_str: str) -> datetime:
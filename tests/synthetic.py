@@ -0,0 +1,264 @@
+"""
+A synthetic stand-in for espn_api's football League, with just enough of its surface for every report.
+
+Leagues are generated from a seed, so the same arguments always give the same league, and count how
+often box scores are requested so tests can check how much a report fetches.
+"""
+import random
+from datetime import datetime
+
+LAYOUTS = {
+    'standard': {'QB': 1, 'RB': 2, 'WR': 2, 'TE': 1, 'RB/WR/TE': 1, 'D/ST': 1, 'K': 1, 'BE': 7, 'IR': 1},
+    'superflex': {'QB': 1, 'RB': 2, 'WR': 3, 'TE': 1, 'RB/WR/TE': 1, 'OP': 1, 'D/ST': 1, 'K': 1, 'BE': 7, 'IR': 1},
+    'idp': {'QB': 1, 'RB': 2, 'WR': 2, 'TE': 1, 'RB/WR/TE': 1, 'OP': 1, 'K': 1,
+            'DL': 2, 'LB': 2, 'DB': 2, 'DP': 1, 'BE': 8, 'IR': 1},
+}
+
+# players on every roster for each layout, most often the starters plus a few on the bench
+ROSTERS = {
+    'standard': ['QB', 'QB', 'RB', 'RB', 'RB', 'RB', 'WR', 'WR', 'WR', 'WR', 'TE', 'TE', 'D/ST', 'K', 'RB', 'WR'],
+    'superflex': ['QB', 'QB', 'QB', 'RB', 'RB', 'RB', 'RB', 'WR', 'WR', 'WR', 'WR', 'WR', 'TE', 'TE', 'D/ST', 'K',
+                  'RB', 'WR'],
+    'idp': ['QB', 'QB', 'RB', 'RB', 'RB', 'WR', 'WR', 'WR', 'TE', 'TE', 'K', 'DT', 'DE', 'DE', 'LB', 'LB', 'LB',
+            'CB', 'CB', 'S', 'S', 'RB', 'WR'],
+}
+
+FLEX = {'RB/WR/TE': ('RB', 'WR', 'TE'), 'OP': ('QB', 'RB', 'WR', 'TE'), 'DL': ('DT', 'DE'), 'DB': ('CB', 'S'),
+        'DP': ('DT', 'DE', 'LB', 'CB', 'S')}
+
+PRO_TEAMS = ['ARI', 'ATL', 'BAL', 'BUF', 'CAR', 'CHI', 'CIN', 'CLE', 'DAL', 'DEN', 'DET', 'GB', 'HOU', 'IND', 'JAX',
+             'KC', 'LAC', 'LAR', 'LV', 'MIA', 'MIN', 'NE', 'NO', 'NYG', 'NYJ', 'PHI', 'PIT', 'SEA', 'SF', 'TB', 'TEN',
+             'WSH']
+
+
+class Settings(object):
+    def __init__(self, layout, reg_season_count):
+        self.position_slot_counts = dict(LAYOUTS[layout])
+        self.reg_season_count = reg_season_count
+        self.faab = True
+
+
+class Team(object):
+    def __init__(self, team_id):
+        self.team_id = team_id
+        self.team_name = 'Team %d' % team_id
+        self.team_abbrev = 'T%d' % team_id
+        self.wins = 0
+        self.losses = 0
+        self.ties = 0
+        self.points_for = 0
+        self.scores = []
+        self.outcomes = []
+        self.mov = []
+        self.schedule = []
+        self.roster = []
+        self.acquisitions = 0
+        self.drops = 0
+        self.trades = 0
+        self.playoff_pct = 0.0
+
+    def __repr__(self):
+        return 'Team(%s)' % self.team_name
+
+
+class Player(object):
+    def __repr__(self):
+        return 'Player(%s)' % self.name
+
+
+class BoxScore(object):
+    def __repr__(self):
+        return 'Box Score(%s at %s)' % (self.away_team, self.home_team)
+
+
+class Activity(object):
+    pass
+
+
+class League(object):
+    """
+    A generated league.
+
+    Parameters
+    ----------
+    teams : int
+        The number of teams, 8 to 32.
+    weeks : int
+        The number of weeks played. Defaults to a full 17 week season.
+    layout : str
+        One of the roster slot layouts in LAYOUTS.
+    seed : int
+        The seed everything is generated from.
+    league_id : int, optional
+        Defaults to a value derived from the other arguments, so generated leagues never share caches.
+    """
+
+    def __init__(self, teams=12, weeks=17, layout='standard', seed=0, league_id=None):
+        rnd = random.Random(seed)
+        self.league_id = league_id or 'synthetic-%d-%d-%s-%d' % (teams, weeks, layout, seed)
+        self.year = 2025
+        self.finalScoringPeriod = 17
+        self.current_week = min(weeks + 1, self.finalScoringPeriod)
+        self.scoringPeriodId = weeks + 1
+        self.currentMatchupPeriod = self.current_week
+        self.nfl_week = self.scoringPeriodId
+        self.settings = Settings(layout, min(14, self.finalScoringPeriod))
+        self.teams = [Team(i + 1) for i in range(teams)]
+        self.box_score_calls = 0
+        self.player_info_calls = 0
+        self._box_scores = {}
+
+        for team in self.teams:
+            team.acquisitions = rnd.randint(0, 30)
+            team.drops = team.acquisitions
+            team.trades = rnd.randint(0, 3)
+            team.playoff_pct = round(rnd.uniform(0, 100), 1)
+            team.roster = [self._player(rnd, team, j, position) for j, position in enumerate(ROSTERS[layout])]
+            for p in team.roster:
+                p.total_points = round(rnd.uniform(0, 250), 2)
+                p.projected_total_points = round(rnd.uniform(1, 250), 2)
+
+        # one extra week in progress, unless the season is over
+        for week in range(1, self.current_week + 1):
+            self._box_scores[week] = self._week(rnd, week, layout, final=week <= weeks)
+
+        self.player_map = {}
+        for team in self.teams:
+            for p in team.roster:
+                self.player_map[p.playerId] = p.name
+                self.player_map[p.name] = p.playerId
+        self._players = {p.playerId: p for team in self.teams for p in team.roster}
+        self._transactions = self._make_transactions(rnd)
+
+    def __repr__(self):
+        return 'League(%s, %s)' % (self.league_id, self.year)
+
+    @staticmethod
+    def _player(rnd, team, j, position):
+        p = Player()
+        p.playerId = team.team_id * 1000 + j
+        p.name = 'Player %d-%d' % (team.team_id, j) if position != 'D/ST' else '%s D/ST' % PRO_TEAMS[team.team_id % 32]
+        p.position = position
+        p.proTeam = PRO_TEAMS[(team.team_id + j) % 32]
+        return p
+
+    def _lineup(self, rnd, team, layout, final):
+        slots = [slot for slot, count in LAYOUTS[layout].items() if slot not in ('BE', 'IR') for _ in range(count)]
+        lineup = []
+        for source in team.roster:
+            p = Player()
+            p.__dict__.update(source.__dict__)
+            p.slot_position = 'BE'
+            p.projected_points = round(rnd.uniform(0, 25), 2)
+            p.points = round(p.projected_points + rnd.gauss(0, 7), 2) if final or rnd.random() < 0.5 else 0
+            p.game_played = 100 if p.points else 0
+            p.pro_opponent = 'None' if rnd.random() < 0.04 else rnd.choice(PRO_TEAMS)
+            p.injuryStatus = rnd.choice(['ACTIVE'] * 12 + ['QUESTIONABLE', 'OUT', 'DOUBTFUL', 'INJURY_RESERVE'])
+            lineup.append(p)
+
+        # managers fill starting slots in order with their best projected players, then put one bench player on IR
+        order = sorted(range(len(lineup)), key=lambda j: -lineup[j].projected_points)
+        used = set()
+        for slot in slots:
+            for j in order:
+                if j not in used and lineup[j].position in FLEX.get(slot, (slot,)):
+                    lineup[j].slot_position = slot
+                    used.add(j)
+                    break
+        bench = [p for p in lineup if p.slot_position == 'BE']
+        if bench:
+            rnd.choice(bench).slot_position = 'IR'
+        return lineup
+
+    def _week(self, rnd, week, layout, final):
+        order = list(self.teams)
+        rnd.shuffle(order)
+        boxes = []
+        for home, away in zip(order[::2], order[1::2]):
+            box = BoxScore()
+            box.home_team, box.away_team = home, away
+            for side, team in (('home', home), ('away', away)):
+                lineup = self._lineup(rnd, team, layout, final)
+                starters = [p for p in lineup if p.slot_position not in ('BE', 'IR')]
+                setattr(box, side + '_lineup', lineup)
+                setattr(box, side + '_score', round(sum(p.points for p in starters), 2))
+                setattr(box, side + '_projected', round(sum(p.projected_points for p in starters), 2))
+            boxes.append(box)
+
+            if final:
+                home.schedule.append(away)
+                away.schedule.append(home)
+                home.scores.append(box.home_score)
+                away.scores.append(box.away_score)
+                home.mov.append(box.home_score - box.away_score)
+                away.mov.append(box.away_score - box.home_score)
+                won = box.home_score > box.away_score
+                home.outcomes.append('W' if won else 'L')
+                away.outcomes.append('L' if won else 'W')
+                home.wins, away.losses = home.wins + won, away.losses + won
+                home.losses, away.wins = home.losses + (not won), away.wins + (not won)
+                home.points_for += box.home_score
+                away.points_for += box.away_score
+
+        # an odd team out is on a bye
+        if len(order) % 2:
+            box = BoxScore()
+            box.home_team, box.away_team = order[-1], 0
+            box.home_lineup, box.away_lineup = self._lineup(rnd, order[-1], layout, final), []
+            box.home_score = box.away_score = box.home_projected = box.away_projected = 0
+            boxes.append(box)
+            if final:
+                order[-1].scores.append(0)
+                order[-1].outcomes.append('U')
+                order[-1].mov.append(0)
+                order[-1].schedule.append(order[-1])
+        return boxes
+
+    def _make_transactions(self, rnd):
+        today = datetime.now().replace(hour=3, minute=0, second=0, microsecond=0)
+        transactions = []
+        for team in rnd.sample(self.teams, min(len(self.teams), 6)):
+            txn = Activity()
+            txn.id = 'txn-%d-%d' % (team.team_id, len(transactions))
+            txn.team = team
+            txn.status = 'EXECUTED'
+            txn.date = int(today.timestamp() * 1000) + rnd.randint(0, 3600000)
+            txn.bid_amount = rnd.randint(0, 40)
+            txn.items = []
+            for kind in ('ADD', 'DROP'):
+                item = Activity()
+                item.type = kind
+                player = rnd.choice(team.roster)
+                item.playerId = player.playerId
+                item.player = player.name
+                txn.items.append(item)
+            transactions.append(txn)
+        return transactions
+
+    def box_scores(self, week=None):
+        self.box_score_calls += 1
+        if not week or week > self.current_week:
+            week = self.current_week
+        return self._box_scores[week]
+
+    def standings(self):
+        return sorted(self.teams, key=lambda team: (-team.wins, -team.points_for))
+
+    def power_rankings(self, week=None):
+        week = week or self.current_week - 1
+        ranked = [(sum(team.scores[:week]) / max(1, week), team) for team in self.teams]
+        return [('%.2f' % score, team) for score, team in sorted(ranked, key=lambda item: item[0], reverse=True)]
+
+    def transactions(self, scoring_period=None, types=None, **kwargs):
+        return list(self._transactions)
+
+    def player_info(self, name=None, playerId=None):
+        # like espn_api: one Player for one match, a list for several, None for none
+        self.player_info_calls += 1
+        if name:
+            playerId = self.player_map.get(name)
+        ids = playerId if isinstance(playerId, list) else [playerId]
+        players = [self._players[i] for i in ids if i in self._players]
+        if len(players) > 1:
+            return players
+        return players[0] if players else None
@@ -0,0 +1,97 @@
+import sys
+import os
+sys.path.insert(1, os.path.abspath('.'))
+
+import pytest
+
+import gamedaybot.espn.all_play as all_play
+import gamedaybot.espn.box_score_cache as box_score_cache
+import gamedaybot.espn.functionality as espn
+import gamedaybot.espn.season_recap as recap
+import baseline
+from synthetic import League
+
+
+def tie_weeks(league, weeks):
+    # four teams share a score, two of them in the same matchup
+    for week in weeks:
+        boxes = [box for box in league._box_scores[week] if box.away_team]
+        for box in boxes[:2]:
+            box.home_score = box.away_score = 100.0
+
+
+@pytest.mark.parametrize('teams,weeks,ties', [(8, 6, False), (10, 13, True), (13, 9, True)])
+def test_sim_record_matches_baseline(teams, weeks, ties):
+    league = League(teams, weeks, seed=teams, league_id='all-play-%d-%d-%s' % (teams, weeks, ties))
+    if ties:
+        tie_weeks(league, range(1, league.current_week + 1, 2))
+    box_score_cache.start_run(league)
+    for week in range(1, league.current_week):
+        assert espn.sim_record(league, week) == baseline.sim_record(league, week)
+    assert len(all_play.get_ledger(league).totals) == league.current_week - 2
+
+
+def test_ledger_catches_up_mid_season():
+    # the same league five weeks in, then ten: the weeks kept from the first are reused, the rest added
+    early = League(12, 5, seed=8, league_id='all-play-catch-up')
+    box_score_cache.start_run(early)
+    assert espn.sim_record(early) == baseline.sim_record(early)
+    assert len(all_play.get_ledger(early).totals) == 4
+
+    late = League(12, 10, seed=8, league_id='all-play-catch-up')
+    tie_weeks(late, [7])
+    box_score_cache.start_run(late)
+    records = espn.sim_record(late)
+    # only the weeks the ledger had not kept were fetched
+    assert late.box_score_calls == late.current_week - 1 - 4
+    assert records == baseline.sim_record(late)
+    for week in range(1, late.current_week):
+        assert espn.sim_record(late, week) == baseline.sim_record(late, week)
+
+
+def test_power_rankings_text_matches_baseline(monkeypatch):
+    league = League(10, 9, seed=3, league_id='all-play-power-rankings')
+    tie_weeks(league, [2, 5])
+    box_score_cache.start_run(league)
+    text = espn.combined_power_rankings(league)
+    monkeypatch.setattr(espn, 'sim_record', baseline.sim_record)
+    assert text == espn.combined_power_rankings(league)
+
+
+@pytest.mark.parametrize('teams,weeks,ties', [(8, 6, False), (13, 9, False), (12, 16, True)])
+def test_win_matrix_matches_baseline(teams, weeks, ties):
+    league = League(teams, weeks, seed=teams + 1, league_id='win-matrix-%d-%d-%s' % (teams, weeks, ties))
+    if ties:
+        tie_weeks(league, range(1, league.current_week + 1, 3))
+    box_score_cache.start_run(league)
+    assert recap.win_matrix(league) == baseline.win_matrix(league)
+
+
+def test_all_play_matrix_matches_sim_record():
+    # without tied scores every all-play game has a winner, so the matrix and the sim records agree
+    league = League(10, 12, seed=6, league_id='win-matrix-sim-record')
+    box_score_cache.start_run(league)
+    for week in range(1, league.current_week):
+        scores, won, order = all_play.score_matrix(league, list(range(1, week + 1)))
+        wins, losses = all_play.all_play_matrix(scores, won, order)
+        records = baseline.sim_record(league, week)
+        for team, w, l in zip(league.teams, wins.sum(axis=1), losses.sum(axis=1)):
+            assert records[team] == ['%d-%d' % (w, l)]
+
+
+def test_win_matrix_with_undefeated_and_winless_teams():
+    # the original divided wins by losses, so an undefeated team raised ZeroDivisionError
+    league = League(8, 5, seed=9, league_id='win-matrix-undefeated')
+    for week, boxes in league._box_scores.items():
+        for box in boxes:
+            for side, team in (('home', box.home_team), ('away', box.away_team)):
+                if team.team_id == 1:
+                    setattr(box, side + '_score', 999.0)
+                elif team.team_id == 2:
+                    setattr(box, side + '_score', -1.0)
+    box_score_cache.start_run(league)
+    with pytest.raises(ZeroDivisionError):
+        baseline.win_matrix(league)
+    lines = recap.win_matrix(league).split('\n')
+    assert lines[1].endswith('T1: [%d - 0]#c#' % (7 * league.current_week))
+    assert lines[-1].endswith('T2: [0 - %d]#c#' % (7 * league.current_week))
@@ -0,0 +1,98 @@
+"""
+Times every report against synthetic leagues and counts the box score requests each one makes.
+
+A report that gets slower than its budget, or starts fetching more weeks than it needs, fails here.
+The budgets are generous so the suite is stable on slow machines; set BENCHMARK_SCALE to tighten
+(e.g. 0.25) or loosen them.
+"""
+import sys
+import os
+import time
+sys.path.insert(1, os.path.abspath('.'))
+
+import pytest
+
+import gamedaybot.espn.box_score_cache as box_score_cache
+import gamedaybot.espn.functionality as espn
+import gamedaybot.espn.season_recap as recap
+from synthetic import League
+
+SCALE = float(os.environ.get('BENCHMARK_SCALE', 1))
+
+# (teams, weeks played, roster layout)
+LEAGUES = [
+    (8, 6, 'standard'),
+    (10, 13, 'standard'),
+    (12, 16, 'superflex'),
+    (13, 9, 'standard'),
+    (14, 12, 'idp'),
+    (32, 16, 'idp'),
+]
+
+# report name, how to call it, the box score requests it may make, and its time budget in seconds
+REPORTS = [
+    ('get_scoreboard_short', lambda league: espn.get_scoreboard_short(league), lambda league: 1, 0.1),
+    ('get_projected_scoreboard', lambda league: espn.get_projected_scoreboard(league), lambda league: 1, 0.1),
+    ('get_standings', lambda league: espn.get_standings(league, True), lambda league: 0, 0.1),
+    ('get_monitor', lambda league: espn.get_monitor(league, 0), lambda league: 1, 0.1),
+    ('get_inactives', lambda league: espn.get_inactives(league), lambda league: 1, 0.1),
+    ('get_matchups', lambda league: espn.get_matchups(league), lambda league: 1, 0.1),
+    ('get_close_scores', lambda league: espn.get_close_scores(league), lambda league: 1, 0.1),
+    ('get_waiver_report', lambda league: espn.get_waiver_report(league, True), lambda league: 0, 0.1),
+    ('combined_power_rankings', lambda league: espn.combined_power_rankings(league),
+     lambda league: league.current_week - 1, 0.25),
+    ('optimal_team_scores', lambda league: espn.optimal_team_scores(league), lambda league: 1, 0.25),
+    ('get_trophies', lambda league: espn.get_trophies(league, True), lambda league: 1, 0.25),
+    ('win_matrix', lambda league: recap.win_matrix(league), lambda league: league.current_week, 0.25),
+    ('season_trophies', lambda league: recap.season_trophies(league, True),
+     lambda league: len(recap.season_weeks(league)), 1.0),
+]
+
+
+@pytest.fixture(scope='module', params=LEAGUES, ids=lambda p: '%d-teams-%d-weeks-%s' % p)
+def league(request):
+    return League(*request.param)
+
+
+@pytest.mark.parametrize('name,report,max_fetches,budget', REPORTS, ids=[r[0] for r in REPORTS])
+def test_report(league, name, report, max_fetches, budget):
+    box_score_cache.start_run(league)
+    before = league.box_score_calls
+    start = time.perf_counter()
+    text = report(league)
+    elapsed = time.perf_counter() - start
+
+    assert isinstance(text, str) and text
+    assert league.box_score_calls - before <= max_fetches(league)
+    assert elapsed < budget * SCALE, '%s took %.3fs' % (name, elapsed)
+
+    # everything a report needs is cached for the rest of the run
+    before = league.box_score_calls
+    report(league)
+    assert league.box_score_calls == before
+
+
+def test_generator_is_deterministic():
+    a, b = League(12, 5, 'idp', seed=3), League(12, 5, 'idp', seed=3)
+    assert [box.home_score for box in a.box_scores(3)] == [box.home_score for box in b.box_scores(3)]
+    assert [team.scores for team in a.teams] == [team.scores for team in b.teams]
+
+
+def test_generator_fills_every_slot():
+    league = League(32, 4, 'idp')
+    slots = {slot: count for slot, count in league.settings.position_slot_counts.items() if slot not in ('BE', 'IR')}
+    for box in league.box_scores(2):
+        started = [p.slot_position for p in box.home_lineup if p.slot_position not in ('BE', 'IR')]
+        assert {slot: started.count(slot) for slot in slots} == slots
+
+
+@pytest.mark.parametrize('layout', ['standard', 'superflex', 'idp'])
+def test_common_layouts_skip_assignment_solver(layout, monkeypatch):
+    # nested flex slots are filled greedily; the assignment solver is several times slower
+    def solver(weights):
+        raise AssertionError('assignment solver used for %s' % layout)
+    monkeypatch.setattr(espn, '_max_assignment', solver)
+    league = League(10, 3, layout)
+    starter_counts = espn.get_starter_counts(league)
+    for box in league.box_scores(2):
+        espn.optimal_lineup_score(box.home_lineup, starter_counts)
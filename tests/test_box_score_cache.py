@@ -0,0 +1,89 @@
+import sys
+import os
+import contextvars
+import threading
+import time
+sys.path.insert(1, os.path.abspath('.'))
+
+import gamedaybot.espn.box_score_cache as box_score_cache
+from synthetic import League
+
+
+def test_run_reuses_its_own_fetches():
+    league = League(8, 4, seed=11)
+    run = box_score_cache.start_run(league)
+    box_score_cache.get_box_scores(league, 2)
+    box_score_cache.get_box_scores(league, 2)
+    assert league.box_score_calls == 1
+    assert (run.hits, run.misses, run.fetches) == (1, 1, 1)
+
+
+def test_new_run_leaves_a_concurrent_run_alone():
+    league = League(8, 4, seed=12)
+    first = contextvars.copy_context()
+    run = first.run(box_score_cache.start_run, league)
+    first.run(box_score_cache.get_box_scores, league, 2)
+
+    # another job for the same league starts while the first is still running
+    other = box_score_cache.start_run(league)
+    box_score_cache.get_box_scores(league, 2)
+    assert other.misses == 1
+
+    # the first run still has its counters and finds its week cached
+    first.run(box_score_cache.get_box_scores, league, 2)
+    assert (run.hits, run.misses) == (1, 1)
+    assert first.run(box_score_cache.get_cache(league).stats)['weeks'] == [2]
+
+
+def test_ttl_reuses_earlier_runs():
+    league = League(8, 4, seed=13)
+    box_score_cache.start_run(league, ttl=3600)
+    box_score_cache.get_box_scores(league, 3)
+    box_score_cache.start_run(league, ttl=3600)
+    box_score_cache.get_box_scores(league, 3)
+    box_score_cache.start_run(league, ttl=0)
+    box_score_cache.get_box_scores(league, 3)
+    assert league.box_score_calls == 2
+
+
+def test_last_week_is_not_final_until_corrections_settle():
+    league = League(8, 5, seed=14)
+    assert box_score_cache.is_final(league, 4)
+    assert not box_score_cache.is_final(league, 5)
+    assert not box_score_cache.is_final(league, league.current_week)
+
+
+def test_concurrent_get_weeks_respects_the_in_flight_limit():
+    league = League(8, 12, seed=15)
+    lock = threading.Lock()
+    open_requests = [0]
+    most_open = [0]
+    fetched = []
+    box_scores = league.box_scores
+
+    def slow_box_scores(week=None):
+        with lock:
+            open_requests[0] += 1
+            most_open[0] = max(most_open[0], open_requests[0])
+            fetched.append(week)
+        time.sleep(0.02)
+        with lock:
+            open_requests[0] -= 1
+        return box_scores(week)
+
+    league.box_scores = slow_box_scores
+    box_score_cache.configure_fetching(workers=6, limit=2)
+    try:
+        # two reports of the same job ask for overlapping weeks at once
+        box_score_cache.start_run(league)
+        jobs = [threading.Thread(target=contextvars.copy_context().run,
+                                 args=(box_score_cache.get_weeks, league, weeks))
+                for weeks in (range(1, 10), range(4, 13))]
+        for job in jobs:
+            job.start()
+        for job in jobs:
+            job.join()
+    finally:
+        box_score_cache.configure_fetching()
+    assert most_open[0] == 2
+    assert sorted(fetched) == list(range(1, 13))
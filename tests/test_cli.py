@@ -0,0 +1,69 @@
+import sys
+import os
+sys.path.insert(1, os.path.abspath('.'))
+
+import subprocess
+import time
+
+import gamedaybot.__main__ as cli
+
+SCALE = float(os.environ.get('BENCHMARK_SCALE', 1))
+HEAVY = ('apscheduler', 'espn_api', 'requests', 'numpy', 'http.server')
+
+
+def python(*args):
+    return subprocess.run([sys.executable] + list(args), cwd=os.path.abspath('.'), capture_output=True, text=True,
+                          check=True)
+
+
+def test_startup_defers_heavy_imports():
+    out = python('-c', 'import sys, gamedaybot.__main__; print(",".join(m for m in %r if m in sys.modules))' % (HEAVY,))
+    assert out.stdout.strip() == ''
+
+
+def test_bot_import_defers_numpy():
+    # one-shot runs of reports that do not need it must not pay for importing numpy
+    out = python('-c', 'import sys, gamedaybot.espn.espn_bot; print("numpy" in sys.modules)')
+    assert out.stdout.strip() == 'False'
+
+
+def test_cold_start_time():
+    best = float('inf')
+    for _ in range(3):
+        start = time.perf_counter()
+        python('-m', 'gamedaybot', '--help')
+        best = min(best, time.perf_counter() - start)
+    assert best < 1.0 * SCALE, 'python -m gamedaybot --help took %.3fs' % best
+
+
+def test_bot_import_time():
+    # what every run pays before its first report: espn_api, requests and the bot's own modules
+    best = float('inf')
+    for _ in range(3):
+        start = time.perf_counter()
+        python('-c', 'import gamedaybot.espn.espn_bot')
+        best = min(best, time.perf_counter() - start)
+    assert best < 2.0 * SCALE, 'import gamedaybot.espn.espn_bot took %.3fs' % best
+
+
+def test_run_runs_one_group(monkeypatch):
+    import gamedaybot.espn.espn_bot as espn_bot
+    import gamedaybot.chat.discord as discord
+
+    groups = []
+    monkeypatch.setattr(espn_bot, 'espn_bot_group', lambda functions: groups.append(functions) or [])
+    monkeypatch.setattr(discord, 'flush_queues', lambda timeout: True)
+    assert cli.main(['run', 'get_matchups', 'get_projected_scoreboard']) == 0
+    assert groups == [['get_matchups', 'get_projected_scoreboard']]
+
+    monkeypatch.setattr(discord, 'flush_queues', lambda timeout: False)
+    assert cli.main(['run', 'get_standings', '--timeout', '1']) == 1
+
+
+def test_run_fails_when_a_report_fails(monkeypatch):
+    import gamedaybot.espn.espn_bot as espn_bot
+    import gamedaybot.chat.discord as discord
+
+    monkeypatch.setattr(espn_bot, 'espn_bot_group', lambda functions: ['get_matchups'])
+    monkeypatch.setattr(discord, 'flush_queues', lambda timeout: True)
+    assert cli.main(['run', 'get_matchups', 'get_projected_scoreboard']) == 1
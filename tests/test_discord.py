@@ -1,8 +1,10 @@
 import pytest
+import requests
 import sys
 import os
+import time
 sys.path.insert(1, os.path.abspath('.'))
-from gamedaybot.chat.discord import (Discord, DiscordException, )
+from gamedaybot.chat.discord import (Discord, DiscordException, SendQueue, )
 
 
 @pytest.mark.usefixtures("mock_requests")
@@ -24,3 +26,66 @@ class TestDiscord:
         mock_requests.post(self.url, status_code=404)
         with pytest.raises(DiscordException):
             self.test_bot.send_message(self.test_text)
+
+    def test_latency_recorded(self, mock_requests):
+        '''Is the time taken by the post kept on the bot?'''
+        mock_requests.post(self.url, status_code=204)
+        self.test_bot.send_message(self.test_text)
+        assert self.test_bot.last_latency >= 0
+
+    def test_session_shared(self):
+        '''Do bots share one pooled session?'''
+        assert Discord(self.url).session is self.test_bot.session
+
+    def test_timeout(self, mock_requests):
+        '''Does a timed out post raise the expected error?'''
+        mock_requests.post(self.url, exc=requests.exceptions.ConnectTimeout)
+        with pytest.raises(DiscordException):
+            self.test_bot.send_message(self.test_text)
+
+
+@pytest.mark.usefixtures("mock_requests")
+class TestSendQueue:
+    '''Test SendQueue class'''
+
+    def setup_method(self):
+        self.url = "https://discordapp.com/api/webhooks/123/abc"
+        self.test_queue = SendQueue(Discord(self.url))
+
+    def test_messages_sent_in_order(self, mock_requests):
+        '''Are queued messages posted in the order they were queued?'''
+        mock_requests.post(self.url, status_code=204)
+        self.test_queue.put(['one', 'two'])
+        self.test_queue.put(['three'])
+        assert self.test_queue.flush(5)
+        assert [r.json()['content'] for r in mock_requests.request_history] == ['one', 'two', 'three']
+
+    def test_rate_limit_retried(self, mock_requests):
+        '''Is a rate limited message retried after retry_after?'''
+        mock_requests.post(self.url, [{'status_code': 429, 'json': {'retry_after': 0.05}},
+                                      {'status_code': 204}])
+        sent = []
+        start = time.monotonic()
+        self.test_queue.put(['one'], on_sent=lambda position, message, r: sent.append((position, message)))
+        assert self.test_queue.flush(5)
+        assert time.monotonic() - start >= 0.05
+        assert sent == [(0, 'one')]
+        assert self.test_queue.rate_limited == 1
+
+    def test_rate_limit_headers(self, mock_requests):
+        '''Does the queue wait for the bucket to reset once it is empty?'''
+        mock_requests.post(self.url, status_code=204,
+                           headers={'X-RateLimit-Remaining': '0', 'X-RateLimit-Reset-After': '0.05'})
+        start = time.monotonic()
+        self.test_queue.put(['one', 'two'])
+        assert self.test_queue.flush(5)
+        assert time.monotonic() - start >= 0.05
+        assert self.test_queue.sent == 2
+
+    def test_failed_message_dropped(self, mock_requests):
+        '''Does a failing message leave the rest of the report to be sent?'''
+        mock_requests.post(self.url, [{'status_code': 400}, {'status_code': 204}])
+        self.test_queue.put(['one', 'two'])
+        assert self.test_queue.flush(5)
+        assert self.test_queue.failed == 1
+        assert self.test_queue.sent == 1
@@ -0,0 +1,65 @@
+import sys
+import os
+sys.path.insert(1, os.path.abspath('.'))
+
+import logging
+
+import pytest
+
+import gamedaybot.espn.espn_bot as espn_bot
+import gamedaybot.espn.espn_http as espn_http
+from synthetic import League
+
+
+@pytest.fixture
+def league(monkeypatch, tmp_path):
+    """
+    A synthetic league the bot builds instead of asking ESPN, with credentials that must never be logged.
+    """
+
+    league = League(10, 6, seed=5, league_id='espn-bot')
+    monkeypatch.setenv('LEAGUE_ID', league.league_id)
+    monkeypatch.setenv('DISCORD_WEBHOOK_URL', 'https://discord.invalid/api/webhooks/1/secret-hook')
+    monkeypatch.setenv('SWID', '{secret-swid}')
+    monkeypatch.setenv('ESPN_S2', 'secret-s2')
+    monkeypatch.setenv('DATA_DIR', str(tmp_path))
+    monkeypatch.setenv('TEST', 'true')
+    monkeypatch.setattr(espn_bot, 'League', lambda **kwargs: league)
+    yield league
+    espn_http.uninstall()
+
+
+def test_group_never_logs_credentials(league, caplog):
+    with caplog.at_level(logging.DEBUG):
+        espn_bot.espn_bot_group(['get_matchups'])
+    assert caplog.text
+    assert 'secret' not in caplog.text
+
+
+class Queue(object):
+    def __init__(self):
+        self.puts = []
+
+    def put(self, messages, on_sent=None):
+        self.puts.append(list(messages))
+
+
+def test_group_posts_in_order_and_isolates_failures(league, monkeypatch):
+    monkeypatch.setenv('TEST', 'false')
+    queue = Queue()
+    monkeypatch.setattr(espn_bot, 'get_queue', lambda bot: queue)
+    leagues = []
+
+    def get_report(function, report_league, options):
+        leagues.append(report_league)
+        if function == 'get_standings':
+            raise ValueError('broken report')
+        return '%s text' % function, None
+
+    monkeypatch.setattr(espn_bot, 'get_report', get_report)
+    failed = espn_bot.espn_bot_group(['get_matchups', 'get_standings', 'get_power_rankings'])
+    assert failed == ['get_standings']
+    # one put, in the order the reports were given, without the one that failed
+    assert queue.puts == [['get_matchups text', 'get_power_rankings text']]
+    # every report ran against the same League
+    assert leagues == [league] * 3
@@ -0,0 +1,77 @@
+import sys
+import os
+sys.path.insert(1, os.path.abspath('.'))
+
+import pytest
+from espn_api.requests.espn_requests import EspnFantasyRequests
+
+import gamedaybot.espn.espn_http as espn_http
+
+LEAGUE_URL = 'https://lm-api-reads.fantasy.espn.com/apis/v3/games/ffl/seasons/2025/segments/0/leagues/123'
+
+
+@pytest.fixture
+def espn():
+    yield EspnFantasyRequests('nfl', 2025, 123, cookies={'espn_s2': 'secret', 'SWID': '{secret}'})
+    espn_http.uninstall()
+
+
+def test_record_then_replay(espn, mock_requests, tmp_path):
+    mock_requests.get(LEAGUE_URL, json={'id': 123, 'scoringPeriodId': 5})
+    recorder = espn_http.install(str(tmp_path), 'record')
+    assert espn.league_get(params={'view': 'mTeam'}) == {'id': 123, 'scoringPeriodId': 5}
+    assert recorder.stats()['requests'] == 1
+    # credentials are never written to the fixtures
+    assert 'secret' not in ''.join(p.read_text() for p in tmp_path.iterdir())
+
+    replayer = espn_http.install(str(tmp_path), 'replay')
+    calls = mock_requests.call_count
+    assert espn.league_get(params={'view': 'mTeam'}) == {'id': 123, 'scoringPeriodId': 5}
+    assert mock_requests.call_count == calls
+    assert replayer.stats()['bytes'] == recorder.stats()['bytes']
+
+
+def test_replay_keys_on_filter_headers(espn, mock_requests, tmp_path):
+    mock_requests.get(LEAGUE_URL, [{'json': {'players': [1]}}, {'json': {'players': [2]}}])
+    espn_http.install(str(tmp_path), 'record')
+    espn.league_get(params={'view': 'kona_playercard'}, headers={'x-fantasy-filter': '{"id": 1}'})
+    espn.league_get(params={'view': 'kona_playercard'}, headers={'x-fantasy-filter': '{"id": 2}'})
+
+    espn_http.install(str(tmp_path), 'replay')
+    assert espn.league_get(params={'view': 'kona_playercard'}, headers={'x-fantasy-filter': '{"id": 2}'}) == {'players': [2]}
+    with pytest.raises(espn_http.ReplayMissing):
+        espn.league_get(params={'view': 'kona_playercard'}, headers={'x-fantasy-filter': '{"id": 3}'})
+
+
+def test_replayed_status_codes(espn, mock_requests, tmp_path):
+    mock_requests.get(LEAGUE_URL, status_code=500, text='oops')
+    espn_http.install(str(tmp_path), 'record')
+    with pytest.raises(Exception, match='HTTP 500'):
+        espn.league_get()
+    espn_http.install(str(tmp_path), 'replay')
+    with pytest.raises(Exception, match='HTTP 500'):
+        espn.league_get()
+
+
+def test_configure(tmp_path):
+    try:
+        assert espn_http.configure('', str(tmp_path)).mode == 'live'
+        http = espn_http.configure('replay', str(tmp_path))
+        assert espn_http.installed() is http
+        assert espn_http.configure('replay', str(tmp_path)) is http
+        with pytest.raises(ValueError):
+            espn_http.configure('rewind', str(tmp_path))
+    finally:
+        espn_http.uninstall()
+
+
+def test_tally_counts_live_requests(espn, mock_requests, tmp_path):
+    mock_requests.get(LEAGUE_URL, text='{"id": 123}')
+    espn_http.configure('', str(tmp_path))
+    espn.league_get()
+    with espn_http.tally() as counts:
+        espn.league_get()
+        espn.league_get()
+    assert counts == {'requests': 2, 'bytes': 22}
+    assert espn_http.installed().stats()['requests'] == 3
+    assert not list(tmp_path.iterdir())
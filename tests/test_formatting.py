@@ -0,0 +1,36 @@
+import pytest
+import sys
+import os
+sys.path.insert(1, os.path.abspath('.'))
+import gamedaybot.chat.formatting as formatting
+from gamedaybot.chat.discord import replace_formatting
+
+
+class TestFormatting:
+    def setup_method(self):
+        self.text = "#q##u##b#Standings#b##u#\n#p# #c#Team#c#"
+
+    def test_discord(self):
+        assert formatting.translate(self.text, 'discord') == "> __**Standings**__\n* `Team`"
+
+    def test_slack(self):
+        assert formatting.translate(self.text, 'slack') == "> *Standings*\n• `Team`"
+
+    def test_plain(self):
+        assert formatting.translate(self.text, 'plain') == "Standings\n- Team"
+
+    def test_replace_formatting(self):
+        assert replace_formatting(self.text) == formatting.translate(self.text, 'discord')
+
+    def test_no_markers(self):
+        assert formatting.translate("no markers #x#", 'discord') == "no markers #x#"
+
+    def test_unknown_dialect(self):
+        with pytest.raises(KeyError):
+            formatting.translate(self.text, 'irc')
+
+    def test_register_dialect(self, monkeypatch):
+        # registered on a copy, so the dialect does not leak into other tests
+        monkeypatch.setattr(formatting, 'DIALECTS', dict(formatting.DIALECTS))
+        formatting.register_dialect('shout', {'#b#': '!'})
+        assert formatting.translate(self.text, 'shout') == "!Standings!\n Team"
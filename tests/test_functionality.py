@@ -0,0 +1,51 @@
+import sys
+import os
+sys.path.insert(1, os.path.abspath('.'))
+import gamedaybot.espn.functionality as espn
+
+
+class Player:
+    def __init__(self, position, points, slot_position='BE'):
+        self.name = '%s %s' % (position, points)
+        self.position = position
+        self.points = points
+        self.slot_position = slot_position
+
+
+class TestOptimalLineupScore:
+    def test_standard_lineup(self):
+        lineup = [Player('QB', 20, 'QB'), Player('QB', 25), Player('RB', 10, 'RB'), Player('RB', 8, 'RB'),
+                  Player('RB', 12), Player('WR', 5, 'RB/WR/TE'), Player('TE', 3, 'TE')]
+        counts = {'QB': 1, 'RB': 2, 'TE': 1, 'RB/WR/TE': 1}
+        assert espn.optimal_lineup_score(lineup, counts) == (58, 46, 12, 46 / 58 * 100)
+
+    def test_overlapping_flex(self):
+        # filling WR first and the flex slots after leaves the TE on the bench
+        lineup = [Player('WR', 10), Player('WR', 9), Player('RB', 1), Player('TE', 8)]
+        counts = {'RB/WR': 1, 'WR/TE': 1, 'WR': 1}
+        assert espn.optimal_lineup_score(lineup, counts)[0] == 27
+
+    def test_idp_slots(self):
+        lineup = [Player('DT', 4), Player('DE', 6), Player('CB', 3), Player('S', 7), Player('LB', 2)]
+        counts = {'DL': 1, 'DB': 1, 'DP': 1}
+        assert espn.optimal_lineup_score(lineup, counts)[0] == 17
+
+    def test_negative_points_still_start(self):
+        lineup = [Player('K', -2, 'K')]
+        assert espn.optimal_lineup_score(lineup, {'K': 1, 'D/ST': 1}) == (-2, -2, 0, 100)
+
+    def test_lineup_plan_groups(self):
+        plan = espn.lineup_plan((('K', 1), ('RB', 2), ('RB/WR/TE', 1), ('WR', 2)))
+        assert sorted(len(slots) for slots, positions, nested in plan) == [1, 5]
+        assert all(nested for slots, positions, nested in plan)
+
+    def test_lineup_plan_crossing_flex(self):
+        plan = espn.lineup_plan((('RB/WR', 1), ('WR', 1), ('WR/TE', 1)))
+        assert [nested for slots, positions, nested in plan] == [False]
+
+    def test_superflex_lineup(self):
+        # the flex takes the best RB/WR/TE left, and OP the best of everyone left after that
+        lineup = [Player('QB', 30), Player('QB', 22), Player('RB', 15), Player('RB', 9), Player('RB', 7),
+                  Player('WR', 12), Player('WR', 4), Player('TE', 6)]
+        counts = {'QB': 1, 'RB': 1, 'WR': 1, 'TE': 1, 'RB/WR/TE': 1, 'OP': 1}
+        assert espn.optimal_lineup_score(lineup, counts)[0] == 30 + 15 + 12 + 6 + 9 + 22
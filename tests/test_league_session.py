@@ -0,0 +1,76 @@
+import sys
+import os
+sys.path.insert(1, os.path.abspath('.'))
+
+import threading
+import time
+
+import gamedaybot.espn.league_session as league_session
+from gamedaybot.espn.league_session import LeagueSession
+
+
+class FakeLeague(object):
+    def __init__(self, league_id, year, **cookies):
+        self.league_id = league_id
+        self.year = year
+        self.cookies = cookies
+        self.scoringPeriodId = 5
+        self.teams = ['team']
+
+
+def session(monkeypatch, **kwargs):
+    built = []
+
+    def build(**args):
+        # as slow as ESPN, so jobs starting together all find the League being built
+        time.sleep(0.05)
+        built.append(args)
+        return FakeLeague(**args)
+
+    monkeypatch.setattr(league_session, 'League', build)
+    return LeagueSession('123', 2025, **kwargs), built
+
+
+def test_league_is_built_once(monkeypatch):
+    s, built = session(monkeypatch)
+    leagues = []
+    threads = [threading.Thread(target=lambda: leagues.append(s.get_league('get_matchups'))) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    s.get_league('get_standings')
+    assert len(built) == 1
+    assert all(league is leagues[0] for league in leagues)
+
+
+def test_private_league_cookies(monkeypatch):
+    s, built = session(monkeypatch, espn_s2='s2', swid='{swid}')
+    s.get_league()
+    assert built == [{'league_id': '123', 'year': 2025, 'espn_s2': 's2', 'swid': '{swid}'}]
+
+
+def test_refresh_swaps_in_a_copy(monkeypatch):
+    s, built = session(monkeypatch, status_max_age=0)
+    refreshed = []
+
+    def refresh_status(league):
+        refreshed.append(league)
+        league.scoringPeriodId = 6
+        return True
+
+    def refresh_teams(league):
+        league.teams = ['new team']
+
+    monkeypatch.setattr(s, '_refresh_status', refresh_status)
+    monkeypatch.setattr(s, '_refresh_teams', refresh_teams)
+    first = s.get_league('get_matchups')
+    second = s.get_league('get_matchups')
+    # a job still holding the first League never sees it change
+    assert second is not first and refreshed == [second]
+    assert (first.scoringPeriodId, first.teams) == (5, ['team'])
+    assert (second.scoringPeriodId, second.teams) == (6, ['new team'])
+    assert len(built) == 1
+
+    # reports that need nothing never refresh
+    assert s.get_league('init') is second
@@ -0,0 +1,119 @@
+import sys
+import os
+from datetime import datetime, timedelta
+sys.path.insert(1, os.path.abspath('.'))
+
+import gamedaybot.espn.live as live
+
+
+class Team:
+    def __init__(self, team_id, abbrev):
+        self.team_id = team_id
+        self.team_abbrev = abbrev
+
+
+HOME, AWAY = Team(1, 'HOME'), Team(2, 'AWAY')
+
+
+def matchup(home_score, away_score, home_projected=100, away_projected=90, final=False):
+    return {(1, 2): {'home': HOME, 'away': AWAY, 'home_score': home_score, 'away_score': away_score,
+                     'home_projected': home_projected, 'away_projected': away_projected, 'final': final}}
+
+
+class TestDiff:
+    def test_score_changes_without_lead_change_are_quiet(self):
+        assert live.diff(matchup(10, 5), matchup(30, 12)) == []
+
+    def test_lead_change(self):
+        events = live.diff(matchup(10, 5), matchup(10, 15))
+        assert [kind for kind, m in events] == ['lead']
+        assert 'AWAY takes the lead' in live.render(events, [''] * 3)
+
+    def test_tie_is_not_a_lead_change(self):
+        assert live.diff(matchup(10, 5), matchup(10, 10)) == []
+        assert [kind for kind, m in live.diff(matchup(10, 10), matchup(10, 12))] == ['lead']
+
+    def test_projection_flip(self):
+        events = live.diff(matchup(10, 5), matchup(10, 5, 90, 95))
+        assert [kind for kind, m in events] == ['projection']
+        assert 'AWAY now projected to win' in live.render(events, [''] * 3)
+
+    def test_final_reported_once(self):
+        events = live.diff(matchup(100, 90), matchup(100, 95, final=True))
+        assert [kind for kind, m in events] == ['final']
+        assert 'Final' in live.render(events, [''] * 3)
+        assert live.diff(matchup(100, 95, final=True), matchup(100, 95, final=True)) == []
+
+    def test_nothing_to_render(self):
+        assert live.render([], ['']) == ''
+
+
+class TestLiveScores:
+    def test_first_poll_is_a_baseline(self):
+        tracker = live.LiveScores()
+        assert tracker.due()
+        assert tracker.update(5, matchup(0, 0)) == []
+        assert tracker.delay == 120
+        assert not tracker.due()
+
+    def test_backs_off_until_something_happens(self):
+        tracker = live.LiveScores()
+        tracker.update(5, matchup(0, 0), 60, 300)
+        delays = []
+        for _ in range(4):
+            tracker.update(5, matchup(0, 0), 60, 300)
+            delays.append(tracker.delay)
+        assert delays == [120, 240, 300, 300]
+        assert tracker.update(5, matchup(10, 0), 60, 300)
+        assert tracker.delay == 60
+
+    def test_new_week_starts_over(self):
+        tracker = live.LiveScores()
+        tracker.update(5, matchup(10, 0))
+        assert tracker.update(6, matchup(0, 10)) == []
+
+    def test_trackers_are_per_league(self):
+        assert live.get_tracker(1, 2025) is live.get_tracker('1', 2025)
+        assert live.get_tracker(1, 2025) is not live.get_tracker(2, 2025)
+
+    def test_wait_holds_off_polls(self):
+        tracker = live.LiveScores()
+        tracker.update(5, matchup(0, 0), 60, 300)
+        tracker.wait(3600)
+        assert not tracker.due()
+        assert tracker.delay == 0
+
+
+class Starter:
+    def __init__(self, kickoff, game_played=0, slot_position='RB'):
+        self.game_date = kickoff
+        self.game_played = game_played
+        self.slot_position = slot_position
+
+
+class Box:
+    def __init__(self, home_lineup, away_lineup=()):
+        self.home_lineup = list(home_lineup)
+        self.away_lineup = list(away_lineup)
+
+
+class TestUntilNextGame:
+    NOW = datetime(2025, 11, 29, 12, 0)
+
+    def test_game_in_progress(self):
+        box = Box([Starter(self.NOW - timedelta(hours=1)), Starter(self.NOW + timedelta(days=1))])
+        assert live.until_next_game([box], self.NOW) == 0
+
+    def test_waits_for_next_kickoff(self):
+        # a Saturday game is the next one; the finished game and the benched player do not count
+        box = Box([Starter(self.NOW - timedelta(hours=5), game_played=100),
+                   Starter(self.NOW - timedelta(hours=1), slot_position='BE')],
+                  [Starter(self.NOW + timedelta(hours=4, minutes=30)), Starter(self.NOW + timedelta(days=1))])
+        assert live.until_next_game([box], self.NOW) == 4.5 * 3600
+
+    def test_week_over(self):
+        box = Box([Starter(self.NOW - timedelta(hours=5), game_played=100)])
+        assert live.until_next_game([box], self.NOW) is None
+
+    def test_unknown_kickoffs_keep_polling(self):
+        assert live.until_next_game([Box([])], self.NOW) == 0
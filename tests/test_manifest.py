@@ -0,0 +1,79 @@
+import json
+import pytest
+import socket
+import sys
+import os
+from concurrent.futures import ThreadPoolExecutor
+sys.path.insert(1, os.path.abspath('.'))
+from espn_api.requests import espn_requests
+import gamedaybot.espn.env_vars as env_vars
+import gamedaybot.espn.espn_http as espn_http
+import gamedaybot.espn.manifest as manifest
+
+
+class TestManifest:
+    def write(self, tmp_path, leagues):
+        path = tmp_path / 'leagues.json'
+        path.write_text(json.dumps(leagues))
+        return str(path)
+
+    def test_load_manifest(self, tmp_path):
+        path = self.write(tmp_path, [{'LEAGUE_ID': 1, 'DISCORD_WEBHOOK_URL': 'url', 'EXTRA_TROPHIES': True,
+                                      'EMOTES': ['<:a:1> ', '<:b:2> ']}])
+        assert manifest.load_manifest(path) == [{'LEAGUE_ID': '1', 'DISCORD_WEBHOOK_URL': 'url',
+                                                 'EXTRA_TROPHIES': 'true', 'EMOTES': '<:a:1> ,<:b:2> '}]
+
+    def test_missing_webhook(self, tmp_path):
+        path = self.write(tmp_path, [{'LEAGUE_ID': '1'}])
+        with pytest.raises(ValueError):
+            manifest.load_manifest(path)
+
+    def test_duplicate_league(self, tmp_path):
+        league = {'LEAGUE_ID': '1', 'DISCORD_WEBHOOK_URL': 'url'}
+        path = self.write(tmp_path, [league, league])
+        with pytest.raises(ValueError):
+            manifest.load_manifest(path)
+
+    def test_league_environ(self, monkeypatch):
+        monkeypatch.setenv('LEAGUE_ID', '1')
+        monkeypatch.setenv('DISCORD_WEBHOOK_URL', 'url')
+        monkeypatch.setenv('LEAGUE_YEAR', '2024')
+        with env_vars.league_environ({'LEAGUE_ID': '2'}):
+            data = env_vars.get_env_vars()
+            assert data['league_id'] == '2'
+            assert data['year'] == 2024
+        assert env_vars.get_env_vars()['league_id'] == '1'
+
+    def test_hung_league_does_not_stall_the_others(self, monkeypatch, tmp_path):
+        # a server that accepts connections and never answers
+        server = socket.socket()
+        server.bind(('127.0.0.1', 0))
+        server.listen(8)
+        url = 'http://127.0.0.1:%d/' % server.getsockname()[1]
+
+        reported = []
+
+        def group(functions, session=None):
+            league_id = env_vars.get_env_vars()['league_id']
+            if league_id == 'hung':
+                # what espn_api does for every request
+                espn_requests.requests.get(url)
+            reported.append(league_id)
+
+        monkeypatch.setattr(manifest, 'espn_bot_group', group)
+        monkeypatch.setenv('DISCORD_WEBHOOK_URL', 'url')
+        monkeypatch.setattr(espn_http, 'timeout', 0.5)
+        espn_http.install(str(tmp_path), 'live')
+        # one worker, as a busy shared scheduler would have
+        pool = ThreadPoolExecutor(max_workers=1)
+        try:
+            futures = [pool.submit(manifest.run_league_group, {'LEAGUE_ID': league_id}, ['get_matchups'])
+                       for league_id in ('hung', '2', '3')]
+            for future in futures:
+                future.result(timeout=10)
+        finally:
+            # closing the server resets the hung connection, should the timeout not have
+            server.close()
+            pool.shutdown()
+            espn_http.uninstall()
+        assert reported == ['2', '3']
@@ -0,0 +1,49 @@
+import sys
+import os
+sys.path.insert(1, os.path.abspath('.'))
+
+import requests
+
+import gamedaybot.utils.metrics as metrics
+
+JOBS = metrics.Histogram('test_job_seconds', 'Test job durations.', ('function',), buckets=(1, 5))
+SENT = metrics.Counter('test_sent_total', 'Test messages.', ('reason',))
+
+
+def test_render():
+    JOBS.observe(0.5, function='get_matchups')
+    JOBS.observe(3, function='get_matchups')
+    SENT.inc(reason='say "hi"')
+    text = metrics.render()
+
+    assert '# TYPE test_job_seconds histogram' in text
+    assert 'test_job_seconds_bucket{function="get_matchups",le="1"} 1' in text
+    assert 'test_job_seconds_bucket{function="get_matchups",le="5"} 2' in text
+    assert 'test_job_seconds_bucket{function="get_matchups",le="+Inf"} 2' in text
+    assert 'test_job_seconds_count{function="get_matchups"} 2' in text
+    assert 'test_job_seconds_sum{function="get_matchups"} 3.5' in text
+    assert 'test_sent_total{reason="say \\"hi\\""} 1' in text
+    assert JOBS.count(function='get_matchups') == 2
+
+
+def test_dump(tmp_path):
+    path = str(tmp_path / 'metrics' / 'bot.prom')
+    metrics.publish(0, path)
+    with open(path) as f:
+        assert f.read() == metrics.render()
+
+
+def test_serve():
+    SENT.inc(reason='served')
+    server = metrics.serve(0)
+    assert metrics.serve(0) is server
+    r = requests.get('http://127.0.0.1:%d/metrics' % server.server_address[1])
+    assert r.status_code == 200
+    assert 'test_sent_total{reason="served"} 1' in r.text
+
+
+def test_publish_binds_the_given_address(monkeypatch):
+    bound = []
+    monkeypatch.setattr(metrics, 'serve', lambda port, address='127.0.0.1': bound.append((port, address)))
+    metrics.publish(9100, None, '0.0.0.0')
+    assert bound == [(9100, '0.0.0.0')]
@@ -0,0 +1,56 @@
+import sys
+import os
+sys.path.insert(1, os.path.abspath('.'))
+
+import gamedaybot.espn.functionality as espn
+import gamedaybot.espn.player_cache as player_cache
+from synthetic import League
+
+
+def test_bulk_lookup_and_reuse():
+    league = League(10, 4, seed=1, league_id='player-cache-bulk')
+    # more players than fit in one request
+    ids = [p.playerId for team in league.teams for p in team.roster[:5]]
+    batches = []
+    player_info = league.player_info
+    league.player_info = lambda playerId=None: batches.append(len(playerId)) or player_info(playerId=playerId)
+    players = player_cache.get_players(league, ids)
+    assert batches == [40, 10]
+    assert sorted(players) == sorted(ids)
+    assert players[ids[0]].name == league.teams[0].roster[0].name
+
+    player_cache.get_players(league, ids[:3] + [league.teams[0].roster[5].playerId])
+    assert batches == [40, 10, 1]
+    assert player_cache.get_cache(league).misses == len(ids) + 1
+    assert player_cache.get_cache(league).requests == 3
+
+
+def test_unknown_and_single_players():
+    league = League(8, 4, seed=1, league_id='player-cache-single')
+    assert player_cache.get_players(league, [1]) == {}
+    player_id = league.teams[0].roster[0].playerId
+    assert list(player_cache.get_players(league, [player_id])) == [player_id]
+
+
+def test_expiry(monkeypatch):
+    league = League(8, 4, seed=1, league_id='player-cache-expiry')
+    player_id = league.teams[0].roster[0].playerId
+    player_cache.get_players(league, [player_id])
+    monkeypatch.setattr(player_cache, 'ttl', 0)
+    player_cache.get_players(league, [player_id])
+    assert league.player_info_calls == 2
+
+
+def test_waiver_report_makes_one_lookup():
+    league = League(14, 4, seed=2, league_id='player-cache-waivers')
+    assert espn.get_waiver_report(league, True)
+    assert league.player_info_calls == 1
+    espn.get_waiver_report(league, False)
+    assert league.player_info_calls == 1
+
+
+def test_box_scores_seed_the_cache():
+    league = League(14, 4, seed=2, league_id='player-cache-seeded')
+    espn.get_inactives(league)
+    espn.get_waiver_report(league, True)
+    assert league.player_info_calls == 0
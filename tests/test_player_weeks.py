@@ -0,0 +1,47 @@
+import sys
+import os
+sys.path.insert(1, os.path.abspath('.'))
+from gamedaybot.espn.player_weeks import PlayerWeeks
+
+
+class Team:
+    def __init__(self, team_id):
+        self.team_id = team_id
+
+
+class Player:
+    def __init__(self, player_id, position, slot_position, points, projected_points):
+        self.playerId = player_id
+        self.name = 'Player %d' % player_id
+        self.position = position
+        self.slot_position = slot_position
+        self.points = points
+        self.projected_points = projected_points
+
+
+class BoxScore:
+    def __init__(self, home_lineup, away_lineup, away_team=True):
+        self.home_team = Team(1)
+        self.away_team = Team(2) if away_team else 0
+        self.home_lineup = home_lineup
+        self.away_lineup = away_lineup
+
+
+class TestPlayerWeeks:
+    def setup_method(self):
+        home = [Player(1, 'QB', 'QB', 30, 15), Player(2, 'RB', 'RB', 5, 10), Player(3, 'RB', 'BE', 40, 10)]
+        away = [Player(4, 'WR', 'WR', 10, 5), Player(5, 'D/ST', 'D/ST', 2, 0)]
+        self.players = PlayerWeeks.from_box_scores({1: [BoxScore(home, away)], 2: [BoxScore(home[:1], [], away_team=False)]})
+
+    def test_rows(self):
+        assert len(self.players) == 6
+        assert list(self.players.data['week']) == [1, 1, 1, 1, 1, 2]
+        assert list(self.players.data['team_id']) == [1, 1, 1, 2, 2, 1]
+
+    def test_starters(self):
+        assert list(self.players.starters()) == [True, True, False, True, True, True]
+
+    def test_ratio_order(self):
+        # the QB's 100% and the WR's 100% tie on ratio, the QB wins on points over projection
+        assert list(self.players.ratio_order(self.players.starters(), best=True)) == [0, 5, 3, 1]
+        assert list(self.players.ratio_order(self.players.starters(), best=False)) == [1, 3, 0, 5]
@@ -0,0 +1,38 @@
+import sys
+import os
+sys.path.insert(1, os.path.abspath('.'))
+
+import pstats
+import tracemalloc
+
+import gamedaybot.utils.profiling as profiling
+
+
+def build_report():
+    return ''.join(str(i) for i in range(10000))
+
+
+def test_profile_writes_stats_and_snapshot(tmp_path):
+    with profiling.profile('123_get_matchups', str(tmp_path)) as prefix:
+        build_report()
+
+    assert os.path.basename(prefix).startswith('123_get_matchups_')
+    stats = pstats.Stats(prefix + '.prof')
+    assert any(func[2] == 'build_report' for func in stats.stats)
+    assert tracemalloc.Snapshot.load(prefix + '.tracemalloc').traces
+    assert not tracemalloc.is_tracing()
+
+
+def test_one_profile_at_a_time(tmp_path):
+    with profiling.profile('outer', str(tmp_path)):
+        with profiling.profile('inner', str(tmp_path)) as prefix:
+            assert prefix is None
+    assert sorted(os.listdir(str(tmp_path)))[0].startswith('outer_')
+    assert len(os.listdir(str(tmp_path))) == 2
+
+
+def test_should_profile():
+    assert profiling.should_profile('get_trophies', ['get_trophies', 'get_matchups'])
+    assert not profiling.should_profile('get_standings', ['get_trophies'])
+    assert profiling.should_profile('get_standings', ['all'])
+    assert not profiling.should_profile('get_standings', [])
@@ -0,0 +1,68 @@
+import sys
+import os
+sys.path.insert(1, os.path.abspath('.'))
+
+import pytest
+
+import gamedaybot.espn.box_score_cache as box_score_cache
+import gamedaybot.espn.season_recap as recap
+import baseline
+from synthetic import League
+
+
+# (teams, weeks played, roster layout, seed); the 14 team standard leagues have a player who beats the best
+# performance so far while also being below the worst, which must not make them the worst performance
+TROPHY_LEAGUES = [
+    (14, 3, 'standard', 1),
+    (14, 9, 'standard', 1),
+    (14, 16, 'standard', 1),
+    (10, 9, 'superflex', 2),
+    (13, 16, 'idp', 3),
+]
+
+
+@pytest.mark.parametrize('teams,weeks,layout,seed', TROPHY_LEAGUES)
+def test_season_trophies_match_baseline(teams, weeks, layout, seed):
+    league = League(teams, weeks, layout, seed=seed, league_id='recap-%d-%d-%s-%d' % (teams, weeks, layout, seed))
+    box_score_cache.start_run(league)
+    assert recap.season_trophies(league, True) == baseline.season_trophies(league, True)
+
+
+def test_checkpoint_round_trip(tmp_path):
+    path = str(tmp_path / 'awards.json')
+    # the same league five weeks in, then ten
+    early = League(12, 5, seed=7, league_id='recap-checkpoint')
+    box_score_cache.start_run(early)
+    assert recap.update_season_awards(early, path).weeks == [1, 2, 3, 4]
+
+    late = League(12, 10, seed=7, league_id='recap-checkpoint')
+    box_score_cache.start_run(late)
+    awards = recap.update_season_awards(late, path)
+    assert late.box_score_calls == 5
+    fresh = recap.SeasonAwards()
+    fresh.catch_up(late, recap.season_weeks(late))
+    assert awards.weeks == fresh.weeks
+    assert awards.to_dict() == fresh.to_dict()
+    assert recap.load_season_awards(path, late).to_dict() == fresh.to_dict()
+    assert recap.season_trophies(late, True, checkpoint=path) == baseline.season_trophies(late, True)
+
+
+def test_unusable_checkpoints_start_over(tmp_path):
+    league = League(8, 5, seed=7, league_id='recap-unusable')
+    path = tmp_path / 'awards.json'
+    assert recap.load_season_awards(str(path), league).weeks == []
+    path.write_text('{"weeks": [1, 2')
+    assert recap.load_season_awards(str(path), league).weeks == []
+
+
+def test_checkpoint_of_another_league_or_season_is_ignored(tmp_path):
+    path = str(tmp_path / 'awards.json')
+    league = League(8, 5, seed=7, league_id='recap-owner')
+    box_score_cache.start_run(league)
+    recap.update_season_awards(league, path)
+    assert recap.load_season_awards(path, league).weeks == [1, 2, 3, 4]
+
+    other = League(8, 5, seed=7, league_id='recap-other')
+    assert recap.load_season_awards(path, other).weeks == []
+    league.year -= 1
+    assert recap.load_season_awards(path, league).weeks == []
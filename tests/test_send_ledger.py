@@ -0,0 +1,82 @@
+import sys
+import os
+sys.path.insert(1, os.path.abspath('.'))
+
+import json
+import time
+
+import gamedaybot.chat.send_ledger as send_ledger
+
+
+def test_duplicate_after_record(tmp_path):
+    ledger = send_ledger.SendLedger(str(tmp_path / 'ledger.json'))
+    key = send_ledger.ledger_key(123, 'get_waiver_report')
+    assert not ledger.is_duplicate(key, 'no moves')
+    ledger.record(key, 'no moves')
+    assert ledger.is_duplicate(key, 'no moves')
+    assert not ledger.is_duplicate(key, 'one move')
+    assert not ledger.is_duplicate(send_ledger.ledger_key(456, 'get_waiver_report'), 'no moves')
+
+
+def test_persisted_across_restarts(tmp_path):
+    path = str(tmp_path / 'data' / 'ledger.json')
+    send_ledger.SendLedger(path).record('1:get_standings', 'standings')
+    assert send_ledger.SendLedger(path).is_duplicate('1:get_standings', 'standings')
+
+
+def test_entries_expire(tmp_path):
+    path = tmp_path / 'ledger.json'
+    path.write_text(json.dumps({'1:get_standings': {'hash': send_ledger.content_hash('standings'),
+                                                    'sent_at': time.time() - 120}}))
+    assert send_ledger.SendLedger(str(path), max_age=600).is_duplicate('1:get_standings', 'standings')
+    ledger = send_ledger.SendLedger(str(path), max_age=60)
+    assert not ledger.is_duplicate('1:get_standings', 'standings')
+    ledger.record('1:get_matchups', 'matchups')
+    assert list(json.loads(path.read_text())) == ['1:get_matchups']
+
+
+def test_disabled(tmp_path):
+    ledger = send_ledger.SendLedger(str(tmp_path / 'ledger.json'), max_age=0)
+    ledger.record('1:get_standings', 'standings')
+    assert not ledger.is_duplicate('1:get_standings', 'standings')
+    assert not os.path.exists(str(tmp_path / 'ledger.json'))
+
+
+def test_unreadable_ledger_is_ignored(tmp_path):
+    path = tmp_path / 'ledger.json'
+    path.write_text('{not json')
+    assert not send_ledger.SendLedger(str(path)).is_duplicate('1:get_standings', 'standings')
+
+
+def test_tracker_records_reports_once_fully_delivered(tmp_path):
+    ledger = send_ledger.SendLedger(str(tmp_path / 'ledger.json'))
+    on_sent = ledger.tracker([('1:a', 'part 1part 2', ['part 1', 'part 2'], None), ('1:b', 'other', ['other'], None)])
+    on_sent(0, 'part 1', None)
+    assert not ledger.is_duplicate('1:a', 'part 1part 2')
+    on_sent(2, 'other', None)
+    assert ledger.is_duplicate('1:b', 'other')
+    on_sent(1, 'part 2', None)
+    assert ledger.is_duplicate('1:a', 'part 1part 2')
+
+
+def test_tracker_matches_messages_by_position(tmp_path):
+    # both reports end with the same chunk; delivering the first report's copy must not complete the second
+    ledger = send_ledger.SendLedger(str(tmp_path / 'ledger.json'))
+    on_sent = ledger.tracker([('1:a', 'a', ['header', 'footer'], None), ('1:b', 'b', ['body', 'footer'], None)])
+    on_sent(0, 'header', None)
+    on_sent(1, 'footer', None)
+    assert ledger.is_duplicate('1:a', 'a')
+    on_sent(2, 'body', None)
+    assert not ledger.is_duplicate('1:b', 'b')
+    on_sent(3, 'footer', None)
+    assert ledger.is_duplicate('1:b', 'b')
+
+
+def test_tracker_calls_on_delivered_after_the_last_message(tmp_path):
+    ledger = send_ledger.SendLedger(str(tmp_path / 'ledger.json'))
+    delivered = []
+    on_sent = ledger.tracker([('1:a', 'ab', ['a', 'b'], lambda: delivered.append('a'))])
+    on_sent(0, 'a', None)
+    assert delivered == []
+    on_sent(1, 'b', None)
+    assert delivered == ['a']
@@ -142,6 +142,33 @@ class TestStringLimitCheck:
         with pytest.raises(TypeError):
             util.str_limit_check("hello", "five")
 
+    def test_str_limit_check_many_parts(self):
+        text = "\n".join("line %d" % i for i in range(10))
+        parts = util.str_limit_check(text, 13)
+        assert parts == ["line 0\nline 1", "line 2\nline 3", "line 4\nline 5", "line 6\nline 7", "line 8\nline 9"]
+
+    def test_str_limit_check_long_line(self):
+        assert util.str_limit_check("hello world again", 11) == ["hello world", "again"]
+
+    def test_str_limit_check_long_word(self):
+        assert util.str_limit_check("abcdefghij", 4) == ["abcd", "efgh", "ij"]
+
+    def test_str_limit_check_no_empty_parts(self):
+        # a long line cut exactly at the limit, then a blank line and another long line
+        assert util.str_limit_check("abcdefgh\n\nabcdefghij", 4) == ["abcd", "efgh", "abcd", "efgh", "ij"]
+        assert util.str_limit_check("aaaa\n\nbbbbbb", 4) == ["aaaa", "bbbb", "bb"]
+        assert util.str_limit_check("#b#abcdefgh\n\nabcdefghij#b#", 10) == \
+            ["#b#abcd#b#", "#b#efgh#b#", "#b#abcd#b#", "#b#efgh#b#", "#b#ij#b#"]
+
+    def test_str_limit_check_balances_markers(self):
+        text = "#b#first line\nsecond line#b#"
+        assert util.str_limit_check(text, 20) == ["#b#first line#b#", "#b#second line#b#"]
+
+    def test_str_limit_check_measure(self):
+        text = "#b#aaaa#b#\n#b#bbbb#b#"
+        assert util.str_limit_check(text, 21) == [text]
+        assert util.str_limit_check(text, 21, measure=lambda s: len(s.replace('#b#', '**' * 4))) == ["#b#aaaa#b#", "#b#bbbb#b#"]
+
 class TestStringToDatetime:
     ############ For `str_to_datetime`
     def test_str_to_datetime_valid_date(self):
@@ -0,0 +1,97 @@
+import sys
+import os
+sys.path.insert(1, os.path.abspath('.'))
+
+import copy
+
+import gamedaybot.espn.functionality as espn
+import gamedaybot.espn.waiver_watermark as waiver_watermark
+from synthetic import League
+
+DAY = 24 * 3600 * 1000
+
+
+def added(text):
+    return sorted(line.split()[3] for line in text.split('\n') if 'ADDED' in line)
+
+
+def new_transaction(league, txn_id, date):
+    txn = copy.deepcopy(league._transactions[0])
+    txn.team = league._transactions[0].team
+    txn.id = txn_id
+    txn.date = date
+    txn.items[0].player = 'Player %s' % txn_id
+    league._transactions.append(txn)
+    return txn
+
+
+def report_since(league, faab, path):
+    text, mark = espn.get_waiver_report_since(league, waiver_watermark.load_watermark(path), faab)
+    waiver_watermark.save_watermark(mark, path)
+    return text
+
+
+def test_only_new_transactions_are_reported(tmp_path):
+    league = League(12, 5, seed=4, league_id='watermark-new')
+    path = str(tmp_path / 'watermark.json')
+    first = report_since(league, True, path)
+    assert first == espn.get_waiver_report(league, True)
+    assert report_since(league, True, path) == ''
+
+    latest = max(txn.date for txn in league._transactions)
+    new_transaction(league, 'later', latest + 1)
+    assert added(report_since(league, True, path)) == ['later']
+
+
+def test_transactions_from_days_the_bot_was_down(tmp_path):
+    league = League(12, 5, seed=4, league_id='watermark-down')
+    earliest = min(txn.date for txn in league._transactions)
+    mark = {'date': earliest - 3 * DAY, 'ids': [], 'scoring_period': league.scoringPeriodId - 2}
+    new_transaction(league, 'missed', earliest - 2 * DAY)
+
+    periods = []
+    transactions = league.transactions
+    league.transactions = lambda period, types=None: periods.append(period) or transactions(period, types)
+    text, mark = espn.get_waiver_report_since(league, mark, False)
+    assert 'missed' in added(text)
+    assert len(added(text)) == len(league._transactions)
+    assert periods == [league.scoringPeriodId - 2, league.scoringPeriodId - 1, league.scoringPeriodId]
+    assert mark['scoring_period'] == league.scoringPeriodId
+
+
+def test_ties_on_the_watermark_time(tmp_path):
+    league = League(8, 5, seed=4, league_id='watermark-ties')
+    path = str(tmp_path / 'watermark.json')
+    report_since(league, True, path)
+    latest = max(txn.date for txn in league._transactions)
+    new_transaction(league, 'same-time', latest)
+    assert added(report_since(league, True, path)) == ['same-time']
+    assert report_since(league, True, path) == ''
+
+
+def test_ids_on_the_watermark_do_not_pile_up(tmp_path):
+    league = League(8, 5, seed=4, league_id='watermark-ids')
+    path = str(tmp_path / 'watermark.json')
+    latest = max(txn.date for txn in league._transactions)
+    new_transaction(league, 'same-time', latest)
+    sizes = []
+    for _ in range(3):
+        report_since(league, True, path)
+        sizes.append(len(waiver_watermark.load_watermark(path)['ids']))
+    assert sizes[0] >= 2
+    assert sizes == [sizes[0]] * 3
+
+
+def test_building_the_report_leaves_the_watermark_alone(tmp_path):
+    # the caller saves the mark once the report is delivered
+    league = League(8, 5, seed=4, league_id='watermark-unsaved')
+    path = str(tmp_path / 'watermark.json')
+    text, mark = espn.get_waiver_report_since(league, waiver_watermark.load_watermark(path), True)
+    assert text and mark
+    assert not os.path.exists(path)
+
+
+def test_unreadable_watermark(tmp_path):
+    path = tmp_path / 'watermark.json'
+    path.write_text('{"date": ')
+    assert waiver_watermark.load_watermark(str(path)) is None